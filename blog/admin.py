@@ -1,16 +1,24 @@
 from django.contrib import admin
 from django import forms
-from .models import Category, BlogPost, CodeSnippet, InteractiveMap, Comment
+from .models import Category, BlogPost, BlogTag, CodeSnippet, InteractiveMap, Comment
 from .widgets import CodeEditorWidget
 
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ['name', 'slug', 'icon', 'color']
+    list_display = ['name', 'slug', 'icon', 'color', 'post_count']
     search_fields = ['name', 'description']
     prepopulated_fields = {'slug': ('name',)}
 
 
+@admin.register(BlogTag)
+class BlogTagAdmin(admin.ModelAdmin):
+    list_display = ['name', 'slug', 'post_count']
+    search_fields = ['name']
+    ordering = ['-post_count', 'name']
+    prepopulated_fields = {'slug': ('name',)}
+
+
 class CodeSnippetForm(forms.ModelForm):
     class Meta:
         model = CodeSnippet
@@ -64,12 +72,6 @@ class BlogPostAdmin(admin.ModelAdmin):
     )
     
     readonly_fields = ['views_count']
-    
-    def save_model(self, request, obj, form, change):
-        if obj.status == 'PUBLISHED' and not obj.published_at:
-            from django.utils import timezone
-            obj.published_at = timezone.now()
-        super().save_model(request, obj, form, change)
 
 
 @admin.register(CodeSnippet)
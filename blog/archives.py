@@ -0,0 +1,61 @@
+"""
+Blog Archives
+Category and tag archive pages cache the rendered post list of each page
+as a template fragment. Fragment keys carry a version per category and
+per tag, which the blog signals replace whenever a post in that category
+or tag changes, so no key has to be searched for. Versions live in the
+default cache: when it is shared a replacement retires the fragments in
+every process at once, otherwise the other processes move on when their
+versions expire after CACHE_INVALIDATION_TIMEOUT. A global generation
+covers changes that can touch any archive, such as a scheduled post going
+live.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+DEFAULT_ARCHIVE_CACHE_TIMEOUT = 60 * 60 * 24
+DEFAULT_VERSION_TIMEOUT = 60 * 60
+GENERATION_KEY = 'blog:archive:generation'
+
+
+def archive_cache_timeout():
+    return getattr(settings, 'BLOG_ARCHIVE_CACHE_TIMEOUT', DEFAULT_ARCHIVE_CACHE_TIMEOUT)
+
+
+def _version_key(kind, pk):
+    return f'blog:archive:{kind}:{pk}'
+
+
+def _new_version():
+    # Time-based rather than a counter, so a version lost to eviction is never reissued
+    return str(time.time_ns())
+
+
+def archive_version(kind, pk):
+    """Current fragment version for the `kind` ('category' or 'tag') archive of `pk`"""
+    keys = [GENERATION_KEY, _version_key(kind, pk)]
+    versions = cache.get_many(keys)
+    missing = {key: _new_version() for key in keys if key not in versions}
+    if missing:
+        # A version expiring early only means the fragments are rendered again
+        cache.set_many(missing, getattr(settings, 'CACHE_INVALIDATION_TIMEOUT', DEFAULT_VERSION_TIMEOUT))
+        versions.update(missing)
+    return f'{versions[GENERATION_KEY]}.{versions[keys[1]]}'
+
+
+def invalidate_archives(category_ids=(), tag_ids=()):
+    """Retire the cached pages of these archives, now and once the transaction commits"""
+    keys = [_version_key('category', pk) for pk in category_ids if pk]
+    keys += [_version_key('tag', pk) for pk in tag_ids]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_all_archives():
+    cache.delete(GENERATION_KEY)
+    transaction.on_commit(lambda: cache.delete(GENERATION_KEY))
@@ -0,0 +1,19 @@
+"""
+Management command to recount published posts for every category and tag.
+The counters are normally kept current by signals; run this after bulk
+edits or imports that bypass them (queryset.update, bulk_create, raw SQL).
+"""
+from django.core.management.base import BaseCommand
+
+from blog.models import BlogTag, Category
+from blog.publishing import refresh_post_counts
+
+
+class Command(BaseCommand):
+    help = 'Recount published posts for all blog categories and tags'
+
+    def handle(self, *args, **options):
+        refresh_post_counts()
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Recounted {Category.objects.count()} categories and {BlogTag.objects.count()} tags'
+        ))
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0002_alter_blogpost_content"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="blogpost",
+            index=models.Index(
+                fields=["status", "-published_at", "-created_at"],
+                name="blog_post_status_pub_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="blogpost",
+            index=models.Index(
+                condition=models.Q(("featured", True), ("status", "PUBLISHED")),
+                fields=["-published_at"],
+                name="blog_post_featured_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("is_approved", True)),
+                fields=["post", "-created_at"],
+                name="blog_comment_approved_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("is_approved", False)),
+                fields=["-created_at"],
+                name="blog_comment_pending_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,213 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:41
+
+from django.db import migrations, models
+from django.utils import timezone
+import django.db.models.deletion
+import taggit.managers
+
+
+def copy_blog_tags(apps, schema_editor):
+    """Move blog post tags from taggit's shared Tag/TaggedItem tables to BlogTag/TaggedPost"""
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    TaggedItem = apps.get_model("taggit", "TaggedItem")
+    BlogTag = apps.get_model("blog", "BlogTag")
+    TaggedPost = apps.get_model("blog", "TaggedPost")
+
+    post_type = ContentType.objects.filter(app_label="blog", model="blogpost").first()
+    if post_type is None:
+        return
+    items = TaggedItem.objects.filter(content_type=post_type)
+    tags = {
+        tag_id: BlogTag(name=name, slug=slug)
+        for tag_id, name, slug in items.values_list(
+            "tag_id", "tag__name", "tag__slug"
+        ).distinct()
+    }
+    BlogTag.objects.bulk_create(tags.values())
+    TaggedPost.objects.bulk_create(
+        [
+            TaggedPost(content_object_id=object_id, tag=tags[tag_id])
+            for object_id, tag_id in items.values_list("object_id", "tag_id").distinct()
+        ]
+    )
+    items.delete()
+
+
+def restore_taggit_tags(apps, schema_editor):
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    Tag = apps.get_model("taggit", "Tag")
+    TaggedItem = apps.get_model("taggit", "TaggedItem")
+    TaggedPost = apps.get_model("blog", "TaggedPost")
+
+    post_type, _ = ContentType.objects.get_or_create(app_label="blog", model="blogpost")
+    tags = {}
+    links = []
+    for object_id, name, slug in TaggedPost.objects.values_list(
+        "content_object_id", "tag__name", "tag__slug"
+    ):
+        if name not in tags:
+            tags[name], _ = Tag.objects.get_or_create(
+                name=name, defaults={"slug": slug}
+            )
+        links.append(
+            TaggedItem(content_type=post_type, object_id=object_id, tag=tags[name])
+        )
+    TaggedItem.objects.bulk_create(links, ignore_conflicts=True)
+
+
+def count_published_posts(apps, schema_editor):
+    """Give published posts saved without a date one, then fill the post counters"""
+    BlogPost = apps.get_model("blog", "BlogPost")
+    Category = apps.get_model("blog", "Category")
+    BlogTag = apps.get_model("blog", "BlogTag")
+    TaggedPost = apps.get_model("blog", "TaggedPost")
+
+    BlogPost.objects.filter(status="PUBLISHED", published_at__isnull=True).update(
+        published_at=models.F("created_at")
+    )
+    published = BlogPost.objects.filter(
+        status="PUBLISHED", published_at__lte=timezone.now()
+    )
+    for model, counts in (
+        (Category, published.values_list("category")),
+        (
+            BlogTag,
+            TaggedPost.objects.filter(content_object__in=published).values_list("tag"),
+        ),
+    ):
+        counts = dict(counts.order_by().annotate(n=models.Count("pk")))
+        rows = list(model.objects.all())
+        for row in rows:
+            row.post_count = counts.get(row.pk, 0)
+        model.objects.bulk_update(rows, ["post_count"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0003_hot_query_indexes"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        (
+            "taggit",
+            "0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx",
+        ),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BlogTag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(max_length=100, unique=True, verbose_name="name"),
+                ),
+                (
+                    "slug",
+                    models.SlugField(
+                        allow_unicode=True,
+                        max_length=100,
+                        unique=True,
+                        verbose_name="slug",
+                    ),
+                ),
+                (
+                    "post_count",
+                    models.IntegerField(
+                        default=0,
+                        editable=False,
+                        help_text="Published posts with this tag (maintained automatically)",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Tag",
+                "verbose_name_plural": "Tags",
+            },
+        ),
+        migrations.CreateModel(
+            name="TaggedPost",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="post_count",
+            field=models.IntegerField(
+                default=0,
+                editable=False,
+                help_text="Published posts in this category (maintained automatically)",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="blogpost",
+            name="published_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Set a future time to schedule the post",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(
+                fields=["-post_count", "name"], name="blog_category_count_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="taggedpost",
+            name="content_object",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to="blog.blogpost"
+            ),
+        ),
+        migrations.AddField(
+            model_name="taggedpost",
+            name="tag",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tagged_posts",
+                to="blog.blogtag",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="blogtag",
+            index=models.Index(
+                fields=["-post_count", "name"], name="blog_tag_count_idx"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="blogpost",
+            name="tags",
+            field=taggit.managers.TaggableManager(
+                blank=True,
+                help_text="A comma-separated list of tags.",
+                through="blog.TaggedPost",
+                to="blog.BlogTag",
+                verbose_name="Tags",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="taggedpost",
+            unique_together={("content_object", "tag")},
+        ),
+        migrations.RunPython(copy_blog_tags, restore_taggit_tags),
+        migrations.RunPython(count_published_posts, migrations.RunPython.noop),
+    ]
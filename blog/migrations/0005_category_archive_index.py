@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0004_blog_tags_post_counts"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="blogpost",
+            index=models.Index(
+                condition=models.Q(("status", "PUBLISHED")),
+                fields=["category", "-published_at", "-id"],
+                name="blog_post_category_pub_idx",
+            ),
+        ),
+    ]
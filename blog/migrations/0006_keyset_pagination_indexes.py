@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0005_category_archive_index"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="blogpost",
+            name="blog_post_status_pub_idx",
+        ),
+        migrations.AddIndex(
+            model_name="blogpost",
+            index=models.Index(
+                fields=["status", "-published_at", "-id"],
+                name="blog_post_status_pub_idx",
+            ),
+        ),
+    ]
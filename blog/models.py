@@ -1,8 +1,10 @@
 from django.db import models
+from django.utils import timezone
 from django.utils.text import slugify
 from django.urls import reverse
 from tinymce.models import HTMLField
 from taggit.managers import TaggableManager
+from taggit.models import TagBase, TaggedItemBase
 
 class Category(models.Model):
     """Blog post categories"""
@@ -11,10 +13,14 @@ class Category(models.Model):
     description = models.TextField(blank=True)
     icon = models.CharField(max_length=50, blank=True, help_text="Font Awesome icon class")
     color = models.CharField(max_length=7, default="#3498db", help_text="Hex color code")
+    post_count = models.IntegerField(default=0, editable=False, help_text="Published posts in this category (maintained automatically)")
     
     class Meta:
         verbose_name_plural = "Categories"
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['-post_count', 'name'], name='blog_category_count_idx'),
+        ]
     
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -24,6 +30,33 @@ class Category(models.Model):
     def __str__(self):
         return self.name
 
+class BlogTag(TagBase):
+    """Tags for blog posts, with a denormalized count of published posts"""
+    post_count = models.IntegerField(default=0, editable=False, help_text="Published posts with this tag (maintained automatically)")
+    
+    class Meta:
+        verbose_name = "Tag"
+        verbose_name_plural = "Tags"
+        indexes = [
+            models.Index(fields=['-post_count', 'name'], name='blog_tag_count_idx'),
+        ]
+
+
+class TaggedPost(TaggedItemBase):
+    content_object = models.ForeignKey('BlogPost', on_delete=models.CASCADE)
+    tag = models.ForeignKey(BlogTag, on_delete=models.CASCADE, related_name='tagged_posts')
+    
+    class Meta:
+        unique_together = [('content_object', 'tag')]
+
+
+class BlogPostQuerySet(models.QuerySet):
+    
+    def published(self):
+        """Posts visible to readers: PUBLISHED and not scheduled for later"""
+        return self.filter(status='PUBLISHED', published_at__lte=timezone.now())
+
+
 class BlogPost(models.Model):
     """Advanced blog post model with rich media support"""
     STATUS_CHOICES = [
@@ -48,7 +81,7 @@ class BlogPost(models.Model):
     
     # Organization
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name='posts')
-    tags = TaggableManager(blank=True)
+    tags = TaggableManager(through=TaggedPost, blank=True)
     
     # Metadata
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='DRAFT')
@@ -63,16 +96,35 @@ class BlogPost(models.Model):
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    published_at = models.DateTimeField(null=True, blank=True)
+    published_at = models.DateTimeField(null=True, blank=True, help_text="Set a future time to schedule the post")
+    
+    objects = BlogPostQuerySet.as_manager()
     
     class Meta:
         ordering = ['-published_at', '-created_at']
         verbose_name = "Blog Post"
         verbose_name_plural = "Blog Posts"
+        indexes = [
+            # Every public listing filters on status and pages by (published_at, id)
+            models.Index(fields=['status', '-published_at', '-id'], name='blog_post_status_pub_idx'),
+            models.Index(
+                fields=['-published_at'],
+                condition=models.Q(status='PUBLISHED', featured=True),
+                name='blog_post_featured_idx',
+            ),
+            # Category archives: keyset pages over (published_at, id) within one category
+            models.Index(
+                fields=['category', '-published_at', '-id'],
+                condition=models.Q(status='PUBLISHED'),
+                name='blog_post_category_pub_idx',
+            ),
+        ]
     
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
+        if self.status == 'PUBLISHED' and not self.published_at:
+            self.published_at = timezone.now()
         # Auto-generate excerpt if not provided
         if not self.excerpt and self.content:
             # Strip HTML and take first 200 characters
@@ -87,6 +139,10 @@ class BlogPost(models.Model):
     def get_absolute_url(self):
         return reverse('blog:post_detail', kwargs={'slug': self.slug})
     
+    @property
+    def is_published(self):
+        return self.status == 'PUBLISHED' and self.published_at is not None and self.published_at <= timezone.now()
+    
     def increment_views(self):
         self.views_count += 1
         self.save(update_fields=['views_count'])
@@ -165,6 +221,13 @@ class Comment(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Approved comments under a post, newest first ("is_approved" is not an
+            # equality SQLite can seek on, so it goes in the index condition)
+            models.Index(fields=['post', '-created_at'], condition=models.Q(is_approved=True), name='blog_comment_approved_idx'),
+            # Moderation queue
+            models.Index(fields=['-created_at'], condition=models.Q(is_approved=False), name='blog_comment_pending_idx'),
+        ]
     
     def __str__(self):
         return f"Comment by {self.name} on {self.post.title}"
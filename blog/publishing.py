@@ -0,0 +1,87 @@
+"""
+Blog Publishing
+A post is public once it is PUBLISHED and its published_at has passed
+(`BlogPost.objects.published()`). Categories and tags carry a denormalized
+`post_count` of their public posts, recounted for the affected rows when a
+post is published, unpublished, moved, retagged or deleted (see signals).
+Scheduled posts go public without any write, so the next pending publish
+time is kept in the default cache and every counter is recounted on the
+first read after it (or after the cached time is dropped because a
+schedule changed, or expires after CACHE_INVALIDATION_TIMEOUT).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .archives import invalidate_all_archives
+
+NEXT_PUBLISH_CACHE_KEY = 'blog:next_scheduled_publish'
+NOTHING_SCHEDULED = 'none'
+# Backstop for a lost invalidation; each expiry costs one recount
+SCHEDULE_CACHE_TIMEOUT = 60 * 60
+
+
+def _count(queryset, field):
+    """Correlated COUNT of `queryset` rows whose `field` is the outer row"""
+    counts = queryset.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(n=Count('pk')).values('n')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def refresh_post_counts(category_ids=None, tag_ids=None):
+    """
+    Recount the public posts of the given categories and tags in one UPDATE
+    per model. None means every row; an empty collection skips the model.
+    """
+    from .models import BlogPost, BlogTag, Category, TaggedPost
+
+    published = BlogPost.objects.published()
+    if category_ids is None or category_ids:
+        categories = Category.objects.all()
+        if category_ids is not None:
+            categories = categories.filter(pk__in=category_ids)
+        categories.update(post_count=_count(published, 'category'))
+    if tag_ids is None or tag_ids:
+        tags = BlogTag.objects.all()
+        if tag_ids is not None:
+            tags = tags.filter(pk__in=tag_ids)
+        tags.update(post_count=_count(TaggedPost.objects.filter(content_object__in=published), 'tag'))
+
+
+def forget_schedule():
+    """Drop the cached next publish time now and once the current transaction commits"""
+    cache.delete(NEXT_PUBLISH_CACHE_KEY)
+    transaction.on_commit(lambda: cache.delete(NEXT_PUBLISH_CACHE_KEY))
+
+
+def ensure_current_counts():
+    """
+    Recount everything if a scheduled post may have gone public since the
+    last count, then remember when the next one is due. Costs one cache
+    read while nothing is due.
+    """
+    from .models import BlogPost
+
+    due = cache.get(NEXT_PUBLISH_CACHE_KEY)
+    if due == NOTHING_SCHEDULED or (due is not None and due > timezone.now()):
+        return
+    refresh_post_counts()
+    # A post may have gone live in any category or tag
+    invalidate_all_archives()
+    due = BlogPost.objects.filter(
+        status='PUBLISHED', published_at__gt=timezone.now()
+    ).order_by('published_at').values_list('published_at', flat=True).first()
+    cache.set(
+        NEXT_PUBLISH_CACHE_KEY, due or NOTHING_SCHEDULED,
+        getattr(settings, 'CACHE_INVALIDATION_TIMEOUT', SCHEDULE_CACHE_TIMEOUT),
+    )
+
+
+def popular_tags(limit=10):
+    """The `limit` tags with the most public posts"""
+    from .models import BlogTag
+
+    ensure_current_counts()
+    return BlogTag.objects.filter(post_count__gt=0).order_by('-post_count', 'name')[:limit]
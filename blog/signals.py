@@ -0,0 +1,102 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .archives import invalidate_archives
+from .models import BlogPost
+from .publishing import forget_schedule, refresh_post_counts
+
+# Fields that decide whether, and where, a post is counted
+COUNTED_FIELDS = {'status', 'published_at', 'category'}
+# Fields not shown in archive listings
+UNLISTED_FIELDS = {'views_count'}
+
+
+def _counted_fields_skipped(update_fields):
+    return update_fields is not None and not COUNTED_FIELDS.intersection(update_fields)
+
+
+def _is_public(state):
+    status, published_at, category_id = state
+    return status == 'PUBLISHED' and published_at is not None and published_at <= timezone.now()
+
+
+def _is_scheduled(state):
+    status, published_at, category_id = state
+    return status == 'PUBLISHED' and published_at is not None and published_at > timezone.now()
+
+
+@receiver(pre_save, sender=BlogPost)
+def remember_counted_state(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Keep the stored status/date/category so post_save can tell what changed"""
+    instance._counted_state = None
+    if raw or instance.pk is None or _counted_fields_skipped(update_fields):
+        return
+    instance._counted_state = sender.objects.filter(pk=instance.pk).values_list(
+        'status', 'published_at', 'category_id'
+    ).first()
+
+
+@receiver(post_save, sender=BlogPost)
+def update_counts_on_save(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    """Publishing, unpublishing, rescheduling or moving a post changes its category and tag counts"""
+    if raw or _counted_fields_skipped(update_fields):
+        return
+    previous = getattr(instance, '_counted_state', None)
+    current = (instance.status, instance.published_at, instance.category_id)
+    if previous == current:
+        return
+    if _is_scheduled(current) or (previous and _is_scheduled(previous)):
+        forget_schedule()
+    if not _is_public(current) and not (previous and _is_public(previous)):
+        return
+    category_ids = {current[2], previous[2] if previous else None} - {None}
+    # New posts have no tags yet; the tag counts follow from m2m_changed
+    tag_ids = [] if created else list(instance.tags.values_list('pk', flat=True))
+    refresh_post_counts(category_ids, tag_ids)
+
+
+@receiver(post_save, sender=BlogPost)
+def invalidate_archives_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Any listed change to a public post retires the cached pages of its category and tags"""
+    if raw or (update_fields is not None and set(update_fields) <= UNLISTED_FIELDS):
+        return
+    previous = getattr(instance, '_counted_state', None)
+    if not instance.is_published and not (previous and _is_public(previous)):
+        return
+    category_ids = {instance.category_id, previous[2] if previous else None} - {None}
+    invalidate_archives(category_ids, list(instance.tags.values_list('pk', flat=True)))
+
+
+@receiver(m2m_changed, sender=BlogPost.tags.through)
+def update_counts_on_retag(sender, instance, action, reverse=False, pk_set=None, **kwargs):
+    """Only a public post's tags are counted, so retagging a draft changes nothing"""
+    if reverse or not isinstance(instance, BlogPost) or not instance.is_published:
+        return
+    if action == 'pre_clear':
+        instance._cleared_tag_ids = list(instance.tags.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        tag_ids = getattr(instance, '_cleared_tag_ids', None) or ()
+        refresh_post_counts((), tag_ids)
+        invalidate_archives([instance.category_id], tag_ids)
+    elif action in ('post_add', 'post_remove') and pk_set:
+        refresh_post_counts((), pk_set)
+        # The post's card lists its tags, so every archive showing it is stale
+        tag_ids = set(pk_set).union(instance.tags.values_list('pk', flat=True))
+        invalidate_archives([instance.category_id], tag_ids)
+
+
+@receiver(pre_delete, sender=BlogPost)
+def remember_deleted_tags(sender, instance, **kwargs):
+    # The tag links are deleted before post_delete runs
+    instance._deleted_tag_ids = list(instance.tags.values_list('pk', flat=True)) if instance.is_published else []
+
+
+@receiver(post_delete, sender=BlogPost)
+def update_counts_on_delete(sender, instance, **kwargs):
+    if not instance.is_published:
+        return
+    category_ids = [instance.category_id] if instance.category_id else ()
+    tag_ids = getattr(instance, '_deleted_tag_ids', None) or ()
+    refresh_post_counts(category_ids, tag_ids)
+    invalidate_archives(category_ids, tag_ids)
@@ -1,3 +1,103 @@
+from datetime import timedelta
+
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from portfolio.pagination import BACKWARD, FORWARD, InvalidCursor, KeysetPaginator
+from portfolio.tests import PageQueryTestCase
+
+from .models import BlogPost, BlogTag, Category
+
+
+class BlogPageQueryTests(PageQueryTestCase):
+    """Query counts of the blog pages; a query per post would fail these"""
+
+    def test_post_list(self):
+        self.assertPageQueries(reverse('blog:post_list'), 8, 5)
+
+    def test_post_detail(self):
+        post = BlogPost.objects.published().order_by('-published_at').first()
+        self.assertPageQueries(post.get_absolute_url(), 12, 12)
+
+    def test_category_archive(self):
+        category = Category.objects.filter(post_count__gt=0).first()
+        self.assertPageQueries(reverse('blog:category', args=[category.slug]), 8, 3)
+
+    def test_tag_archive(self):
+        tag = BlogTag.objects.filter(post_count__gt=0).first()
+        self.assertPageQueries(reverse('blog:tag', args=[tag.slug]), 8, 3)
+
+    def test_draft_is_not_found(self):
+        draft = BlogPost.objects.filter(status='DRAFT').first()
+        self.assertEqual(self.client.get(draft.get_absolute_url()).status_code, 404)
+
+
+class KeysetPaginatorTests(TestCase):
+    """Cursor pages over the post list ordering, including rows that tie on published_at"""
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now().replace(microsecond=0)
+        # Posts 2-4 share a timestamp, so the id decides their order and a page boundary falls between them
+        offsets = [0, 1, 1, 1, 2, 3, 4]
+        BlogPost.objects.bulk_create([
+            BlogPost(title=f'Post {i}', slug=f'post-{i}', content='', status='PUBLISHED',
+                     published_at=now - timedelta(days=offset))
+            for i, offset in enumerate(offsets)
+        ])
+        cls.ordered = list(BlogPost.objects.order_by('-published_at', '-id').values_list('pk', flat=True))
+
+    def paginator(self, ordering=('-published_at', '-id'), per_page=2):
+        return KeysetPaginator(BlogPost.objects.all(), ordering, per_page)
+
+    def test_cursor_round_trip(self):
+        paginator = self.paginator()
+        post = BlogPost.objects.get(pk=self.ordered[2])
+        self.assertEqual(
+            paginator.decode(paginator.encode(FORWARD, post)),
+            (FORWARD, [post.published_at, post.pk]),
+        )
+
+    def test_pages_cover_every_row_once_across_ties(self):
+        paginator = self.paginator()
+        seen = []
+        page = paginator.page()
+        self.assertFalse(page.has_previous())
+        while True:
+            seen += [post.pk for post in page]
+            if not page.has_next():
+                break
+            page = paginator.page(page.next_cursor)
+        self.assertEqual(seen, self.ordered)
+        # Last page: one row left, nothing after it
+        self.assertEqual(len(page), 1)
+        self.assertIsNone(page.next_cursor)
+        self.assertTrue(page.has_previous())
+
+    def test_previous_cursor_returns_the_earlier_page(self):
+        paginator = self.paginator()
+        second = paginator.page(paginator.page().next_cursor)
+        self.assertEqual([post.pk for post in second], self.ordered[2:4])
+        first = paginator.page(second.previous_cursor)
+        self.assertEqual(first.direction, BACKWARD)
+        self.assertEqual([post.pk for post in first], self.ordered[:2])
+        self.assertFalse(first.has_previous())
+        self.assertTrue(first.has_next())
+
+    def test_primary_key_is_appended_as_tie_breaker(self):
+        paginator = self.paginator(ordering=('-published_at',), per_page=3)
+        self.assertEqual([field.name for field, descending in paginator.ordering], ['published_at', 'id'])
+        second = paginator.page(paginator.page().next_cursor)
+        self.assertEqual([post.pk for post in second], self.ordered[3:6])
 
-# Create your tests here.
+    def test_tampered_or_foreign_cursors_are_rejected(self):
+        cursor = self.paginator().page().next_cursor
+        tampered = cursor[:-2] + ('AA' if cursor[-2:] != 'AA' else 'BB')
+        with self.assertRaises(InvalidCursor):
+            self.paginator().page(tampered)
+        # Signed for another ordering
+        with self.assertRaises(InvalidCursor):
+            self.paginator(ordering=('title',)).page(cursor)
+        response = self.client.get(reverse('blog:post_list'), {'cursor': tampered}, secure=True)
+        self.assertEqual(response.status_code, 404)
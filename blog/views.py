@@ -2,19 +2,31 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.views.generic import ListView, DetailView
 from django.db.models import Q
 from django.contrib import messages
-from .models import BlogPost, Category, Comment
-from taggit.models import Tag
+from portfolio.pagination import KeysetPaginationMixin
+from .archives import archive_cache_timeout, archive_version
+from .models import BlogPost, BlogTag, Category, Comment
+from .publishing import ensure_current_counts, popular_tags
 
 
-class BlogListView(ListView):
-    """List all published blog posts"""
+def sidebar_context():
+    """Categories and popular tags with their post counts, read from the counters"""
+    ensure_current_counts()
+    return {
+        'categories': Category.objects.all(),
+        'popular_tags': popular_tags(),
+    }
+
+
+class BlogListView(KeysetPaginationMixin, ListView):
+    """List all published blog posts, newest first, a cursor page at a time"""
     model = BlogPost
     template_name = 'blog/blog_list.html'
     context_object_name = 'posts'
     paginate_by = 9
+    keyset_ordering = ('-published_at', '-id')
     
     def get_queryset(self):
-        queryset = BlogPost.objects.filter(status='PUBLISHED')
+        queryset = BlogPost.objects.published().select_related('category').prefetch_related('tags')
         
         # Filter by category
         category_slug = self.request.GET.get('category')
@@ -39,9 +51,8 @@ class BlogListView(ListView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['categories'] = Category.objects.all()
-        context['popular_tags'] = Tag.objects.all()[:10]
-        context['featured_posts'] = BlogPost.objects.filter(status='PUBLISHED', featured=True)[:3]
+        context.update(sidebar_context())
+        context['featured_posts'] = BlogPost.objects.published().filter(featured=True)[:3]
         return context
 
 
@@ -54,7 +65,7 @@ class BlogDetailView(DetailView):
     slug_url_kwarg = 'slug'
     
     def get_queryset(self):
-        return BlogPost.objects.filter(status='PUBLISHED')
+        return BlogPost.objects.published()
     
     def get_object(self, queryset=None):
         obj = super().get_object(queryset)
@@ -68,8 +79,7 @@ class BlogDetailView(DetailView):
         
         # Get related posts by tags
         post_tags_ids = post.tags.values_list('id', flat=True)
-        related_posts = BlogPost.objects.filter(
-            status='PUBLISHED',
+        related_posts = BlogPost.objects.published().filter(
             tags__in=post_tags_ids
         ).exclude(id=post.id).distinct()[:3]
         
@@ -80,35 +90,64 @@ class BlogDetailView(DetailView):
         return context
 
 
-def blog_category(request, slug):
-    """Blog posts filtered by category"""
-    category = get_object_or_404(Category, slug=slug)
-    posts = BlogPost.objects.filter(status='PUBLISHED', category=category)
+class ArchiveListView(KeysetPaginationMixin, ListView):
+    """
+    Published posts of one category or tag, newest first. Pages are keyset
+    paginated and their post lists cached as fragments until a post in the
+    archive changes (see blog/archives.py).
+    """
+    context_object_name = 'posts'
+    paginate_by = 9
+    keyset_ordering = ('-published_at', '-id')
+    archive_kind = None
+    archive_model = None
+    # BlogPost lookup matching the archive object
+    archive_filter = None
     
-    context = {
-        'category': category,
-        'posts': posts,
-        'categories': Category.objects.all(),
-    }
-    return render(request, 'blog/blog_category.html', context)
+    def get_archive(self):
+        if not hasattr(self, 'archive'):
+            self.archive = get_object_or_404(self.archive_model, slug=self.kwargs['slug'])
+        return self.archive
+    
+    def get_queryset(self):
+        queryset = BlogPost.objects.published().select_related('category').prefetch_related('tags')
+        return queryset.filter(**{self.archive_filter: self.get_archive()})
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        archive = self.get_archive()
+        # Sidebar first: it may find a scheduled post gone live and retire every archive version
+        context.update(sidebar_context())
+        context.update({
+            self.archive_kind: archive,
+            'archive_kind': self.archive_kind,
+            'archive_pk': archive.pk,
+            'archive_version': archive_version(self.archive_kind, archive.pk),
+            'archive_cache_timeout': archive_cache_timeout(),
+            'cursor': self.get_cursor() or '',
+        })
+        return context
+
+
+class CategoryArchiveView(ArchiveListView):
+    """Blog posts filtered by category"""
+    template_name = 'blog/blog_category.html'
+    archive_kind = 'category'
+    archive_model = Category
+    archive_filter = 'category'
 
 
-def blog_tag(request, slug):
+class TagArchiveView(ArchiveListView):
     """Blog posts filtered by tag"""
-    tag = get_object_or_404(Tag, slug=slug)
-    posts = BlogPost.objects.filter(status='PUBLISHED', tags__slug=slug)
-    
-    context = {
-        'tag': tag,
-        'posts': posts,
-        'categories': Category.objects.all(),
-    }
-    return render(request, 'blog/blog_tag.html', context)
+    template_name = 'blog/blog_tag.html'
+    archive_kind = 'tag'
+    archive_model = BlogTag
+    archive_filter = 'tags'
 
 
 def add_comment(request, slug):
     """Add a comment to a blog post"""
-    post = get_object_or_404(BlogPost, slug=slug, status='PUBLISHED')
+    post = get_object_or_404(BlogPost.objects.published(), slug=slug)
     
     if request.method == 'POST':
         name = request.POST.get('name')
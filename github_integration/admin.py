@@ -1,6 +1,8 @@
-from django.contrib import admin
-from .models import GitHubRepository, GitHubLanguage, GitHubCommit
+from django.contrib import admin, messages
+from portfolio.background import enqueue
+from .models import GitHubRepository, GitHubLanguage, GitHubCommit, LanguageStat, WebhookDelivery
 from .services import GitHubService
+from .webhooks import process_delivery
 
 
 class GitHubLanguageInline(admin.TabularInline):
@@ -19,7 +21,7 @@ class GitHubRepositoryAdmin(admin.ModelAdmin):
     readonly_fields = ['github_id', 'full_name', 'url', 'stars_count', 'forks_count', 
                       'watchers_count', 'open_issues_count', 'size', 'primary_language',
                       'topics', 'is_fork', 'is_private', 'is_archived', 'created_at',
-                      'updated_at', 'pushed_at', 'last_synced']
+                      'updated_at', 'pushed_at', 'readme_html', 'last_synced']
     inlines = [GitHubLanguageInline]
     
     fieldsets = (
@@ -41,6 +43,10 @@ class GitHubRepositoryAdmin(admin.ModelAdmin):
         ('Dates', {
             'fields': ('created_at', 'updated_at', 'pushed_at', 'last_synced')
         }),
+        ('README', {
+            'fields': ('readme_html',),
+            'classes': ('collapse',)
+        }),
     )
     
     actions = ['sync_repositories']
@@ -49,10 +55,15 @@ class GitHubRepositoryAdmin(admin.ModelAdmin):
         """Sync selected repositories from GitHub"""
         service = GitHubService()
         count = 0
+        failed = []
         for repo in queryset:
-            service.fetch_repository_details(repo.name, sync_to_db=True)
-            count += 1
+            if service.fetch_repository_details(repo.name, sync_to_db=True):
+                count += 1
+            else:
+                failed.append(repo.name)
         self.message_user(request, f"Successfully synced {count} repositories from GitHub.")
+        if failed:
+            self.message_user(request, f"GitHub did not answer for: {', '.join(failed)}", level=messages.WARNING)
     sync_repositories.short_description = "Sync selected repositories from GitHub"
 
 
@@ -63,9 +74,46 @@ class GitHubLanguageAdmin(admin.ModelAdmin):
     search_fields = ['name', 'repository__name']
 
 
+@admin.register(LanguageStat)
+class LanguageStatAdmin(admin.ModelAdmin):
+    """Read-only: rows are recomputed from the repositories after every sync"""
+    list_display = ['name', 'percentage', 'previous_percentage', 'bytes_count', 'repo_count', 'primary_repo_count', 'computed_at']
+    search_fields = ['name']
+    readonly_fields = [field.name for field in LanguageStat._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(GitHubCommit)
 class GitHubCommitAdmin(admin.ModelAdmin):
     list_display = ['sha', 'repository', 'author_name', 'committed_at']
     list_filter = ['repository', 'committed_at']
     search_fields = ['sha', 'message', 'author_name']
     readonly_fields = ['sha', 'message', 'author_name', 'author_email', 'committed_at', 'url']
+
+
+@admin.register(WebhookDelivery)
+class WebhookDeliveryAdmin(admin.ModelAdmin):
+    list_display = ['delivery_id', 'event', 'action', 'repository_full_name', 'received_at', 'processed_at', 'failed']
+    list_filter = ['event', 'received_at']
+    search_fields = ['delivery_id', 'repository_full_name']
+    readonly_fields = [field.name for field in WebhookDelivery._meta.fields]
+    actions = ['replay_deliveries']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    @admin.display(boolean=True)
+    def failed(self, obj):
+        return bool(obj.error)
+    
+    def replay_deliveries(self, request, queryset):
+        """Queue the selected deliveries to be processed again"""
+        for pk in queryset.values_list('pk', flat=True):
+            enqueue(process_delivery, pk)
+        self.message_user(request, f"Queued {queryset.count()} deliveries for processing.")
+    replay_deliveries.short_description = "Process selected deliveries again"
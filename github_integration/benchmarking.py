@@ -0,0 +1,89 @@
+"""
+Sync Benchmarking
+Runs GitHubService syncs against the fake GitHub API (fake_api) and
+measures wall time, database statements and API requests per sync. Each
+account size goes through three syncs: the first (everything new), an
+unchanged resync (only the repository list) and a resync after pushes to
+some repositories. Used by the `benchmark_github_sync` management command.
+"""
+import time
+
+from django.db import connection
+
+PHASES = ('initial', 'unchanged', 'pushed')
+DEFAULT_SIZES = (10, 100, 1000)
+
+
+def _clear_synced_data():
+    from .models import GitHubRepository, LanguageStat
+
+    # Languages and commits cascade
+    GitHubRepository.objects.all().delete()
+    LanguageStat.objects.all().delete()
+
+
+class QueryCounter:
+    """Counts statements without keeping them (CaptureQueriesContext stops at 9000)"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _run_sync(fake):
+    from .rate_limit import GitHubError
+    from .services import GitHubService
+
+    service = GitHubService(username=fake.username, token='benchmark')
+    service.base_url = fake.base_url
+    service.session = fake
+    service.sleep = fake.sleep
+    calls_before, slept_before = len(fake.calls), fake.slept
+
+    error = ''
+    queries = QueryCounter()
+    with connection.execute_wrapper(queries):
+        start = time.perf_counter()
+        try:
+            repos = service.sync_all_data()
+        except GitHubError as exc:
+            repos, error = [], str(exc)
+        elapsed = time.perf_counter() - start
+
+    return {
+        'repositories': len(repos),
+        'requests': len(fake.calls) - calls_before,
+        'queries': queries.count,
+        'time_ms': round(elapsed * 1000, 1),
+        'repos_per_s': round(len(repos) / elapsed, 1) if repos and elapsed else 0,
+        'waited_s': round(fake.slept - slept_before, 1),
+        'deferred': len(service.deferred),
+        'quota_left': service.quota.available(),
+        'error': error,
+    }
+
+
+def measure_sync(fake, pushed_ratio=0.1, featured=6):
+    """
+    Benchmark the three sync phases for the account served by `fake`,
+    starting from an empty database. Returns {phase: result}.
+    """
+    from .models import GitHubRepository
+
+    _clear_synced_data()
+    results = {'initial': _run_sync(fake)}
+
+    # Featured repositories also sync their commits after a push
+    featured_ids = list(GitHubRepository.objects.order_by('-stars_count', 'id').values_list('pk', flat=True)[:featured])
+    GitHubRepository.objects.filter(pk__in=featured_ids).update(featured=True)
+    results['unchanged'] = _run_sync(fake)
+
+    pushed = max(1, int(len(fake.repositories) * pushed_ratio)) if fake.repositories else 0
+    for repo in fake.repositories[-pushed:] if pushed else []:
+        fake.push(repo['name'], 'Benchmark push')
+    results['pushed'] = _run_sync(fake)
+    return results
+
@@ -0,0 +1,315 @@
+"""
+Fake GitHub API
+An in-process stand-in for api.github.com that answers the requests
+GitHubService makes, so syncs can be run and measured offline. It replaces
+the service's `session`:
+
+    fake = FakeGitHub.synthesize(100, username='octocat')
+    service = GitHubService(username='octocat')
+    service.session = fake
+    service.sleep = fake.sleep
+    service.sync_all_data()
+
+Accounts are synthesized (repositories with languages, commits and
+READMEs) or loaded from a fixture file recorded from the real API with
+`record_fixtures`. Responses carry real `requests.Response` objects with
+Link pagination, ETags and X-RateLimit-* headers; latency, an exhausted
+quota and secondary rate limits can be injected.
+"""
+import hashlib
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_BASE_URL = 'https://api.github.com'
+MAX_PER_PAGE = 100
+
+LANGUAGES = (
+    'Python', 'JavaScript', 'TypeScript', 'HTML', 'CSS', 'R', 'Jupyter Notebook',
+    'Shell', 'Stata', 'Julia', 'C++', 'Go', 'Rust', 'TeX', 'Dockerfile',
+)
+WORDS = (
+    'spatial economics regression panel data causal inference market labor trade '
+    'policy housing urban growth model estimation python django learning network'
+).split()
+
+
+def _timestamp(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _sha(*parts):
+    return hashlib.sha1(':'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+class FakeGitHub:
+    """
+    A GitHub account served from memory. `repositories` holds the payloads
+    of the repository list; `languages`, `commits` and `readmes` are keyed
+    by repository name (a name without commits answers 409, one without a
+    README 404, as GitHub does).
+    """
+
+    def __init__(self, username, repositories=(), languages=None, commits=None, readmes=None,
+                 base_url=DEFAULT_BASE_URL, latency=0.0, rate_limit=5000,
+                 secondary_limit_every=0, retry_after=1):
+        self.username = username
+        self.repositories = list(repositories)
+        self.languages = dict(languages or {})
+        self.commits = dict(commits or {})
+        self.readmes = dict(readmes or {})
+        self.base_url = base_url.rstrip('/')
+        # Seconds added to every request, standing in for the network round trip
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.remaining = rate_limit
+        self.reset_at = int(time.time()) + 3600
+        # Every n-th request is refused as a secondary rate limit (0: never)
+        self.secondary_limit_every = secondary_limit_every
+        self.retry_after = retry_after
+        # Session interface used by GitHubService
+        self.headers = {}
+        self.calls = []
+        self.slept = 0.0
+
+    # Accounts
+
+    @classmethod
+    def synthesize(cls, count, username='octocat', languages_per_repo=3, commits_per_repo=5,
+                   readme_ratio=0.8, seed=42, **options):
+        """An account with `count` public repositories, the newest pushed first"""
+        rng = random.Random(seed)
+        now = datetime.now(dt_timezone.utc).replace(microsecond=0)
+        fake = cls(username, **options)
+        for i in range(count):
+            name = f'repo-{i:05d}'
+            pushed_at = now - timedelta(hours=i * 7 + rng.randint(0, 6))
+            created_at = pushed_at - timedelta(days=rng.randint(1, 1500))
+            picked = rng.sample(LANGUAGES, k=min(languages_per_repo, len(LANGUAGES)))
+            languages = {language: rng.randint(500, 500_000) for language in picked}
+            fake.repositories.append({
+                'id': 10_000_000 + i,
+                'name': name,
+                'full_name': f'{username}/{name}',
+                'owner': {'login': username},
+                'private': False,
+                'html_url': f'https://github.com/{username}/{name}',
+                'description': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(4, 14))).capitalize(),
+                'fork': rng.random() < 0.15,
+                'homepage': '',
+                'size': rng.randint(10, 50_000),
+                'stargazers_count': int(rng.paretovariate(1.5)) - 1,
+                'watchers_count': rng.randint(0, 50),
+                'forks_count': rng.randint(0, 40),
+                'open_issues_count': rng.randint(0, 25),
+                'language': max(languages, key=languages.get) if languages else None,
+                'topics': rng.sample(WORDS, k=rng.randint(0, 4)),
+                'archived': rng.random() < 0.05,
+                'default_branch': 'main',
+                'created_at': _timestamp(created_at),
+                'updated_at': _timestamp(pushed_at),
+                'pushed_at': _timestamp(pushed_at),
+            })
+            fake.languages[name] = languages
+            fake.commits[name] = [
+                fake._commit(name, f'{rng.choice(WORDS).capitalize()} {rng.choice(WORDS)}',
+                             pushed_at - timedelta(hours=n * 5), n)
+                for n in range(commits_per_repo)
+            ]
+            if rng.random() < readme_ratio:
+                fake.readmes[name] = f'<h1>{name}</h1>\n<p>{fake.repositories[-1]["description"]}</p>'
+        return fake
+
+    @classmethod
+    def load(cls, path, **options):
+        """An account replayed from a fixture file written by `save` or `record_fixtures`"""
+        with open(path, encoding='utf-8') as fh:
+            data = json.load(fh)
+        return cls(
+            data['username'], data.get('repositories', ()), data.get('languages'),
+            data.get('commits'), data.get('readmes'), **options,
+        )
+
+    def as_fixture(self):
+        return {
+            'username': self.username,
+            'repositories': self.repositories,
+            'languages': self.languages,
+            'commits': self.commits,
+            'readmes': self.readmes,
+        }
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump(self.as_fixture(), fh, indent=2, sort_keys=True)
+
+    def _commit(self, name, message, committed_at, salt=''):
+        sha = _sha(self.username, name, message, committed_at.isoformat(), salt)
+        author = {'name': self.username, 'email': f'{self.username}@users.noreply.github.com',
+                  'date': _timestamp(committed_at)}
+        return {
+            'sha': sha,
+            'commit': {'message': message, 'author': author},
+            'html_url': f'https://github.com/{self.username}/{name}/commit/{sha}',
+        }
+
+    def push(self, name, message='Update', readme=None):
+        """Simulate a push to `name`: a new commit, new pushed_at and optionally a new README"""
+        repo = next(repo for repo in self.repositories if repo['name'] == name)
+        now = datetime.now(dt_timezone.utc).replace(microsecond=0)
+        repo['pushed_at'] = repo['updated_at'] = _timestamp(now)
+        self.commits.setdefault(name, []).insert(0, self._commit(name, message, now, len(self.calls)))
+        if readme is not None:
+            self.readmes[name] = readme
+
+    # Session interface
+
+    def sleep(self, seconds):
+        """Stand-in for the service's time.sleep: waits are counted, not spent"""
+        self.slept += seconds
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        if self.latency:
+            time.sleep(self.latency)
+        parts = urlsplit(url)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        query.update(params or {})
+        path = parts.path.rstrip('/')
+        headers = headers or {}
+
+        response = self._rate_limited(url)
+        if response is None:
+            response = self._route(url, path, query, headers)
+        self.calls.append((path, response.status_code))
+        return response
+
+    def _response(self, url, status, body=b'', headers=None, count=True):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode()
+        elif isinstance(body, str):
+            body = body.encode()
+        # Conditional requests answered with 304 do not count against the quota
+        if count and self.remaining > 0:
+            self.remaining -= 1
+        response = requests.Response()
+        response.status_code = status
+        response.url = url
+        response.encoding = 'utf-8'
+        response._content = body
+        response.headers = CaseInsensitiveDict({
+            'Content-Type': 'application/json; charset=utf-8',
+            'Content-Length': str(len(body)),
+            'X-RateLimit-Limit': str(self.rate_limit),
+            'X-RateLimit-Remaining': str(self.remaining),
+            'X-RateLimit-Reset': str(self.reset_at),
+            'X-RateLimit-Resource': 'core',
+            **(headers or {}),
+        })
+        return response
+
+    def _rate_limited(self, url):
+        if time.time() >= self.reset_at:
+            self.remaining = self.rate_limit
+            self.reset_at = int(time.time()) + 3600
+        if self.remaining <= 0:
+            return self._response(url, 403, {
+                'message': 'API rate limit exceeded',
+                'documentation_url': 'https://docs.github.com/rest/rate-limit',
+            }, count=False)
+        if self.secondary_limit_every and (len(self.calls) + 1) % self.secondary_limit_every == 0:
+            return self._response(url, 403, {
+                'message': 'You have exceeded a secondary rate limit.',
+            }, headers={'Retry-After': str(self.retry_after)}, count=False)
+        return None
+
+    def _route(self, url, path, query, headers):
+        prefix = urlsplit(self.base_url).path.rstrip('/')
+        segments = path[len(prefix):].strip('/').split('/')
+        not_found = {'message': 'Not Found'}
+
+        if segments[:1] == ['users'] and segments[2:] == ['repos'] and segments[1] == self.username:
+            return self._repository_page(url, query)
+        if len(segments) < 3 or segments[0] != 'repos' or segments[1] != self.username:
+            return self._response(url, 404, not_found)
+
+        name, resource = segments[2], segments[3:]
+        repo = next((repo for repo in self.repositories if repo['name'] == name), None)
+        if repo is None:
+            return self._response(url, 404, not_found)
+        if not resource:
+            return self._response(url, 200, repo)
+        if resource == ['languages']:
+            return self._response(url, 200, self.languages.get(name, {}))
+        if resource == ['commits']:
+            commits = self.commits.get(name)
+            if not commits:
+                return self._response(url, 409, {'message': 'Git Repository is empty.'})
+            return self._response(url, 200, commits[:int(query.get('per_page', 30))])
+        if resource == ['readme']:
+            if name not in self.readmes:
+                return self._response(url, 404, not_found)
+            html = self.readmes[name]
+            etag = f'"{_sha(html)}"'
+            if headers.get('If-None-Match') == etag:
+                return self._response(url, 304, headers={'ETag': etag}, count=False)
+            return self._response(url, 200, html, headers={'ETag': etag, 'Content-Type': 'text/html; charset=utf-8'})
+        return self._response(url, 404, not_found)
+
+    def _repository_page(self, url, query):
+        per_page = min(int(query.get('per_page', 30)), MAX_PER_PAGE)
+        page = max(int(query.get('page', 1)), 1)
+        # The service asks for sort=updated: most recently pushed first
+        ordered = sorted(self.repositories, key=lambda repo: repo['pushed_at'] or '', reverse=True)
+        start = (page - 1) * per_page
+        links = []
+        base = url.split('?', 1)[0]
+        if start + per_page < len(ordered):
+            next_query = urlencode({**query, 'page': page + 1, 'per_page': per_page})
+            last_query = urlencode({**query, 'page': -(-len(ordered) // per_page), 'per_page': per_page})
+            links.append(f'<{base}?{next_query}>; rel="next"')
+            links.append(f'<{base}?{last_query}>; rel="last"')
+        headers = {'Link': ', '.join(links)} if links else {}
+        return self._response(url, 200, ordered[start:start + per_page], headers=headers)
+
+    # Statistics
+
+    def requests_by_resource(self):
+        """Number of requests per resource ('repos', 'languages', ...), refused ones included"""
+        counts = {}
+        for path, _status in self.calls:
+            resource = path.rsplit('/', 1)[-1]
+            if resource not in ('repos', 'languages', 'commits', 'readme'):
+                resource = 'repository'
+            counts[resource] = counts.get(resource, 0) + 1
+        return counts
+
+
+def record_fixtures(service, path):
+    """
+    Record `service`'s account from the real API into a fixture file for
+    FakeGitHub.load. Costs one request per repository page plus three per
+    repository; returns the number of repositories recorded.
+    """
+    repositories = service.fetch_repositories(sync_to_db=False)
+    fake = FakeGitHub(service.username, repositories, base_url=service.base_url)
+    for repo in repositories:
+        name = repo['name']
+        languages = service.fetch_repository_languages(name)
+        if languages is not None:
+            fake.languages[name] = languages
+        commits = service.fetch_repository_commits(name)
+        if commits:
+            fake.commits[name] = commits
+        html, _etag = service.fetch_repository_readme(name)
+        if html:
+            fake.readmes[name] = html
+    fake.save(path)
+    return len(repositories)
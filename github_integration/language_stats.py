@@ -0,0 +1,97 @@
+"""
+Language Statistics
+Aggregates the per-repository GitHubLanguage rows into one LanguageStat
+row per language when a sync finishes, so pages read profile-wide totals
+in a single query instead of grouping repositories on every request.
+Byte totals and percentages cover non-fork repositories; the primary
+repository count (used by the list page's language filter) covers every
+listed, i.e. non-archived, repository. A full sync keeps the values each
+row had before it as the trend baseline; webhook updates in between
+leave that baseline alone, so trends stay relative to the last sync.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+TWO_PLACES = Decimal('0.01')
+
+
+def _percentage(part, total):
+    if not total:
+        return Decimal('0.00')
+    return (Decimal(part) * 100 / Decimal(total)).quantize(TWO_PLACES)
+
+
+def compute_language_totals():
+    """{language: {'bytes_count', 'repo_count', 'primary_repo_count'}} from the synced repositories"""
+    from .models import GitHubLanguage, GitHubRepository
+
+    totals = {}
+    for row in GitHubLanguage.objects.filter(repository__is_fork=False).values('name').annotate(
+        total=Sum('bytes_count'), repos=Count('repository', distinct=True)
+    ).order_by():
+        totals[row['name']] = {'bytes_count': row['total'] or 0, 'repo_count': row['repos'], 'primary_repo_count': 0}
+    primary = GitHubRepository.objects.filter(is_archived=False).exclude(
+        primary_language__isnull=True
+    ).exclude(primary_language='').values_list('primary_language').annotate(n=Count('pk')).order_by()
+    for name, count in primary:
+        totals.setdefault(name, {'bytes_count': 0, 'repo_count': 0, 'primary_repo_count': 0})
+        totals[name]['primary_repo_count'] = count
+    return totals
+
+
+def refresh_language_stats(rotate_baseline=True):
+    """
+    Recompute every LanguageStat row. With `rotate_baseline` the replaced
+    values become the trend baseline; otherwise the baseline is kept.
+    """
+    from .models import LanguageStat
+
+    totals = compute_language_totals()
+    grand_total = sum(values['bytes_count'] for values in totals.values())
+    now = timezone.now()
+    with transaction.atomic():
+        existing = {stat.name: stat for stat in LanguageStat.objects.select_for_update()}
+        to_create, to_update = [], []
+        for name, values in totals.items():
+            stat = existing.pop(name, None)
+            if stat is None:
+                stat = LanguageStat(name=name)
+                to_create.append(stat)
+            elif not rotate_baseline:
+                to_update.append(stat)
+            else:
+                stat.previous_bytes_count = stat.bytes_count
+                stat.previous_percentage = stat.percentage
+                stat.previous_repo_count = stat.repo_count
+                to_update.append(stat)
+            stat.bytes_count = values['bytes_count']
+            stat.percentage = _percentage(values['bytes_count'], grand_total)
+            stat.repo_count = values['repo_count']
+            stat.primary_repo_count = values['primary_repo_count']
+            stat.computed_at = now
+        # Languages no longer in any repository drop out
+        if existing:
+            LanguageStat.objects.filter(pk__in=[stat.pk for stat in existing.values()]).delete()
+        LanguageStat.objects.bulk_create(to_create)
+        LanguageStat.objects.bulk_update(to_update, [
+            'bytes_count', 'percentage', 'repo_count', 'primary_repo_count',
+            'previous_bytes_count', 'previous_percentage', 'previous_repo_count', 'computed_at',
+        ])
+    return len(totals)
+
+
+def top_languages(limit=8):
+    """The `limit` languages with the most code across non-fork repositories"""
+    from .models import LanguageStat
+
+    return LanguageStat.objects.filter(bytes_count__gt=0)[:limit]
+
+
+def filter_languages():
+    """Names offered by the repository list's language filter"""
+    from .models import LanguageStat
+
+    return LanguageStat.objects.filter(primary_repo_count__gt=0).order_by('name').values_list('name', flat=True)
@@ -0,0 +1,129 @@
+"""
+Management command to measure GitHubService sync throughput offline,
+against the fake GitHub API instead of api.github.com:
+
+    python manage.py benchmark_github_sync                      # 10, 100 and 1000 repositories
+    python manage.py benchmark_github_sync --sizes 500 --latency 80
+    python manage.py benchmark_github_sync --fixtures account.json
+    python manage.py benchmark_github_sync --record-fixtures account.json   # calls GitHub
+
+Runs on whatever DATABASES points at; a separate test database is created
+and destroyed.
+"""
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from github_integration.benchmarking import DEFAULT_SIZES, PHASES, measure_sync
+from github_integration.fake_api import FakeGitHub, record_fixtures
+
+
+class Command(BaseCommand):
+    help = 'Measure GitHub sync wall time, queries and API requests against a fake GitHub API'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=list(DEFAULT_SIZES),
+            help='Numbers of synthesized repositories (default 10 100 1000)',
+        )
+        parser.add_argument(
+            '--fixtures',
+            type=str,
+            help='Replay an account recorded with --record-fixtures instead of synthesizing',
+        )
+        parser.add_argument(
+            '--record-fixtures',
+            type=str,
+            metavar='PATH',
+            help='Record the configured GitHub account to PATH and exit (uses the real API)',
+        )
+        parser.add_argument(
+            '--latency',
+            type=float,
+            default=0.0,
+            help='Milliseconds added to every fake API request',
+        )
+        parser.add_argument(
+            '--rate-limit',
+            type=int,
+            default=5000,
+            help='Requests allowed before the fake API answers 403 (default 5000)',
+        )
+        parser.add_argument(
+            '--secondary-limit-every',
+            type=int,
+            default=0,
+            help='Refuse every n-th request with a secondary rate limit and Retry-After',
+        )
+        parser.add_argument(
+            '--pushed',
+            type=float,
+            default=0.1,
+            help='Share of repositories pushed to before the last sync (default 0.1)',
+        )
+
+    def handle(self, *args, **options):
+        if options['record_fixtures']:
+            from github_integration.rate_limit import GitHubError
+            from github_integration.services import GitHubService
+
+            try:
+                count = record_fixtures(GitHubService(), options['record_fixtures'])
+            except GitHubError as exc:
+                raise CommandError(f'Recording failed: {exc}')
+            self.stdout.write(self.style.SUCCESS(f"✓ Recorded {count} repositories to {options['record_fixtures']}"))
+            return
+
+        fake_options = {
+            'latency': options['latency'] / 1000,
+            'rate_limit': options['rate_limit'],
+            'secondary_limit_every': options['secondary_limit_every'],
+        }
+        if options['fixtures']:
+            try:
+                accounts = [FakeGitHub.load(options['fixtures'], **fake_options)]
+            except (OSError, ValueError, KeyError) as exc:
+                raise CommandError(f"Could not read {options['fixtures']}: {exc}")
+        else:
+            accounts = [FakeGitHub.synthesize(size, **fake_options) for size in options['sizes']]
+
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        # One log line per API call (404s for missing READMEs are warnings) would
+        # drown the results; rate limiting and deferrals show in the table
+        logging.disable(logging.WARNING)
+        try:
+            self.stdout.write(f'Benchmarking GitHub sync on {connection.vendor}...')
+            results = [
+                (len(fake.repositories), measure_sync(fake, pushed_ratio=options['pushed']))
+                for fake in accounts
+            ]
+        finally:
+            logging.disable(logging.NOTSET)
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(
+            f"\n{'Repos':>6} {'Phase':10} {'Requests':>9} {'Queries':>8} {'Time ms':>9} "
+            f"{'Repos/s':>8} {'Waited s':>9} {'Deferred':>9}"
+        )
+        failed = False
+        for size, phases in results:
+            for phase in PHASES:
+                result = phases[phase]
+                self.stdout.write(
+                    f"{size:>6} {phase:10} {result['requests']:>9} {result['queries']:>8} "
+                    f"{result['time_ms']:>9} {result['repos_per_s']:>8} {result['waited_s']:>9} "
+                    f"{result['deferred']:>9}"
+                )
+                if result['error']:
+                    failed = True
+                    self.stdout.write(self.style.ERROR(f"✗ {size} repositories, {phase}: {result['error']}"))
+        if not failed:
+            self.stdout.write(self.style.SUCCESS('\n✓ All syncs completed'))
@@ -0,0 +1,16 @@
+"""
+Management command to recompute the profile-wide language statistics.
+Syncing from GitHub refreshes them automatically; run this after editing
+or deleting repositories or their languages by hand.
+"""
+from django.core.management.base import BaseCommand
+
+from github_integration.language_stats import refresh_language_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the language statistics summary from the synced repositories'
+
+    def handle(self, *args, **options):
+        count = refresh_language_stats()
+        self.stdout.write(self.style.SUCCESS(f'✓ Recomputed statistics for {count} languages'))
@@ -0,0 +1,78 @@
+"""
+Management command to apply GitHub webhook payloads without GitHub:
+recorded payload files (as shown under a webhook's "Recent Deliveries"),
+or deliveries already stored by the webhook endpoint. Payloads are
+processed inline, exactly as the background task would.
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from github_integration.models import WebhookDelivery
+from github_integration.webhooks import HANDLED_EVENTS, handle_event, process_delivery
+
+
+class Command(BaseCommand):
+    help = 'Apply recorded or stored GitHub webhook payloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'files',
+            nargs='*',
+            help='JSON payload files; a file may also hold {"event": ..., "payload": ...}',
+        )
+        parser.add_argument(
+            '--event',
+            choices=sorted(HANDLED_EVENTS),
+            help='Event type of payload files that do not name one (X-GitHub-Event)',
+        )
+        parser.add_argument(
+            '--delivery',
+            action='append',
+            default=[],
+            help='Replay a stored delivery by its X-GitHub-Delivery id (repeatable)',
+        )
+        parser.add_argument(
+            '--failed',
+            action='store_true',
+            help='Replay every stored delivery whose processing failed',
+        )
+
+    def handle(self, *args, **options):
+        if not (options['files'] or options['delivery'] or options['failed']):
+            raise CommandError('Give payload files, --delivery ids or --failed')
+
+        for path in options['files']:
+            try:
+                with open(path, encoding='utf-8') as fh:
+                    data = json.load(fh)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f'Could not read {path}: {exc}')
+            if 'payload' in data and 'event' in data:
+                event, payload = data['event'], data['payload']
+            else:
+                event, payload = options['event'], data
+            if not event:
+                raise CommandError(f'{path} does not name its event; pass --event')
+            try:
+                result = handle_event(event, payload)
+            except Exception as exc:
+                raise CommandError(f'{path}: {type(exc).__name__}: {exc}')
+            self.stdout.write(self.style.SUCCESS(f'✓ {path} ({event}): {result}'))
+
+        deliveries = WebhookDelivery.objects.none()
+        if options['delivery']:
+            deliveries = WebhookDelivery.objects.filter(delivery_id__in=options['delivery'])
+            missing = set(options['delivery']) - set(deliveries.values_list('delivery_id', flat=True))
+            if missing:
+                raise CommandError(f"Unknown deliveries: {', '.join(sorted(missing))}")
+        if options['failed']:
+            deliveries = deliveries | WebhookDelivery.objects.exclude(error='')
+
+        for delivery in deliveries.order_by('received_at'):
+            process_delivery(delivery.pk)
+            delivery.refresh_from_db()
+            if delivery.error:
+                self.stdout.write(self.style.ERROR(f'✗ {delivery}: {delivery.error}'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'✓ {delivery}'))
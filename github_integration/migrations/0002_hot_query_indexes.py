@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("github_integration", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="githubrepository",
+            index=models.Index(
+                condition=models.Q(("is_archived", False)),
+                fields=["-stars_count"],
+                name="github_repo_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="githubrepository",
+            index=models.Index(
+                fields=["primary_language", "-stars_count"],
+                name="github_repo_language_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="githubrepository",
+            index=models.Index(
+                condition=models.Q(("featured", True)),
+                fields=["-featured", "display_order", "-stars_count"],
+                name="github_repo_featured_idx",
+            ),
+        ),
+    ]
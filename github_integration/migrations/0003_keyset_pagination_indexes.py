@@ -0,0 +1,60 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("github_integration", "0002_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="githubrepository",
+            name="github_repo_active_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="githubrepository",
+            name="github_repo_language_idx",
+        ),
+        migrations.AddIndex(
+            model_name="githubrepository",
+            index=models.Index(
+                condition=models.Q(("is_archived", False)),
+                fields=["-stars_count", "-id"],
+                name="github_repo_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="githubrepository",
+            index=models.Index(
+                condition=models.Q(("is_archived", False)),
+                fields=["-forks_count", "-id"],
+                name="github_repo_forks_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="githubrepository",
+            index=models.Index(
+                condition=models.Q(("is_archived", False)),
+                fields=["-updated_at", "-id"],
+                name="github_repo_updated_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="githubrepository",
+            index=models.Index(
+                condition=models.Q(("is_archived", False)),
+                fields=["name", "id"],
+                name="github_repo_name_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="githubrepository",
+            index=models.Index(
+                fields=["primary_language", "-stars_count", "-id"],
+                name="github_repo_language_idx",
+            ),
+        ),
+    ]
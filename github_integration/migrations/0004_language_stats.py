@@ -0,0 +1,107 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:53
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+
+def compute_language_stats(apps, schema_editor):
+    """Summarize the languages of the repositories synced so far"""
+    GitHubLanguage = apps.get_model("github_integration", "GitHubLanguage")
+    GitHubRepository = apps.get_model("github_integration", "GitHubRepository")
+    LanguageStat = apps.get_model("github_integration", "LanguageStat")
+
+    now = timezone.now()
+    stats = {}
+    for name, total, repos in (
+        GitHubLanguage.objects.filter(repository__is_fork=False)
+        .values_list("name")
+        .annotate(Sum("bytes_count"), Count("repository", distinct=True))
+        .order_by()
+    ):
+        stats[name] = LanguageStat(
+            name=name, bytes_count=total or 0, repo_count=repos, computed_at=now
+        )
+    for name, count in (
+        GitHubRepository.objects.filter(is_archived=False)
+        .exclude(primary_language__isnull=True)
+        .exclude(primary_language="")
+        .values_list("primary_language")
+        .annotate(Count("pk"))
+        .order_by()
+    ):
+        stats.setdefault(name, LanguageStat(name=name, computed_at=now))
+        stats[name].primary_repo_count = count
+    grand_total = sum(stat.bytes_count for stat in stats.values())
+    for stat in stats.values():
+        if grand_total:
+            stat.percentage = (
+                Decimal(stat.bytes_count) * 100 / Decimal(grand_total)
+            ).quantize(Decimal("0.01"))
+    LanguageStat.objects.bulk_create(stats.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("github_integration", "0003_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LanguageStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=50, unique=True)),
+                (
+                    "bytes_count",
+                    models.BigIntegerField(
+                        default=0, help_text="Bytes across all non-fork repositories"
+                    ),
+                ),
+                (
+                    "percentage",
+                    models.DecimalField(decimal_places=2, default=0.0, max_digits=5),
+                ),
+                (
+                    "repo_count",
+                    models.IntegerField(
+                        default=0,
+                        help_text="Non-fork repositories containing this language",
+                    ),
+                ),
+                (
+                    "primary_repo_count",
+                    models.IntegerField(
+                        default=0,
+                        help_text="Listed repositories with this primary language",
+                    ),
+                ),
+                ("previous_bytes_count", models.BigIntegerField(blank=True, null=True)),
+                (
+                    "previous_percentage",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=5, null=True
+                    ),
+                ),
+                ("previous_repo_count", models.IntegerField(blank=True, null=True)),
+                ("computed_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Language Statistic",
+                "verbose_name_plural": "Language Statistics",
+                "ordering": ["-bytes_count", "name"],
+            },
+        ),
+        migrations.RunPython(compute_language_stats, migrations.RunPython.noop),
+    ]
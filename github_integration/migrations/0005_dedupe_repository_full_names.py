@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:56
+
+from django.db import migrations
+
+
+def remove_duplicate_full_names(apps, schema_editor):
+    """Keep the most recently synced row for each full_name before it becomes unique"""
+    GitHubRepository = apps.get_model("github_integration", "GitHubRepository")
+
+    seen = set()
+    duplicates = []
+    for pk, full_name in GitHubRepository.objects.order_by(
+        "full_name", "-last_synced", "-pk"
+    ).values_list("pk", "full_name"):
+        if full_name in seen:
+            duplicates.append(pk)
+        seen.add(full_name)
+    GitHubRepository.objects.filter(pk__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("github_integration", "0004_language_stats"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_full_names, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("github_integration", "0005_dedupe_repository_full_names"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="githubrepository",
+            name="readme_etag",
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name="githubrepository",
+            name="readme_html",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AlterField(
+            model_name="githubrepository",
+            name="full_name",
+            field=models.CharField(
+                help_text="owner/name, as in the GitHub URL",
+                max_length=300,
+                unique=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="githubcommit",
+            index=models.Index(
+                fields=["repository", "-committed_at"], name="github_commit_recent_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("github_integration", "0006_repository_detail"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WebhookDelivery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "delivery_id",
+                    models.CharField(
+                        help_text="X-GitHub-Delivery header",
+                        max_length=100,
+                        unique=True,
+                    ),
+                ),
+                ("event", models.CharField(max_length=50)),
+                ("action", models.CharField(blank=True, max_length=50)),
+                ("repository_full_name", models.CharField(blank=True, max_length=300)),
+                ("payload", models.JSONField()),
+                ("received_at", models.DateTimeField(auto_now_add=True)),
+                ("processed_at", models.DateTimeField(blank=True, null=True)),
+                ("error", models.TextField(blank=True)),
+            ],
+            options={
+                "verbose_name": "Webhook Delivery",
+                "verbose_name_plural": "Webhook Deliveries",
+                "ordering": ["-received_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("github_integration", "0007_webhook_delivery"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="githubrepository",
+            name="details_pushed_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="pushed_at when languages, README and commits were last fetched",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:32
+
+from django.db import migrations, models
+
+
+def resync_repositories_without_commits(apps, schema_editor):
+    # Their commits may have been dropped as duplicates of another repository's
+    GitHubRepository = apps.get_model("github_integration", "GitHubRepository")
+    GitHubRepository.objects.filter(featured=True, commits__isnull=True).update(details_pushed_at=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("github_integration", "0008_details_pushed_at"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="githubcommit",
+            name="sha",
+            field=models.CharField(max_length=40),
+        ),
+        migrations.AddConstraint(
+            model_name="githubcommit",
+            constraint=models.UniqueConstraint(
+                fields=("repository", "sha"), name="github_commit_unique_repository_sha"
+            ),
+        ),
+        migrations.RunPython(resync_repositories_without_commits, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("github_integration", "0009_commit_unique_per_repository"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="githubrepository",
+            name="github_repo_language_idx",
+        ),
+        migrations.AddIndex(
+            model_name="githubrepository",
+            index=models.Index(
+                condition=models.Q(("is_archived", False)),
+                fields=["primary_language", "-stars_count", "-id"],
+                name="github_repo_language_idx",
+            ),
+        ),
+    ]
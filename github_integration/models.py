@@ -1,4 +1,5 @@
 from django.db import models
+from django.urls import reverse
 from django.utils import timezone
 
 class GitHubRepository(models.Model):
@@ -6,7 +7,7 @@ class GitHubRepository(models.Model):
     # Repository identifiers
     github_id = models.IntegerField(unique=True)
     name = models.CharField(max_length=200)
-    full_name = models.CharField(max_length=300)
+    full_name = models.CharField(max_length=300, unique=True, help_text="owner/name, as in the GitHub URL")
     
     # Repository details
     description = models.TextField(blank=True, null=True)
@@ -39,6 +40,14 @@ class GitHubRepository(models.Model):
     display_order = models.IntegerField(default=0)
     custom_description = models.TextField(blank=True, help_text="Override GitHub description")
     
+    # README rendered by GitHub at sync time (sanitized), so the detail page needs no API call
+    readme_html = models.TextField(blank=True)
+    readme_etag = models.CharField(max_length=200, blank=True, editable=False)
+    details_pushed_at = models.DateTimeField(
+        null=True, blank=True, editable=False,
+        help_text="pushed_at when languages, README and commits were last fetched",
+    )
+    
     # Cache
     last_synced = models.DateTimeField(auto_now=True)
     
@@ -46,10 +55,28 @@ class GitHubRepository(models.Model):
         ordering = ['-featured', 'display_order', '-stars_count']
         verbose_name = "GitHub Repository"
         verbose_name_plural = "GitHub Repositories"
+        indexes = [
+            # Repository list: keyset pages of non-archived repos in each sort order.
+            # Boolean filters compile to "NOT is_archived", which only a partial index matches.
+            models.Index(fields=['-stars_count', '-id'], condition=models.Q(is_archived=False), name='github_repo_active_idx'),
+            models.Index(fields=['-forks_count', '-id'], condition=models.Q(is_archived=False), name='github_repo_forks_idx'),
+            models.Index(fields=['-updated_at', '-id'], condition=models.Q(is_archived=False), name='github_repo_updated_idx'),
+            models.Index(fields=['name', 'id'], condition=models.Q(is_archived=False), name='github_repo_name_idx'),
+            models.Index(fields=['primary_language', '-stars_count', '-id'], condition=models.Q(is_archived=False), name='github_repo_language_idx'),
+            models.Index(
+                fields=['-featured', 'display_order', '-stars_count'],
+                condition=models.Q(featured=True),
+                name='github_repo_featured_idx',
+            ),
+        ]
     
     def __str__(self):
         return self.full_name
     
+    def get_absolute_url(self):
+        owner, name = self.full_name.split('/', 1)
+        return reverse('github:repository_detail', kwargs={'owner': owner, 'name': name})
+    
     @property
     def display_description(self):
         return self.custom_description or self.description or "No description available"
@@ -67,10 +94,52 @@ class GitHubLanguage(models.Model):
     def __str__(self):
         return f"{self.name} ({self.percentage}%)"
 
+class LanguageStat(models.Model):
+    """Profile-wide totals for one language, recomputed after every sync (see language_stats)"""
+    name = models.CharField(max_length=50, unique=True)
+    bytes_count = models.BigIntegerField(default=0, help_text="Bytes across all non-fork repositories")
+    percentage = models.DecimalField(max_digits=5, decimal_places=2, default=0.0)
+    repo_count = models.IntegerField(default=0, help_text="Non-fork repositories containing this language")
+    primary_repo_count = models.IntegerField(default=0, help_text="Listed repositories with this primary language")
+
+    # Values from the sync before, for trends; null when the language is new
+    previous_bytes_count = models.BigIntegerField(null=True, blank=True)
+    previous_percentage = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    previous_repo_count = models.IntegerField(null=True, blank=True)
+
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-bytes_count', 'name']
+        verbose_name = "Language Statistic"
+        verbose_name_plural = "Language Statistics"
+
+    def __str__(self):
+        return f"{self.name} ({self.percentage}%)"
+
+    @property
+    def percentage_change(self):
+        if self.previous_percentage is None:
+            return None
+        return self.percentage - self.previous_percentage
+
+    @property
+    def trend(self):
+        """'new', 'up', 'down' or 'steady' relative to the previous sync"""
+        change = self.percentage_change
+        if change is None:
+            return 'new'
+        if change > 0:
+            return 'up'
+        if change < 0:
+            return 'down'
+        return 'steady'
+
 class GitHubCommit(models.Model):
     """Recent commits for featured repositories"""
     repository = models.ForeignKey(GitHubRepository, on_delete=models.CASCADE, related_name='commits')
-    sha = models.CharField(max_length=40, unique=True)
+    # Unique per repository: forks and repositories with shared history store the same SHAs
+    sha = models.CharField(max_length=40)
     message = models.TextField()
     author_name = models.CharField(max_length=200)
     author_email = models.EmailField()
@@ -79,6 +148,33 @@ class GitHubCommit(models.Model):
     
     class Meta:
         ordering = ['-committed_at']
+        indexes = [
+            # Detail page: a repository's latest commits
+            models.Index(fields=['repository', '-committed_at'], name='github_commit_recent_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['repository', 'sha'], name='github_commit_unique_repository_sha'),
+        ]
     
     def __str__(self):
         return f"{self.sha[:7]} - {self.message[:50]}"
+
+class WebhookDelivery(models.Model):
+    """A verified GitHub webhook delivery, kept so redeliveries are ignored and payloads can be replayed"""
+    delivery_id = models.CharField(max_length=100, unique=True, help_text="X-GitHub-Delivery header")
+    event = models.CharField(max_length=50)
+    action = models.CharField(max_length=50, blank=True)
+    repository_full_name = models.CharField(max_length=300, blank=True)
+    payload = models.JSONField()
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    
+    class Meta:
+        ordering = ['-received_at']
+        verbose_name = "Webhook Delivery"
+        verbose_name_plural = "Webhook Deliveries"
+    
+    def __str__(self):
+        label = f"{self.event}.{self.action}" if self.action else self.event
+        return f"{label} {self.repository_full_name} ({self.delivery_id})"
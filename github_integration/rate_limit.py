@@ -0,0 +1,124 @@
+"""
+GitHub Rate Limits
+Tracks the API quota from the X-RateLimit-* headers of every response and
+decides how long to wait when GitHub refuses a request with 403 or 429:
+Retry-After when given, the reset time when the quota is used up, and
+otherwise (secondary limits) exponential backoff with full jitter. Waits
+longer than GITHUB_RATE_LIMIT_MAX_WAIT are not slept through; the caller
+gets RateLimited instead.
+
+The last seen quota is kept in the default cache, so the metrics dashboard
+shows it whichever process made the calls (when REDIS_URL shares the cache
+between them). It expires with GitHub's rate limit window, after which it
+says nothing about the current quota anyway.
+"""
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+QUOTA_CACHE_KEY = 'github:rate_limit'
+# GitHub's quota window
+QUOTA_CACHE_TIMEOUT = 60 * 60
+DEFAULT_MAX_WAIT = 60
+DEFAULT_RESERVE = 50
+BACKOFF_BASE = 1
+BACKOFF_CAP = 30
+
+
+class GitHubError(Exception):
+    """A GitHub request that failed without an answer; not the same as an empty result"""
+
+
+class GitHubUnavailable(GitHubError):
+    """Timeouts, connection errors and server errors that persisted through the retries"""
+
+
+class RateLimited(GitHubError):
+    def __init__(self, message, reset_at=None):
+        super().__init__(message)
+        self.reset_at = reset_at
+
+
+def max_wait():
+    return getattr(settings, 'GITHUB_RATE_LIMIT_MAX_WAIT', DEFAULT_MAX_WAIT)
+
+
+def quota_reserve():
+    """Requests kept back for webhooks and admin actions when a sync plans its calls"""
+    return getattr(settings, 'GITHUB_RATE_LIMIT_RESERVE', DEFAULT_RESERVE)
+
+
+def _int_header(response, name):
+    value = response.headers.get(name)
+    return int(value) if value and value.isdigit() else None
+
+
+class Quota:
+    """The most recent X-RateLimit-* values of one resource ('core', 'search', ...)"""
+
+    def __init__(self):
+        self.limit = None
+        self.remaining = None
+        self.reset_at = None
+        self.resource = None
+        self.updated_at = None
+
+    def update(self, response):
+        remaining = _int_header(response, 'X-RateLimit-Remaining')
+        if remaining is None:
+            return
+        self.limit = _int_header(response, 'X-RateLimit-Limit')
+        self.remaining = remaining
+        self.reset_at = _int_header(response, 'X-RateLimit-Reset')
+        self.resource = response.headers.get('X-RateLimit-Resource', 'core')
+        self.updated_at = time.time()
+        cache.set(QUOTA_CACHE_KEY, self.as_dict(), QUOTA_CACHE_TIMEOUT)
+
+    def as_dict(self):
+        return {
+            'limit': self.limit,
+            'remaining': self.remaining,
+            'reset_at': self.reset_at,
+            'resource': self.resource,
+            'updated_at': self.updated_at,
+        }
+
+    def available(self, now=None):
+        """Requests left before the reset; None while no response has been seen"""
+        if self.remaining is None:
+            return None
+        now = time.time() if now is None else now
+        if self.reset_at is not None and now >= self.reset_at:
+            return self.limit
+        return self.remaining
+
+
+def is_rate_limited(response):
+    if response.status_code == 429:
+        return True
+    if response.status_code != 403:
+        return False
+    if 'Retry-After' in response.headers or response.headers.get('X-RateLimit-Remaining') == '0':
+        return True
+    # Secondary limits come without headers; only the message tells them from a permission error
+    return 'rate limit' in response.text.lower()
+
+
+def retry_delay(response, attempt, now=None):
+    """Seconds to wait before retrying a rate-limited `response`"""
+    now = time.time() if now is None else now
+    # Up to a second of jitter on top, so workers do not retry in lockstep
+    retry_after = _int_header(response, 'Retry-After')
+    if retry_after is not None:
+        return retry_after + random.random()
+    reset_at = _int_header(response, 'X-RateLimit-Reset')
+    if response.headers.get('X-RateLimit-Remaining') == '0' and reset_at:
+        return max(reset_at - now, 0) + 1 + random.random()
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+def last_quota():
+    """The quota of the most recent GitHub response seen by any process, or None"""
+    return cache.get(QUOTA_CACHE_KEY)
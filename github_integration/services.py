@@ -1,12 +1,39 @@
+import logging
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 from datetime import datetime
+from portfolio.instrumentation import external_call
+from portfolio.metrics import metrics
+from portfolio.sanitize import sanitize_html
+from .language_stats import refresh_language_stats
 from .models import GitHubRepository, GitHubLanguage, GitHubCommit
+from .rate_limit import (
+    GitHubError, GitHubUnavailable, Quota, RateLimited, is_rate_limited, max_wait, quota_reserve, retry_delay,
+)
+
+logger = logging.getLogger(__name__)
+
+# Transient gateway errors are retried by urllib3; the retry count is reported per call
+RETRY_POLICY = Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504), allowed_methods=('GET',))
+REQUEST_TIMEOUT = 15
+# Rate-limited requests are retried this many times (each wait capped by GITHUB_RATE_LIMIT_MAX_WAIT)
+RATE_LIMIT_RETRIES = 3
+# Calls a repository's details take at most: languages, README, commits
+DETAIL_CALLS = 3
 
 
 class GitHubService:
-    """Service to interact with GitHub API"""
+    """
+    Service to interact with GitHub API. The fetch_* methods return None when
+    GitHub gave no answer (rate limited, unavailable, error), which callers
+    must not mistake for an empty result.
+    """
     
     def __init__(self, username=None, token=None):
         self.username = username or settings.GITHUB_USERNAME
@@ -17,9 +44,58 @@ class GitHubService:
         }
         if self.token:
             self.headers['Authorization'] = f'token {self.token}'
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount('https://', HTTPAdapter(max_retries=RETRY_POLICY))
+        self.sleep = time.sleep
+        self.quota = Quota()
+        # While rate limited, requests fail fast instead of being sent
+        self.limited_until = 0
+        # Repositories whose details were left for the next sync
+        self.deferred = []
+    
+    def _request(self, url, operation, params=None, headers=None, allow=(), **context):
+        """
+        GET a GitHub API URL, timed via external_call, waiting out rate limits.
+        Returns the response for statuses below 400 and those in `allow`;
+        raises RateLimited or GitHubUnavailable/GitHubError otherwise.
+        """
+        if self.rate_limited:
+            raise RateLimited(f'{operation}: rate limited', reset_at=self.quota.reset_at)
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            try:
+                with external_call('github', operation, **context) as call:
+                    response = self.session.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+                    call.record_response(response)
+            except requests.RequestException as exc:
+                raise GitHubUnavailable(f'{operation}: {exc}') from exc
+            self.quota.update(response)
+            if not is_rate_limited(response):
+                break
+            delay = retry_delay(response, attempt)
+            if attempt == RATE_LIMIT_RETRIES or delay > max_wait():
+                self.limited_until = time.time() + delay
+                metrics.record('github', 'rate_limited', {'wait_s': delay}, error=True)
+                raise RateLimited(f'{operation}: rate limited, retry in {delay:.0f}s', reset_at=self.quota.reset_at)
+            logger.warning("GitHub rate limit on %s, retrying in %.1fs", operation, delay)
+            metrics.record('github', 'rate_limit_backoff', {'wait_s': delay})
+            self.sleep(delay)
+        
+        if response.status_code >= 400 and response.status_code not in allow:
+            error = GitHubUnavailable if response.status_code >= 500 else GitHubError
+            raise error(f'{operation}: HTTP {response.status_code}')
+        return response
+    
+    @property
+    def rate_limited(self):
+        return time.time() < self.limited_until
+    
+    def _get(self, url, operation, params=None, **context):
+        """GET a GitHub API URL and return the decoded JSON"""
+        return self._request(url, operation, params=params, **context).json()
     
     def fetch_repositories(self, sync_to_db=True):
-        """Fetch all repositories for the user"""
+        """Fetch all repositories for the user, following pagination; raises GitHubError on failure"""
         if not self.username:
             raise ValueError("GitHub username not configured")
         
@@ -29,75 +105,140 @@ class GitHubService:
             'per_page': 100,
         }
         
-        try:
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            repos = response.json()
-            
-            if sync_to_db:
-                return self._sync_repositories_to_db(repos)
-            return repos
-        except requests.RequestException as e:
-            print(f"Error fetching repositories: {e}")
-            return []
+        repos = []
+        while url:
+            response = self._request(url, 'list_repos', params=params)
+            repos.extend(response.json())
+            # The next link already carries the query string
+            url, params = response.links.get('next', {}).get('url'), None
+        
+        if sync_to_db:
+            return self._sync_repositories_to_db(repos)
+        return repos
     
     def fetch_repository_details(self, repo_name, sync_to_db=True):
         """Fetch detailed information for a specific repository"""
         url = f"{self.base_url}/repos/{self.username}/{repo_name}"
         
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            repo_data = response.json()
-            
-            if sync_to_db:
-                return self._sync_single_repository(repo_data)
-            return repo_data
-        except requests.RequestException as e:
-            print(f"Error fetching repository {repo_name}: {e}")
+            repo_data = self._get(url, 'repo_details', repo=repo_name)
+        except GitHubError:
             return None
+        
+        if sync_to_db:
+            return self._sync_single_repository(repo_data)
+        return repo_data
     
     def fetch_repository_languages(self, repo_name):
-        """Fetch programming languages used in a repository"""
+        """Fetch programming languages used in a repository ({} when it has no code)"""
         url = f"{self.base_url}/repos/{self.username}/{repo_name}/languages"
         
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print(f"Error fetching languages for {repo_name}: {e}")
-            return {}
+            return self._get(url, 'repo_languages', repo=repo_name)
+        except GitHubError:
+            return None
     
     def fetch_repository_commits(self, repo_name, limit=10):
-        """Fetch recent commits for a repository"""
+        """Fetch recent commits for a repository ([] when it is empty)"""
         url = f"{self.base_url}/repos/{self.username}/{repo_name}/commits"
         params = {'per_page': limit}
         
         try:
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print(f"Error fetching commits for {repo_name}: {e}")
-            return []
+            # 409: the repository has no commits yet
+            response = self._request(url, 'repo_commits', params=params, allow=(409,), repo=repo_name)
+        except GitHubError:
+            return None
+        return [] if response.status_code == 409 else response.json()
+    
+    def fetch_repository_readme(self, repo_name, etag=''):
+        """
+        Fetch a repository's README rendered to HTML by GitHub. Returns
+        (html, etag): html is None when the README is unchanged since `etag`
+        (a 304, which costs no rate limit) and '' when the repository has no
+        README; both are None when the call failed.
+        """
+        url = f"{self.base_url}/repos/{self.username}/{repo_name}/readme"
+        headers = {'Accept': 'application/vnd.github.html'}
+        if etag:
+            headers['If-None-Match'] = etag
+        
+        try:
+            response = self._request(url, 'repo_readme', headers=headers, allow=(404,), repo=repo_name)
+        except GitHubError:
+            return None, None
+        
+        if response.status_code == 404:
+            return '', ''
+        if response.status_code == 304:
+            return None, etag
+        return response.text, response.headers.get('ETag', '')
+    
+    def _needs_details(self, repo):
+        """Languages, README and commits only change with a push"""
+        return repo.details_pushed_at is None or repo.pushed_at != repo.details_pushed_at
+    
+    def _can_spend(self, calls):
+        """Whether `calls` more requests leave the reserved part of the quota untouched"""
+        if self.rate_limited:
+            return False
+        available = self.quota.available()
+        return available is None or available - calls >= quota_reserve()
+    
+    def sync_repository_details(self, repo):
+        """
+        Sync the languages, README and (for featured repositories) commits of
+        `repo`. Returns True when every part was fetched, which marks the
+        details as current for the repository's latest push.
+        """
+        complete = self._sync_repository_languages(repo, repo.name)
+        if getattr(settings, 'GITHUB_SYNC_READMES', True):
+            complete = self._sync_repository_readme(repo) and complete
+        if repo.featured:
+            complete = self._sync_repository_commits(repo) and complete
+        if complete:
+            repo.details_pushed_at = repo.pushed_at
+            repo.save(update_fields=['details_pushed_at'])
+        return complete
     
     def _sync_repositories_to_db(self, repos_data):
-        """Sync repository data to database"""
+        """
+        Store every listed repository (no further calls), then fetch details
+        for those pushed since their last detail sync: featured repositories
+        first, then the most recently pushed. Once the remaining quota runs
+        into the reserve, the rest are deferred to the next sync.
+        """
         synced_repos = []
-        
         for repo_data in repos_data:
             repo = self._sync_single_repository(repo_data)
             if repo:
                 synced_repos.append(repo)
-                # Fetch and sync languages
-                self._sync_repository_languages(repo, repo_data['name'])
+        
+        pending = sorted(
+            (repo for repo in synced_repos if self._needs_details(repo)),
+            key=lambda repo: (not repo.featured, -(repo.pushed_at.timestamp() if repo.pushed_at else 0)),
+        )
+        for position, repo in enumerate(pending):
+            if not self._can_spend(DETAIL_CALLS):
+                self.deferred = [deferred.full_name for deferred in pending[position:]]
+                metrics.record('github', 'deferred_repositories', {'count': len(self.deferred)})
+                logger.warning(
+                    "GitHub quota low (%s left), deferring details of %d repositories",
+                    self.quota.available(), len(self.deferred),
+                )
+                break
+            self.sync_repository_details(repo)
         
         return synced_repos
     
     def _sync_single_repository(self, repo_data):
         """Sync a single repository to database"""
         try:
+            # Names are unique on GitHub at any moment, so another row holding this
+            # one belongs to a repository that has since been deleted or renamed
+            stale = GitHubRepository.objects.filter(full_name=repo_data['full_name']).exclude(github_id=repo_data['id'])
+            if stale.exists():
+                logger.warning("Replacing stale repository record %s", repo_data['full_name'])
+                stale.delete()
             repo, created = GitHubRepository.objects.update_or_create(
                 github_id=repo_data['id'],
                 defaults={
@@ -122,32 +263,77 @@ class GitHubService:
                 }
             )
             return repo
-        except Exception as e:
-            print(f"Error syncing repository {repo_data.get('name', 'unknown')}: {e}")
+        except Exception:
+            logger.exception("Error syncing repository %s", repo_data.get('name', 'unknown'))
             return None
     
     def _sync_repository_languages(self, repo, repo_name):
-        """Sync programming languages for a repository"""
+        """Sync programming languages for a repository; False when GitHub gave no answer"""
         languages_data = self.fetch_repository_languages(repo_name)
         
-        if not languages_data:
-            return
+        # No answer keeps the stored languages; an empty answer means the repository has no code
+        if languages_data is None:
+            return False
         
         # Calculate total bytes
         total_bytes = sum(languages_data.values())
         
-        # Clear existing languages
-        repo.languages.all().delete()
+        with transaction.atomic():
+            # Clear existing languages
+            repo.languages.all().delete()
+            
+            # Create new language entries
+            GitHubLanguage.objects.bulk_create([
+                GitHubLanguage(
+                    repository=repo,
+                    name=lang_name,
+                    bytes_count=bytes_count,
+                    percentage=round((bytes_count / total_bytes * 100) if total_bytes > 0 else 0, 2),
+                )
+                for lang_name, bytes_count in languages_data.items()
+            ])
+        return True
+    
+    def _sync_repository_readme(self, repo):
+        """Store the repository's sanitized README; False when the call failed"""
+        html, etag = self.fetch_repository_readme(repo.name, repo.readme_etag)
+        if etag is None:
+            return False
+        if html is None:
+            # Unchanged since the stored copy
+            return True
+        repo.readme_html = sanitize_html(html) if html else ''
+        repo.readme_etag = etag
+        repo.save(update_fields=['readme_html', 'readme_etag'])
+        return True
+    
+    def _sync_repository_commits(self, repo, limit=10):
+        """Replace the stored commits of a repository with its latest `limit`; False when the call failed"""
+        commits_data = self.fetch_repository_commits(repo.name, limit=limit)
+        if commits_data is None:
+            return False
         
-        # Create new language entries
-        for lang_name, bytes_count in languages_data.items():
-            percentage = (bytes_count / total_bytes * 100) if total_bytes > 0 else 0
-            GitHubLanguage.objects.create(
+        commits = []
+        for item in commits_data:
+            commit = item.get('commit') or {}
+            author = commit.get('author') or {}
+            committed_at = self._parse_datetime(author.get('date'))
+            if not item.get('sha') or committed_at is None:
+                continue
+            commits.append(GitHubCommit(
                 repository=repo,
-                name=lang_name,
-                bytes_count=bytes_count,
-                percentage=round(percentage, 2)
-            )
+                sha=item['sha'],
+                message=commit.get('message', ''),
+                author_name=(author.get('name') or '')[:200],
+                author_email=author.get('email') or '',
+                committed_at=committed_at,
+                url=item.get('html_url', ''),
+            ))
+        
+        with transaction.atomic():
+            repo.commits.all().delete()
+            GitHubCommit.objects.bulk_create(commits)
+        return True
     
     def _parse_datetime(self, dt_string):
         """Parse GitHub datetime string to Django datetime"""
@@ -160,7 +346,15 @@ class GitHubService:
             return None
     
     def sync_all_data(self):
-        """Sync all GitHub data (repositories, languages, commits)"""
+        """
+        Sync all GitHub data (repositories, languages, READMEs, commits).
+        Raises GitHubError when the repository list cannot be fetched, so a
+        failed sync never looks like an account without repositories.
+        """
         repos = self.fetch_repositories(sync_to_db=True)
-        print(f"Synced {len(repos)} repositories")
+        refresh_language_stats()
+        logger.info(
+            "Synced %d repositories (%d deferred), %s API requests left",
+            len(repos), len(self.deferred), self.quota.available(),
+        )
         return repos
@@ -1,3 +1,315 @@
-from django.test import TestCase
+import json
+from pathlib import Path
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .fake_api import FakeGitHub
+from .models import GitHubCommit, GitHubLanguage, GitHubRepository, WebhookDelivery
+from .rate_limit import RateLimited
+from .services import GitHubService
+from .webhooks import SIGNATURE_HEADER, handle_event, sign
+
+TESTDATA = Path(__file__).resolve().parent / 'testdata'
+USERNAME = 'minda-belete'
+SECRET = 'webhook-test-secret'
+
+
+def load_delivery(name):
+    """A recorded webhook delivery: (event, payload)"""
+    with open(TESTDATA / 'webhooks' / f'{name}.json', encoding='utf-8') as fh:
+        data = json.load(fh)
+    return data['event'], data['payload']
+
+
+def fake_service(fake):
+    """A GitHubService answered by `fake` instead of api.github.com"""
+    service = GitHubService(username=fake.username, token='test')
+    service.base_url = fake.base_url
+    service.session = fake
+    service.sleep = fake.sleep
+    return service
+
+
+@override_settings(GITHUB_USERNAME=USERNAME, GITHUB_WEBHOOK_SECRET=SECRET)
+class WebhookEndpointTests(TestCase):
+    """Signature checks and delivery bookkeeping of the webhook view"""
+
+    def post(self, event, payload, signature=None, delivery='72d3162e-cc78-11e3-81ab-4c9367dc0958'):
+        body = json.dumps(payload).encode()
+        headers = {'HTTP_X_GITHUB_EVENT': event, 'HTTP_X_GITHUB_DELIVERY': delivery}
+        if signature is not False:
+            headers['HTTP_' + SIGNATURE_HEADER.upper().replace('-', '_')] = signature or sign(SECRET, body)
+        return self.client.post(reverse('github:webhook'), body, content_type='application/json', **headers)
+
+    def test_valid_signature_is_queued(self):
+        response = self.post(*load_delivery('star_created'))
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json(), {'status': 'queued'})
+        self.assertEqual(WebhookDelivery.objects.get().event, 'star')
+
+    def test_bad_signature_is_rejected(self):
+        for signature in ('sha256=bad', sign('another-secret', b'{}'), False):
+            with self.subTest(signature=signature):
+                response = self.post(*load_delivery('star_created'), signature=signature)
+                self.assertEqual(response.status_code, 403)
+        self.assertFalse(WebhookDelivery.objects.exists())
+
+    @override_settings(GITHUB_WEBHOOK_SECRET='')
+    def test_missing_secret_hides_the_endpoint(self):
+        response = self.post(*load_delivery('star_created'))
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(BACKGROUND_TASKS_EAGER=True)
+    def test_redelivery_is_processed_once(self):
+        event, payload = load_delivery('star_created')
+        GitHubRepository.objects.create(
+            github_id=payload['repository']['id'], name='spatial-trade-model',
+            full_name='minda-belete/spatial-trade-model', url='https://github.com/minda-belete/spatial-trade-model',
+            stars_count=4, created_at='2023-10-27T10:30:11Z', updated_at='2026-10-01T00:00:00Z',
+        )
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            first = self.post(event, payload)
+            second = self.post(event, payload)
+        self.assertEqual((first.status_code, second.status_code), (202, 200))
+        self.assertEqual(second.json(), {'status': 'duplicate'})
+        self.assertEqual(len(callbacks), 1)
+        delivery = WebhookDelivery.objects.get()
+        self.assertIsNotNone(delivery.processed_at)
+        self.assertEqual(delivery.error, '')
+        self.assertEqual(GitHubRepository.objects.get().stars_count, 5)
+
+
+@override_settings(GITHUB_USERNAME=USERNAME, GITHUB_SYNC_READMES=True)
+class WebhookEventTests(TestCase):
+    """Recorded payloads applied with handle_event, GitHub played by FakeGitHub"""
+
+    def setUp(self):
+        _event, payload = load_delivery('push')
+        repo_data = payload['repository']
+        self.fake = FakeGitHub(
+            USERNAME,
+            [{**repo_data, 'owner': {'login': USERNAME}}],
+            languages={repo_data['name']: {'Python': 9000, 'TeX': 1000}},
+            readmes={repo_data['name']: '<h1>Spatial trade model</h1><script>alert(1)</script>'},
+        )
+        self.service = fake_service(self.fake)
+        self.repo = GitHubRepository.objects.create(
+            github_id=repo_data['id'], name=repo_data['name'], full_name=repo_data['full_name'],
+            url=repo_data['html_url'], featured=True,
+            created_at='2023-10-27T10:30:11Z', updated_at='2026-10-01T00:00:00Z', pushed_at='2026-10-01T00:00:00Z',
+        )
+        GitHubLanguage.objects.create(repository=self.repo, name='R', bytes_count=100, percentage=100)
+
+    def test_push_to_default_branch_updates_details(self):
+        event, payload = load_delivery('push')
+        result = handle_event(event, payload, service=self.service)
+        self.assertEqual(result, 'updated minda-belete/spatial-trade-model: repository, languages, readme, commits')
+
+        # Languages and the README cost one call each; the commits come from the payload
+        self.assertEqual(self.fake.calls, [
+            ('/repos/minda-belete/spatial-trade-model/languages', 200),
+            ('/repos/minda-belete/spatial-trade-model/readme', 200),
+        ])
+        self.repo.refresh_from_db()
+        self.assertEqual(
+            dict(self.repo.languages.values_list('name', 'percentage')), {'Python': 90, 'TeX': 10},
+        )
+        self.assertIn('Spatial trade model', self.repo.readme_html)
+        self.assertNotIn('<script>', self.repo.readme_html)
+        self.assertTrue(self.repo.readme_etag)
+        self.assertEqual(
+            list(self.repo.commits.values_list('sha', flat=True)),
+            [commit['id'] for commit in reversed(payload['commits'])],
+        )
+        self.assertEqual(self.repo.details_pushed_at, self.repo.pushed_at)
+
+    def test_push_to_other_branch_only_updates_repository(self):
+        event, payload = load_delivery('push')
+        payload['ref'] = 'refs/heads/feature/ppml'
+        self.assertEqual(
+            handle_event(event, payload, service=self.service),
+            'updated minda-belete/spatial-trade-model: repository',
+        )
+        self.assertEqual(self.fake.calls, [])
+        self.assertEqual(list(self.repo.languages.values_list('name', flat=True)), ['R'])
+        self.assertFalse(self.repo.commits.exists())
+
+    def test_redelivered_push_keeps_one_copy_of_each_commit(self):
+        event, payload = load_delivery('push')
+        handle_event(event, payload, service=self.service)
+        handle_event(event, payload, service=self.service)
+        self.assertEqual(self.repo.commits.count(), len(payload['commits']))
+
+    def test_deleted_and_privatized_repositories_are_removed(self):
+        for name in ('repository_deleted', 'repository_privatized'):
+            with self.subTest(name=name):
+                repo = GitHubRepository.objects.get_or_create(
+                    github_id=self.repo.github_id,
+                    defaults={'name': self.repo.name, 'full_name': self.repo.full_name, 'url': self.repo.url,
+                              'created_at': self.repo.created_at, 'updated_at': self.repo.updated_at},
+                )[0]
+                GitHubLanguage.objects.create(repository=repo, name='Python', bytes_count=1, percentage=100)
+                event, payload = load_delivery(name)
+                result = handle_event(event, payload, service=self.service)
+                self.assertEqual(result, 'removed minda-belete/spatial-trade-model')
+                self.assertFalse(GitHubRepository.objects.exists())
+                self.assertFalse(GitHubLanguage.objects.exists())
+        self.assertEqual(self.fake.calls, [])
+
+    def test_star_and_fork_update_counts(self):
+        handle_event(*load_delivery('star_created'), service=self.service)
+        handle_event(*load_delivery('fork'), service=self.service)
+        self.repo.refresh_from_db()
+        self.assertEqual((self.repo.stars_count, self.repo.forks_count), (5, 2))
+        self.assertEqual(self.fake.calls, [])
+
+    @override_settings(GITHUB_USERNAME='someone-else')
+    def test_foreign_repository_is_ignored(self):
+        result = handle_event(*load_delivery('star_created'), service=self.service)
+        self.assertTrue(result.startswith('ignored'))
+        self.repo.refresh_from_db()
+        self.assertEqual(self.repo.stars_count, 0)
+
+
+class FailingGitHub(FakeGitHub):
+    """Answers 502 for the resources in `failing`, as GitHub does during an outage"""
+
+    def __init__(self, *args, failing=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.failing = set(failing)
+
+    def _route(self, url, path, query, headers):
+        if path.rsplit('/', 1)[-1] in self.failing:
+            return self._response(url, 502, {'message': 'Server Error'})
+        return super()._route(url, path, query, headers)
+
+
+@override_settings(GITHUB_SYNC_READMES=True, GITHUB_RATE_LIMIT_MAX_WAIT=60, GITHUB_RATE_LIMIT_RESERVE=50)
+class SyncTests(TestCase):
+    """Full and incremental syncs against FakeGitHub"""
+
+    def sync(self, fake):
+        service = fake_service(fake)
+        calls_before = len(fake.calls)
+        repos = service.sync_all_data()
+        return service, repos, fake.calls[calls_before:]
+
+    def test_full_sync(self):
+        fake = FakeGitHub.synthesize(5, username='octocat', readme_ratio=1)
+        _service, repos, calls = self.sync(fake)
+
+        self.assertEqual(len(repos), 5)
+        self.assertEqual(fake.requests_by_resource(), {'repos': 1, 'languages': 5, 'readme': 5})
+        self.assertTrue(all(status == 200 for _path, status in calls))
+        for repo in GitHubRepository.objects.all():
+            with self.subTest(repo=repo.name):
+                self.assertEqual(set(repo.languages.values_list('name', flat=True)), set(fake.languages[repo.name]))
+                self.assertEqual(repo.readme_html, fake.readmes[repo.name])
+                self.assertEqual(repo.details_pushed_at, repo.pushed_at)
+
+    def test_unchanged_resync_lists_repositories_only(self):
+        fake = FakeGitHub.synthesize(5, username='octocat')
+        self.sync(fake)
+        _service, repos, calls = self.sync(fake)
+        self.assertEqual(len(repos), 5)
+        self.assertEqual(calls, [('/users/octocat/repos', 200)])
+
+    def test_unchanged_readme_is_not_downloaded_again(self):
+        fake = FakeGitHub.synthesize(3, username='octocat', readme_ratio=1)
+        self.sync(fake)
+        stored = GitHubRepository.objects.get(name='repo-00001')
+        fake.push('repo-00001', 'Tidy the notebooks')
+
+        _service, _repos, calls = self.sync(fake)
+        self.assertEqual(calls, [
+            ('/users/octocat/repos', 200),
+            ('/repos/octocat/repo-00001/languages', 200),
+            ('/repos/octocat/repo-00001/readme', 304),
+        ])
+        repo = GitHubRepository.objects.get(pk=stored.pk)
+        self.assertEqual((repo.readme_html, repo.readme_etag), (stored.readme_html, stored.readme_etag))
+        self.assertEqual(repo.details_pushed_at, repo.pushed_at)
+
+    def test_empty_repository_has_no_commits(self):
+        fake = FakeGitHub.synthesize(2, username='octocat')
+        del fake.commits['repo-00000']
+        service = fake_service(fake)
+        self.assertEqual(service.fetch_repository_commits('repo-00000'), [])
+        self.assertEqual(fake.calls, [('/repos/octocat/repo-00000/commits', 409)])
+        self.assertEqual(len(service.fetch_repository_commits('repo-00001', limit=3)), 3)
+
+    def test_exhausted_quota_raises_rate_limited(self):
+        fake = FakeGitHub.synthesize(2, username='octocat')
+        fake.remaining = 0
+        service = fake_service(fake)
+        with self.assertRaises(RateLimited):
+            service.sync_all_data()
+        # The reset is an hour away, beyond GITHUB_RATE_LIMIT_MAX_WAIT: no waiting, no retries
+        self.assertEqual(fake.calls, [('/users/octocat/repos', 403)])
+        self.assertEqual(fake.slept, 0)
+        self.assertTrue(service.rate_limited)
+        self.assertFalse(GitHubRepository.objects.exists())
+
+        # Further requests fail fast without reaching GitHub
+        self.assertIsNone(service.fetch_repository_languages('repo-00000'))
+        self.assertEqual(len(fake.calls), 1)
+
+    def test_secondary_rate_limit_is_waited_out(self):
+        fake = FakeGitHub.synthesize(2, username='octocat', secondary_limit_every=3, retry_after=2)
+        _service, repos, calls = self.sync(fake)
+        self.assertEqual(len(repos), 2)
+        self.assertIn(('/repos/octocat/repo-00000/readme', 403), calls)
+        self.assertGreaterEqual(fake.slept, 2)
+        self.assertEqual(GitHubRepository.objects.filter(details_pushed_at__isnull=True).count(), 0)
+
+    def test_low_quota_defers_details_to_the_next_sync(self):
+        fake = FakeGitHub.synthesize(8, username='octocat', rate_limit=60)
+        service, repos, _calls = self.sync(fake)
+        self.assertEqual(len(repos), 8)
+        self.assertTrue(service.deferred)
+        # The reserve is left for webhooks and admin actions
+        self.assertGreaterEqual(fake.remaining, 50)
+        pending = GitHubRepository.objects.filter(details_pushed_at__isnull=True)
+        self.assertEqual(sorted(pending.values_list('full_name', flat=True)), sorted(service.deferred))
+
+        # Once the quota resets, only the deferred repositories are fetched: languages and README each
+        deferred = len(service.deferred)
+        fake.remaining = fake.rate_limit
+        service, _repos, calls = self.sync(fake)
+        self.assertEqual(service.deferred, [])
+        self.assertFalse(pending.exists())
+        self.assertEqual(len(calls), 1 + 2 * deferred)
+
+    def test_failure_keeps_stored_languages(self):
+        fake = FailingGitHub.synthesize(2, username='octocat')
+        self.sync(fake)
+        repo = GitHubRepository.objects.get(name='repo-00000')
+        stored = list(repo.languages.values_list('name', 'bytes_count'))
+
+        fake.push('repo-00000')
+        fake.languages['repo-00000'] = {'Go': 1}
+        fake.failing = {'languages'}
+        self.sync(fake)
+        repo.refresh_from_db()
+        self.assertEqual(list(repo.languages.values_list('name', 'bytes_count')), stored)
+        # Not marked current, so the next sync tries again
+        self.assertNotEqual(repo.details_pushed_at, repo.pushed_at)
+
+        fake.failing = set()
+        self.sync(fake)
+        repo.refresh_from_db()
+        self.assertEqual(list(repo.languages.values_list('name', 'bytes_count')), [('Go', 1)])
+        self.assertEqual(repo.details_pushed_at, repo.pushed_at)
+
+    def test_fork_keeps_commits_shared_with_its_parent(self):
+        fake = FakeGitHub.synthesize(2, username='octocat')
+        fake.commits['repo-00001'] = fake.commits['repo-00000']
+        self.sync(fake)
+        GitHubRepository.objects.update(featured=True, details_pushed_at=None)
+        self.sync(fake)
+        shas = [commit['sha'] for commit in fake.commits['repo-00000']]
+        for repo in GitHubRepository.objects.all():
+            with self.subTest(repo=repo.name):
+                self.assertEqual(list(repo.commits.values_list('sha', flat=True)), shas)
+        self.assertEqual(GitHubCommit.objects.count(), 2 * len(shas))
@@ -5,6 +5,7 @@ app_name = 'github'
 
 urlpatterns = [
     path('', views.RepositoryListView.as_view(), name='repository_list'),
-    path('repository/<str:name>/', views.RepositoryDetailView.as_view(), name='repository_detail'),
+    path('repository/<str:owner>/<str:name>/', views.RepositoryDetailView.as_view(), name='repository_detail'),
     path('sync/', views.sync_repositories, name='sync_repositories'),
+    path('webhook/', views.github_webhook, name='webhook'),
 ]
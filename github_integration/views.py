@@ -1,55 +1,80 @@
+import json
+import uuid
+
+from django.db.models import Prefetch
+from django.http import Http404, HttpResponse, HttpResponseForbidden, JsonResponse
 from django.shortcuts import render, get_object_or_404
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from django.views.generic import ListView, DetailView
 from django.contrib import messages
 from django.contrib.admin.views.decorators import staff_member_required
-from .models import GitHubRepository
+from portfolio.background import enqueue
+from portfolio.pagination import KeysetPaginationMixin
+from .language_stats import filter_languages, top_languages
+from .models import GitHubCommit, GitHubRepository, WebhookDelivery
 from .services import GitHubService
+from .webhooks import HANDLED_EVENTS, SIGNATURE_HEADER, process_delivery, verify_signature, webhook_secret
 
 
-class RepositoryListView(ListView):
-    """List all GitHub repositories"""
+class RepositoryListView(KeysetPaginationMixin, ListView):
+    """List all GitHub repositories, a cursor page at a time"""
     model = GitHubRepository
     template_name = 'github_integration/repository_list.html'
     context_object_name = 'repositories'
     paginate_by = 12
     
+    # Sort options (?sort=), each tie-broken on id so cursors are stable
+    keyset_orderings = {
+        '-stars_count': ('-stars_count', '-id'),
+        '-forks_count': ('-forks_count', '-id'),
+        '-updated_at': ('-updated_at', '-id'),
+        'name': ('name', 'id'),
+    }
+    default_sort = '-stars_count'
+    
     def get_queryset(self):
-        queryset = GitHubRepository.objects.filter(is_archived=False)
+        # README bodies are only shown on the detail page
+        queryset = GitHubRepository.objects.filter(is_archived=False).defer('readme_html')
         
         # Filter by language
         language = self.request.GET.get('language')
         if language:
             queryset = queryset.filter(primary_language=language)
         
-        # Sort options
-        sort = self.request.GET.get('sort', '-stars_count')
-        if sort in ['-stars_count', '-forks_count', '-updated_at', 'name']:
-            queryset = queryset.order_by(sort)
-        
         return queryset
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['languages'] = GitHubRepository.objects.values_list(
-            'primary_language', flat=True
-        ).distinct().exclude(primary_language__isnull=True)
-        context['featured_repos'] = GitHubRepository.objects.filter(featured=True)[:6]
+        # Precomputed at sync time rather than a DISTINCT over every repository
+        context['languages'] = filter_languages()
+        context['language_stats'] = top_languages()
+        context['featured_repos'] = GitHubRepository.objects.filter(featured=True).defer('readme_html')[:6]
         return context
 
 
 class RepositoryDetailView(DetailView):
-    """Individual repository detail"""
+    """Individual repository detail, served from the synced data only"""
     model = GitHubRepository
     template_name = 'github_integration/repository_detail.html'
     context_object_name = 'repository'
-    slug_field = 'name'
-    slug_url_kwarg = 'name'
+    recent_commit_count = 10
+    
+    def get_queryset(self):
+        return GitHubRepository.objects.prefetch_related(
+            'languages',
+            Prefetch('commits', queryset=GitHubCommit.objects.all()[:self.recent_commit_count], to_attr='recent_commits'),
+        )
+    
+    def get_object(self, queryset=None):
+        queryset = self.get_queryset() if queryset is None else queryset
+        full_name = f"{self.kwargs['owner']}/{self.kwargs['name']}"
+        return get_object_or_404(queryset, full_name=full_name)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        repo = self.get_object()
-        context['languages'] = repo.languages.all()
-        context['recent_commits'] = repo.commits.all()[:10]
+        context['languages'] = self.object.languages.all()
+        context['recent_commits'] = self.object.recent_commits
         return context
 
 
@@ -60,8 +85,52 @@ def sync_repositories(request):
         service = GitHubService()
         repos = service.sync_all_data()
         messages.success(request, f'Successfully synced {len(repos)} repositories from GitHub!')
+        if service.deferred:
+            messages.warning(
+                request,
+                f'GitHub API quota is low; details of {len(service.deferred)} repositories will be fetched by the next sync.',
+            )
     except Exception as e:
         messages.error(request, f'Error syncing repositories: {str(e)}')
     
     from django.shortcuts import redirect
     return redirect('github:repository_list')
+
+
+@csrf_exempt
+@require_POST
+def github_webhook(request):
+    """Receive a GitHub webhook; verified deliveries are processed in the background"""
+    secret = webhook_secret()
+    if not secret:
+        raise Http404('Webhooks are not configured')
+    if not verify_signature(secret, request.body, request.headers.get(SIGNATURE_HEADER, '')):
+        return HttpResponseForbidden('Invalid signature')
+    
+    event = request.headers.get('X-GitHub-Event', '')
+    if event == 'ping':
+        return JsonResponse({'status': 'pong'})
+    if event not in HANDLED_EVENTS:
+        return HttpResponse(status=204)
+    
+    try:
+        # Webhooks can be configured to send JSON or a form-encoded payload field
+        if request.content_type == 'application/x-www-form-urlencoded':
+            payload = json.loads(request.POST.get('payload', ''))
+        else:
+            payload = json.loads(request.body)
+    except ValueError:
+        return HttpResponse('Malformed payload', status=400)
+    
+    delivery, created = WebhookDelivery.objects.get_or_create(
+        delivery_id=request.headers.get('X-GitHub-Delivery') or str(uuid.uuid4()),
+        defaults={
+            'event': event,
+            'action': payload.get('action') or '',
+            'repository_full_name': (payload.get('repository') or {}).get('full_name', ''),
+            'payload': payload,
+        },
+    )
+    if created:
+        enqueue(process_delivery, delivery.pk)
+    return JsonResponse({'status': 'queued' if created else 'duplicate'}, status=202 if created else 200)
@@ -0,0 +1,179 @@
+"""
+GitHub Webhooks
+Incremental updates pushed by GitHub instead of polled full syncs. The
+endpoint verifies the X-Hub-Signature-256 HMAC, stores the delivery and
+queues it (portfolio.background), so the request returns at once; the
+task then touches only the repository the event is about:
+
+    push        repository fields from the payload; on the default branch
+                the languages (one API call), the README when a commit
+                touched it (one conditional call) and, for featured
+                repositories, the pushed commits (no call)
+    repository  fields from the payload; deleted, privatized or
+                transferred repositories are removed
+    star, fork  star and fork counts from the payload
+
+Deliveries are kept by their X-GitHub-Delivery id, so a redelivery is not
+processed twice, and can be replayed from the admin or with the
+replay_github_webhooks command, as can recorded payload files.
+"""
+import hashlib
+import hmac
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = 'X-Hub-Signature-256'
+HANDLED_EVENTS = {'push', 'repository', 'star', 'fork'}
+# Repository actions after which the repository is no longer listed
+REMOVED_ACTIONS = {'deleted', 'privatized', 'transferred'}
+RECENT_COMMITS = 10
+# Successfully processed deliveries are deleted after this long
+DELIVERY_RETENTION = timedelta(days=30)
+
+
+def webhook_secret():
+    return getattr(settings, 'GITHUB_WEBHOOK_SECRET', '')
+
+
+def sign(secret, body):
+    """The X-Hub-Signature-256 value GitHub sends for `body`"""
+    return 'sha256=' + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(secret, body, signature):
+    return bool(secret and signature) and hmac.compare_digest(sign(secret, body), signature)
+
+
+def _is_own_repository(repo_data):
+    owner = (repo_data.get('owner') or {}).get('login', '')
+    return owner.lower() == (settings.GITHUB_USERNAME or '').lower()
+
+
+def _parse_timestamp(value):
+    """GitHub timestamps are ISO 8601 strings, or epoch seconds in push payloads"""
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=dt_timezone.utc)
+    return parse_datetime(value) if value else None
+
+
+def _normalized_repository(repo_data):
+    """Repository payload with the ISO timestamps the sync code expects"""
+    repo_data = dict(repo_data)
+    for key in ('created_at', 'updated_at', 'pushed_at'):
+        value = _parse_timestamp(repo_data.get(key))
+        repo_data[key] = value.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ') if value else None
+    return repo_data
+
+
+def _touches_readme(commits):
+    for commit in commits:
+        for path in commit.get('added', []) + commit.get('modified', []) + commit.get('removed', []):
+            if path.rsplit('/', 1)[-1].lower().startswith('readme'):
+                return True
+    return False
+
+
+def _store_pushed_commits(repo, commits):
+    """Add the pushed commits and keep only the latest RECENT_COMMITS"""
+    from .models import GitHubCommit
+
+    rows = []
+    for commit in commits:
+        committed_at = _parse_timestamp(commit.get('timestamp'))
+        if not commit.get('id') or committed_at is None or not commit.get('distinct', True):
+            continue
+        author = commit.get('author') or {}
+        rows.append(GitHubCommit(
+            repository=repo,
+            sha=commit['id'],
+            message=commit.get('message', ''),
+            author_name=(author.get('name') or '')[:200],
+            author_email=author.get('email') or '',
+            committed_at=committed_at,
+            url=commit.get('url', ''),
+        ))
+    if not rows:
+        return
+    with transaction.atomic():
+        # Commits of this repository already stored by a sync are skipped
+        GitHubCommit.objects.bulk_create(rows, ignore_conflicts=True)
+        keep = repo.commits.order_by('-committed_at').values_list('pk', flat=True)[:RECENT_COMMITS]
+        repo.commits.exclude(pk__in=list(keep)).delete()
+
+
+def handle_event(event, payload, service=None):
+    """Apply one event to the local data; returns a short description of what changed"""
+    from .language_stats import refresh_language_stats
+    from .models import GitHubRepository
+    from .services import GitHubService
+
+    repo_data = payload.get('repository')
+    if event not in HANDLED_EVENTS or not repo_data:
+        return 'ignored'
+    if not _is_own_repository(repo_data):
+        return f"ignored: {repo_data.get('full_name')} is not owned by {settings.GITHUB_USERNAME}"
+
+    action = payload.get('action', '')
+    if event == 'repository' and (action in REMOVED_ACTIONS or repo_data.get('private')):
+        deleted, _ = GitHubRepository.objects.filter(github_id=repo_data['id']).delete()
+        refresh_language_stats(rotate_baseline=False)
+        return f"removed {repo_data.get('full_name')}" if deleted else 'nothing to remove'
+    if repo_data.get('private'):
+        return 'ignored: private repository'
+
+    service = service or GitHubService()
+    repo = service._sync_single_repository(_normalized_repository(repo_data))
+    if repo is None:
+        raise ValueError(f"Could not store repository {repo_data.get('full_name')}")
+    changes = ['repository']
+
+    default_ref = f"refs/heads/{repo_data.get('default_branch') or repo_data.get('master_branch', '')}"
+    if event == 'push' and payload.get('ref') == default_ref:
+        commits = payload.get('commits') or []
+        complete = service._sync_repository_languages(repo, repo.name)
+        changes.append('languages')
+        if getattr(settings, 'GITHUB_SYNC_READMES', True) and _touches_readme(commits):
+            complete = service._sync_repository_readme(repo) and complete
+            changes.append('readme')
+        if repo.featured:
+            _store_pushed_commits(repo, commits)
+            changes.append('commits')
+        if complete:
+            # The next full sync can skip this repository's details
+            repo.details_pushed_at = repo.pushed_at
+            repo.save(update_fields=['details_pushed_at'])
+    elif event == 'repository' and action == 'created':
+        service.sync_repository_details(repo)
+        changes.append('details')
+
+    if event in ('push', 'repository'):
+        refresh_language_stats(rotate_baseline=False)
+    return f"updated {repo.full_name}: {', '.join(changes)}"
+
+
+def process_delivery(delivery_pk):
+    """Background task: apply a stored delivery and record the outcome"""
+    from .models import WebhookDelivery
+
+    delivery = WebhookDelivery.objects.filter(pk=delivery_pk).first()
+    if delivery is None:
+        return
+    try:
+        result = handle_event(delivery.event, delivery.payload)
+        delivery.error = ''
+        logger.info('GitHub webhook %s %s: %s', delivery.event, delivery.delivery_id, result)
+    except Exception as exc:
+        logger.exception('GitHub webhook %s %s failed', delivery.event, delivery.delivery_id)
+        delivery.error = f'{type(exc).__name__}: {exc}'
+    delivery.processed_at = timezone.now()
+    delivery.save(update_fields=['error', 'processed_at'])
+    WebhookDelivery.objects.filter(
+        processed_at__lt=delivery.processed_at - DELIVERY_RETENTION, error=''
+    ).delete()
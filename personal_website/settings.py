@@ -51,6 +51,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "portfolio.compression.ResponseCompressionMiddleware",
+    "portfolio.middleware.RequestMetricsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -63,7 +65,8 @@ ROOT_URLCONF = "personal_website.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # DjangoTemplates, timing renders for the request metrics
+        "BACKEND": "portfolio.backends.MeteredDjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -93,6 +96,11 @@ if os.getenv('GAE_APPLICATION', None):
             conn_max_age=600
         )
     }
+elif config('DATABASE_URL', default=''):
+    # Running locally against PostgreSQL (e.g. for benchmarks)
+    DATABASES = {
+        'default': dj_database_url.parse(config('DATABASE_URL'))
+    }
 else:
     # Running locally
     DATABASES = {
@@ -103,6 +111,40 @@ else:
     }
 
 
+# Caches, both counting hits and misses for the request metrics. With REDIS_URL
+# set (e.g. a Memorystore instance) every worker and App Engine instance shares
+# 'default', so a save invalidates it everywhere at once. Without it each
+# process keeps its own, and entries that saves invalidate (singletons, the
+# skills data version, blog archive versions and schedule) expire after
+# CACHE_INVALIDATION_TIMEOUT so the other processes catch up. 'local' is always per process, for
+# content-addressed entries that cannot go stale
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'portfolio.backends.RedisCache',
+            'LOCATION': REDIS_URL,
+            'TIMEOUT': 300,
+        }
+    }
+    # Only a backstop for a lost invalidation
+    CACHE_INVALIDATION_TIMEOUT = 60 * 60
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'portfolio.backends.LocMemCache',
+            'LOCATION': 'default',
+            'TIMEOUT': 300,
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    }
+    CACHE_INVALIDATION_TIMEOUT = 60
+CACHES['local'] = {
+    'BACKEND': 'portfolio.backends.LocMemCache',
+    'LOCATION': 'local',
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -144,6 +186,15 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 # WhiteNoise configuration for static files
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
+# Self-hosted CSS/JS bundles (python manage.py build_assets). Classes only ever
+# set at runtime, which the unused-CSS purge cannot find in templates, code or
+# admin rich text, are listed here to keep their rules (Font Awesome icons are
+# always kept)
+ASSET_PURGE_SAFELIST = []
+
+# Dynamic responses smaller than this are not compressed (portfolio.compression)
+RESPONSE_COMPRESSION_MIN_SIZE = config('RESPONSE_COMPRESSION_MIN_SIZE', default=1024, cast=int)
+
 # Media files
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
@@ -156,6 +207,13 @@ if os.getenv('GAE_APPLICATION', None):
         GS_PROJECT_ID = config('GS_PROJECT_ID', default='')
         MEDIA_URL = f'https://storage.googleapis.com/{GS_BUCKET_NAME}/'
 
+# File downloads (CV, research PDFs)
+FILE_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Redirect downloads to short-lived signed storage URLs instead of proxying bytes
+FILE_DOWNLOAD_REDIRECT = config('FILE_DOWNLOAD_REDIRECT', default=False, cast=bool)
+# Lifetime of those URLs only; other media URLs keep the storage's own settings
+FILE_DOWNLOAD_URL_EXPIRY = config('FILE_DOWNLOAD_URL_EXPIRY', default=300, cast=int)
+
 # TinyMCE settings
 TINYMCE_DEFAULT_CONFIG = {
     'height': 500,
@@ -197,9 +255,38 @@ TINYMCE_DEFAULT_CONFIG = {
     'paste_data_images': True,
 }
 
+# Request metrics (staff dashboard at /metrics/); samples kept per URL name and metric
+METRICS_SAMPLE_SIZE = config('METRICS_SAMPLE_SIZE', default=1000, cast=int)
+
+# Singleton settings models (HomePage, page settings): seconds each process reuses its
+# in-memory copy before rechecking the default cache, which is cleared on save
+SINGLETON_LOCAL_TTL = 10
+
+# Logging: external call timings are logged by portfolio.instrumentation
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'root': {'handlers': ['console'], 'level': 'WARNING'},
+    'loggers': {
+        'portfolio.instrumentation': {
+            'level': config('EXTERNAL_CALL_LOG_LEVEL', default='INFO'),
+        },
+    },
+}
+
 # GitHub API settings
 GITHUB_API_URL = "https://api.github.com"
 GITHUB_USERNAME = config('GITHUB_USERNAME', default='minda-belete')
+# Store each repository's rendered README during sync for the detail pages
+GITHUB_SYNC_READMES = config('GITHUB_SYNC_READMES', default=True, cast=bool)
+# Longest rate-limit wait slept through before a request gives up, and requests a sync leaves unused
+GITHUB_RATE_LIMIT_MAX_WAIT = config('GITHUB_RATE_LIMIT_MAX_WAIT', default=60, cast=int)
+GITHUB_RATE_LIMIT_RESERVE = config('GITHUB_RATE_LIMIT_RESERVE', default=50, cast=int)
+# Shared secret of the repository webhooks; the webhook endpoint is disabled without it
+GITHUB_WEBHOOK_SECRET = config('GITHUB_WEBHOOK_SECRET', default='')
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
@@ -1,6 +1,7 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.shortcuts import redirect
-from .models import HomePage, Profile, Education, Research, Skill, Experience, TimelineEntry, ResearchPageSettings, AboutPageSettings, IndustryIndexSettings, IndustryRanking
+from .models import HomePage, Profile, Education, Research, Skill, Experience, TimelineEntry, ResearchPageSettings, AboutPageSettings, IndustryIndexSettings, IndustryRanking, FileDownload, ResearchIndexJob, ResearchTag
+from .skill_import import import_skills
 
 
 @admin.register(HomePage)
@@ -49,7 +50,7 @@ class HomePageAdmin(admin.ModelAdmin):
 class ResearchAdmin(admin.ModelAdmin):
     list_display = ['title', 'research_type', 'publication_venue', 'publication_date', 'featured', 'order']
     list_filter = ['research_type', 'featured', 'publication_date']
-    search_fields = ['title', 'authors', 'abstract', 'tags']
+    search_fields = ['title', 'authors', 'abstract', 'tags__name']
     ordering = ['order', '-publication_date']
     list_editable = ['featured', 'order']
     
@@ -79,7 +80,7 @@ class ResearchAdmin(admin.ModelAdmin):
         
         # Handle page settings form submission
         if request.method == 'POST' and 'save_page_settings' in request.POST:
-            settings, created = ResearchPageSettings.objects.get_or_create(pk=1)
+            settings = ResearchPageSettings.load()
             settings.page_title = request.POST.get('page_title', settings.page_title)
             settings.page_description = request.POST.get('page_description', settings.page_description)
             settings.all_research_heading = request.POST.get('all_research_heading', settings.all_research_heading)
@@ -87,16 +88,7 @@ class ResearchAdmin(admin.ModelAdmin):
             self.message_user(request, 'Research page settings updated successfully.')
             return redirect('admin:portfolio_research_changelist')
         
-        # Get or create page settings
-        settings, created = ResearchPageSettings.objects.get_or_create(
-            pk=1,
-            defaults={
-                'page_title': 'Research & Publications',
-                'page_description': 'Explore my research contributions, publications, and academic work.',
-                'all_research_heading': 'All Publications'
-            }
-        )
-        extra_context['research_page_settings'] = settings
+        extra_context['research_page_settings'] = ResearchPageSettings.load()
         
         return super().changelist_view(request, extra_context=extra_context)
     
@@ -113,6 +105,13 @@ class ResearchAdmin(admin.ModelAdmin):
         return form
 
 
+@admin.register(ResearchTag)
+class ResearchTagAdmin(admin.ModelAdmin):
+    list_display = ['name', 'slug']
+    search_fields = ['name']
+    prepopulated_fields = {'slug': ('name',)}
+
+
 @admin.register(Skill)
 class SkillAdmin(admin.ModelAdmin):
     list_display = ['name', 'category', 'proficiency', 'order']
@@ -131,35 +130,25 @@ class SkillAdmin(admin.ModelAdmin):
             category = request.POST.get('bulk_category')
             skills_text = request.POST.get('bulk_skills_text', '')
             
+            dry_run = 'bulk_dry_run' in request.POST
+            
             if category and skills_text:
-                max_order = Skill.objects.filter(category=category).count()
-                count = 0
+                result = import_skills(skills_text.splitlines(), category, dry_run=dry_run)
+                category_name = dict(Skill.SKILL_CATEGORY_CHOICES)[category]
                 
-                for idx, line in enumerate(skills_text.strip().split('\n')):
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    parts = line.split('|')
-                    name = parts[0].strip()
-                    proficiency = int(parts[1].strip()) if len(parts) > 1 else 50
-                    icon = parts[2].strip() if len(parts) > 2 else ''
-                    subcategory = parts[3].strip().upper() if len(parts) > 3 else 'OTHER'
-                    
-                    # Update or create - replace if exists with same name
-                    skill, created = Skill.objects.update_or_create(
-                        name=name,
-                        defaults={
-                            'category': category,
-                            'proficiency': proficiency,
-                            'icon': icon,
-                            'subcategory': subcategory,
-                            'order': max_order + idx
-                        }
+                for error in result.errors:
+                    self.message_user(request, error, level=messages.ERROR)
+                for warning in result.warnings:
+                    self.message_user(request, warning, level=messages.WARNING)
+                if dry_run:
+                    self.message_user(
+                        request,
+                        f'Preview for {category_name}: {result.summary()}. '
+                        f'New: {", ".join(result.created) or "none"}. Updated: {", ".join(result.updated) or "none"}.',
+                        level=messages.INFO,
                     )
-                    count += 1
-                
-                self.message_user(request, f'Successfully added {count} skills to {dict(Skill.SKILL_CATEGORY_CHOICES)[category]} category.')
+                else:
+                    self.message_user(request, f'{category_name}: {result.summary()}.')
                 return redirect('admin:portfolio_skill_changelist')
         
         return super().changelist_view(request, extra_context=extra_context)
@@ -219,7 +208,7 @@ class TimelineEntryAdmin(admin.ModelAdmin):
         
         # Handle about page settings form submission
         if request.method == 'POST' and 'save_about_settings' in request.POST:
-            settings, created = AboutPageSettings.objects.get_or_create(pk=1)
+            settings = AboutPageSettings.load()
             settings.intro_bio = request.POST.get('intro_bio', settings.intro_bio)
             settings.github_url = request.POST.get('github_url', settings.github_url)
             settings.linkedin_url = request.POST.get('linkedin_url', settings.linkedin_url)
@@ -237,12 +226,7 @@ class TimelineEntryAdmin(admin.ModelAdmin):
             self.message_user(request, 'About page settings updated successfully.')
             return redirect('admin:portfolio_timelineentry_changelist')
         
-        # Get or create about page settings
-        settings, created = AboutPageSettings.objects.get_or_create(
-            pk=1,
-            defaults={'intro_bio': ''}
-        )
-        extra_context['about_page_settings'] = settings
+        extra_context['about_page_settings'] = AboutPageSettings.load()
         
         return super().changelist_view(request, extra_context=extra_context)
     
@@ -303,3 +287,36 @@ class IndustryRankingAdmin(admin.ModelAdmin):
     def has_add_permission(self, request):
         # Only allow AI to create rankings
         return False
+
+
+@admin.register(FileDownload)
+class FileDownloadAdmin(admin.ModelAdmin):
+    list_display = ['key', 'file_name', 'download_count', 'last_downloaded_at']
+    search_fields = ['key', 'file_name']
+    readonly_fields = ['key', 'file_name', 'download_count', 'last_downloaded_at']
+    
+    def has_add_permission(self, request):
+        # Counters are maintained by the download views
+        return False
+
+
+@admin.register(ResearchIndexJob)
+class ResearchIndexJobAdmin(admin.ModelAdmin):
+    list_display = ['research', 'status', 'page_count', 'chunk_count', 'updated_at']
+    list_filter = ['status']
+    search_fields = ['research__title', 'pdf_name']
+    readonly_fields = ['research', 'status', 'pdf_name', 'page_count', 'chunk_count', 'error', 'created_at', 'updated_at']
+    actions = ['reindex']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def reindex(self, request, queryset):
+        """Queue PDF extraction again for the selected items"""
+        from .research_index import schedule_pdf_index
+        count = 0
+        for job in queryset.select_related('research'):
+            if schedule_pdf_index(job.research, force=True):
+                count += 1
+        self.message_user(request, f"Queued {count} research PDFs for indexing.")
+    reindex.short_description = "Re-extract and index selected PDFs"
@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class PortfolioConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "portfolio"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .singletons import create_singletons
+
+        post_migrate.connect(create_singletons, dispatch_uid='portfolio.create_singletons')
@@ -0,0 +1,598 @@
+"""
+Front-end Assets
+Self-hosted, bundled replacements for the CDN stylesheets and scripts the
+templates used to load. Third-party files are pinned in VENDOR and
+downloaded once into static/vendor/ (with the fonts and webfonts their
+stylesheets reference); BUNDLES lists what each page loads, and
+`build_bundles` concatenates and minifies them into static/dist/. The
+site stylesheet is purged of Bootstrap and Font Awesome rules whose
+classes appear nowhere in the templates, code or admin-entered rich text;
+Font Awesome's icon rules are kept whole, as icons are picked in the admin
+long after the build. Fingerprinting and compression are left to the
+CompressedManifestStaticFilesStorage at collectstatic.
+
+    python manage.py build_assets --vendor    # once, or after bumping a version
+    python manage.py build_assets             # after changing CSS/JS or templates
+    python manage.py collectstatic
+
+Until a bundle has been built, the `asset_css`/`asset_js` tags fall back to
+its source files, and to the CDN for vendor files not downloaded yet.
+
+For the main pages (CRITICAL_PAGES) the build also renders the page and
+keeps the bundle rules that apply to its first screen: the navigation and
+the start of <main>. The `critical_css` tag inlines those rules into the
+<head>, and `asset_css` then loads the full stylesheets without blocking
+rendering.
+"""
+import functools
+import posixpath
+import re
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+
+from .instrumentation import external_call
+
+GOOGLE_FONTS_URL = (
+    'https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800'
+    '&family=Fira+Code:wght@400;500;600&display=swap'
+)
+CODEMIRROR_URL = 'https://cdnjs.cloudflare.com/ajax/libs/codemirror/5.65.2/'
+CODEMIRROR_MODES = ('python', 'javascript', 'clike', 'php', 'ruby', 'go', 'rust', 'sql', 'htmlmixed', 'css', 'shell', 'r')
+
+# Path under static/vendor/ -> pinned source URL
+VENDOR = {
+    'bootstrap/bootstrap.min.css': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+    'bootstrap/bootstrap.bundle.min.js': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js',
+    'fontawesome/css/all.min.css': 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css',
+    'fonts/fonts.css': GOOGLE_FONTS_URL,
+    'aos/aos.css': 'https://unpkg.com/aos@2.3.1/dist/aos.css',
+    'aos/aos.js': 'https://unpkg.com/aos@2.3.1/dist/aos.js',
+    'codemirror/codemirror.min.css': CODEMIRROR_URL + 'codemirror.min.css',
+    'codemirror/theme/monokai.min.css': CODEMIRROR_URL + 'theme/monokai.min.css',
+    'codemirror/codemirror.min.js': CODEMIRROR_URL + 'codemirror.min.js',
+    **{
+        f'codemirror/mode/{mode}/{mode}.min.js': f'{CODEMIRROR_URL}mode/{mode}/{mode}.min.js'
+        for mode in CODEMIRROR_MODES
+    },
+}
+
+# Bundle name -> static paths per kind; `purge` drops CSS rules for unused classes
+BUNDLES = {
+    'site': {
+        'css': [
+            'vendor/bootstrap/bootstrap.min.css',
+            'vendor/fontawesome/css/all.min.css',
+            'vendor/fonts/fonts.css',
+            'vendor/aos/aos.css',
+            'css/style.css',
+        ],
+        'js': [
+            'vendor/bootstrap/bootstrap.bundle.min.js',
+            'vendor/aos/aos.js',
+            'js/site.js',
+        ],
+        'purge': True,
+    },
+    'codemirror': {
+        'css': ['vendor/codemirror/codemirror.min.css', 'vendor/codemirror/theme/monokai.min.css'],
+        'js': ['vendor/codemirror/codemirror.min.js'] + [
+            f'vendor/codemirror/mode/{mode}/{mode}.min.js' for mode in CODEMIRROR_MODES
+        ],
+    },
+    'skills': {'css': ['css/pages/skills.css'], 'js': ['js/pages/skills.js']},
+    'about': {'css': ['css/pages/about.css']},
+}
+
+DIST_DIR = 'dist'
+# View name -> bundles whose stylesheets the page loads
+CRITICAL_PAGES = {
+    'portfolio:home': ('site',),
+    'portfolio:about': ('site', 'about'),
+    'portfolio:skills': ('site', 'skills'),
+    'portfolio:research': ('site',),
+    'blog:post_list': ('site',),
+    'blog:post_detail': ('site',),
+}
+# Elements of <main> treated as above the fold: a generous phone screen
+FOLD_ELEMENTS = 150
+# Font Awesome style and icon classes (fas, fa-brands, fa-github, ...): never
+# purged from bundles, since admin-entered icons change without a rebuild
+ICON_CLASS_RE = re.compile(r'fa[a-z]?|fa-[\w-]+')
+# Classes scripts put on first-screen elements (AOS reveals them)
+CRITICAL_SAFELIST = ('aos-init', 'aos-animate')
+# Google Fonts serves one @font-face per script; only these are kept
+DEFAULT_FONT_SUBSETS = ('latin', 'latin-ext')
+# Google Fonts only serves WOFF2 to browsers it recognizes
+FONT_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+)
+DOWNLOAD_TIMEOUT = 30
+
+URL_RE = re.compile(r'url\(\s*([\'"]?)(.*?)\1\s*\)')
+SOURCE_MAP_RE = re.compile(r'/\*#\s*sourceMappingURL=[^*]*\*/|^//#\s*sourceMappingURL=.*$', re.M)
+STRING_RE = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'')
+STRING_OR_COMMENT_RE = re.compile(STRING_RE.pattern + r'|/\*.*?\*/', re.S)
+WORD_RE = re.compile(r'[A-Za-z0-9_-]+')
+CLASS_RE = re.compile(r'\.(-?[A-Za-z_][A-Za-z0-9_-]*)')
+# Classes inside these need not be present for the selector to match
+NEGATED_RE = re.compile(r':(?:not|is|where|has)\([^()]*\)|\[[^\]]*\]')
+
+
+def static_dir():
+    return Path(settings.STATICFILES_DIRS[0])
+
+
+def font_subsets():
+    return tuple(getattr(settings, 'ASSET_FONT_SUBSETS', DEFAULT_FONT_SUBSETS))
+
+
+def bundle_path(name, kind):
+    return f'{DIST_DIR}/{name}.{kind}'
+
+
+def critical_path(view_name):
+    return f"{DIST_DIR}/critical/{view_name.replace(':', '-')}.css"
+
+
+# Looking up the tags' files
+
+def _exists(path):
+    # Collected files in production (static/ is not deployed), source files in development
+    return staticfiles_storage.exists(path) or finders.find(path) is not None
+
+
+def _static_url(path):
+    try:
+        return static(path)
+    except ValueError:
+        # Not in the manifest: collectstatic ran before the file existed
+        return None
+
+
+def _source_url(path):
+    vendored = path[len('vendor/'):] if path.startswith('vendor/') else None
+    if vendored and not _exists(path):
+        return VENDOR[vendored]
+    return _static_url(path) or VENDOR.get(vendored)
+
+
+def _asset_urls(name, kind):
+    bundle = BUNDLES[name]
+    if kind not in bundle:
+        return []
+    built = bundle_path(name, kind)
+    if _exists(built):
+        url = _static_url(built)
+        if url:
+            return [url]
+    return [url for url in map(_source_url, bundle[kind]) if url]
+
+
+_cached_asset_urls = functools.lru_cache(maxsize=None)(_asset_urls)
+
+
+def asset_urls(name, kind):
+    """URLs that load bundle `name`'s `kind` ('css' or 'js'): the built bundle, or its sources"""
+    if settings.DEBUG:
+        # Bundles are rebuilt while the development server runs
+        return _asset_urls(name, kind)
+    return _cached_asset_urls(name, kind)
+
+
+def _read_built(path):
+    if staticfiles_storage.exists(path):
+        with staticfiles_storage.open(path) as fh:
+            return fh.read().decode('utf-8')
+    found = finders.find(path)
+    return Path(found).read_text(encoding='utf-8') if found else None
+
+
+def _critical_css(view_name):
+    if view_name not in CRITICAL_PAGES:
+        return None
+    path = critical_path(view_name)
+    css = _read_built(path)
+    if not css:
+        return None
+
+    def absolute(match):
+        quote, url = match.groups()
+        if url.startswith(('data:', '#', '/', 'http://', 'https://')):
+            return match.group(0)
+        # Inlined, a relative url() would resolve against the page instead of the stylesheet
+        return f'url({quote}{_static_url(posixpath.normpath(posixpath.join(posixpath.dirname(path), url))) or url}{quote})'
+
+    return URL_RE.sub(absolute, css).replace('</', '<\\/')
+
+
+_cached_critical_css = functools.lru_cache(maxsize=None)(_critical_css)
+
+
+def critical_css(view_name):
+    """The first-screen CSS of the page served by `view_name`, ready to inline; None when not built"""
+    if settings.DEBUG:
+        return _critical_css(view_name)
+    return _cached_critical_css(view_name)
+
+
+# Vendoring
+
+def _download(url, headers=None):
+    import requests
+
+    with external_call('assets', 'download', url=url) as call:
+        response = requests.get(url, headers=headers, timeout=DOWNLOAD_TIMEOUT)
+        call.record_response(response)
+    response.raise_for_status()
+    return response
+
+
+def _keep_font_subsets(css, subsets):
+    """Drop the @font-face blocks Google Fonts labels with other scripts (/* cyrillic */ ...)"""
+    blocks = re.split(r'(?=/\*\s*[\w-]+\s*\*/\s*@font-face)', css)
+    kept = []
+    for block in blocks:
+        label = re.match(r'/\*\s*([\w-]+)\s*\*/', block)
+        if label is None or label.group(1) in subsets:
+            kept.append(block)
+    return ''.join(kept)
+
+
+def _vendor_stylesheet(css, source_url, local_path, fetched):
+    """
+    Download the files `css` references (fonts, images) next to `local_path`
+    and point the stylesheet at the local copies.
+    """
+    local_dir = posixpath.dirname(local_path)
+
+    def replace(match):
+        quote, url = match.groups()
+        if url.startswith(('data:', '#')):
+            return match.group(0)
+        absolute = urljoin(source_url, url)
+        if url.startswith(('http://', 'https://', '//', '/')):
+            # Third-party host: stored in a files/ directory next to the stylesheet
+            target = posixpath.join(local_dir, 'files', posixpath.basename(urlsplit(absolute).path))
+        else:
+            target = posixpath.normpath(posixpath.join(local_dir, urlsplit(url).path))
+        if target not in fetched:
+            fetched[target] = _download(absolute).content
+        return f'url({quote}{posixpath.relpath(target, local_dir)}{quote})'
+
+    return URL_RE.sub(replace, css)
+
+
+def vendor_assets(root=None):
+    """Download every VENDOR file (and what its stylesheets reference); returns the paths written"""
+    root = Path(root or static_dir()) / 'vendor'
+    files = {}
+    for path, url in VENDOR.items():
+        headers = {'User-Agent': FONT_USER_AGENT} if url == GOOGLE_FONTS_URL else None
+        text = _download(url, headers=headers).text
+        # Source maps are not vendored; ManifestStaticFilesStorage fails on missing ones
+        text = SOURCE_MAP_RE.sub('', text)
+        if path.endswith('.css'):
+            if url == GOOGLE_FONTS_URL:
+                text = _keep_font_subsets(text, font_subsets())
+            text = _vendor_stylesheet(text, url, path, files)
+        files[path] = text.encode()
+
+    for path, content in files.items():
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+    return sorted(files)
+
+
+# Purging unused CSS
+
+def used_words():
+    """
+    Every word of the templates, Python code, scripts (vendored ones
+    included, for the state classes they toggle), the admin-entered rich
+    text and ASSET_PURGE_SAFELIST. Over-inclusive on purpose: a class
+    counts as used wherever its name appears.
+    """
+    from django.apps import apps
+    from django.db import DatabaseError
+
+    words = set(getattr(settings, 'ASSET_PURGE_SAFELIST', ()))
+    base = Path(settings.BASE_DIR)
+    sources = [base.glob('templates/**/*.html'), static_dir().glob('js/**/*.js'), static_dir().glob('vendor/**/*.js')]
+    for config in apps.get_app_configs():
+        if Path(config.path).is_relative_to(base):
+            sources.append(Path(config.path).glob('**/*.py'))
+            sources.append(Path(config.path).glob('templates/**/*.html'))
+    for source in sources:
+        for path in source:
+            words.update(WORD_RE.findall(path.read_text(encoding='utf-8', errors='ignore')))
+
+    from tinymce.models import HTMLField
+
+    for model in apps.get_models():
+        fields = [field.name for field in model._meta.concrete_fields if isinstance(field, HTMLField)]
+        if not fields:
+            continue
+        try:
+            for row in model._default_manager.values_list(*fields).iterator():
+                for value in row:
+                    words.update(WORD_RE.findall(value or ''))
+        except DatabaseError:
+            # No database at build time: only the code and templates count
+            continue
+    return words
+
+
+def _split_top_level(text, separator):
+    parts, depth, start = [], 0, 0
+    for position, char in enumerate(text):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(text[start:position])
+            start = position + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _selector_used(selector, words, keep=None):
+    return all(
+        name in words or (keep is not None and keep.fullmatch(name))
+        for name in CLASS_RE.findall(NEGATED_RE.sub('', selector))
+    )
+
+
+def _blocks(css):
+    """Split CSS into (prelude, body) pairs; body is None for statements such as @charset"""
+    blocks, depth, start, prelude = [], 0, 0, None
+    position = 0
+    while position < len(css):
+        char = css[position]
+        if char in '"\'':
+            string = STRING_RE.match(css, position)
+            position = string.end() if string else position + 1
+            continue
+        if char == '/' and css.startswith('/*', position):
+            end = css.find('*/', position + 2)
+            position = len(css) if end == -1 else end + 2
+            continue
+        if char == '{':
+            if depth == 0:
+                prelude = css[start:position].strip()
+                start = position + 1
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                blocks.append((prelude, css[start:position]))
+                start = position + 1
+        elif char == ';' and depth == 0:
+            blocks.append((css[start:position].strip(), None))
+            start = position + 1
+        position += 1
+    return blocks
+
+
+def purge_css(css, words, keep=None):
+    """
+    Drop the rules all of whose selectors name a class missing from `words`;
+    classes matching the `keep` pattern count as present.
+    """
+    output = []
+    for prelude, body in _blocks(css):
+        # Licenses (/*! ... */) stay with the rule that follows them
+        output.extend(re.findall(r'/\*!.*?\*/', prelude, flags=re.S))
+        prelude = re.sub(r'/\*.*?\*/', '', prelude, flags=re.S).strip()
+        if body is None:
+            output.append(f'{prelude};')
+        elif prelude.startswith(('@media', '@supports', '@layer', '@container')):
+            inner = purge_css(body, words, keep)
+            if inner:
+                output.append(f'{prelude}{{{inner}}}')
+        elif prelude.startswith('@'):
+            # @font-face, @keyframes, @page: kept whole
+            output.append(f'{prelude}{{{body}}}')
+        else:
+            selectors = [s.strip() for s in _split_top_level(prelude, ',') if _selector_used(s, words, keep)]
+            if selectors:
+                output.append(f"{','.join(selectors)}{{{body}}}")
+    return '\n'.join(output)
+
+
+# Bundling
+
+def minify_css(css):
+    """Strip comments (but /*! licenses) and redundant whitespace; strings are left untouched"""
+    kept = []
+
+    def protect(match):
+        if match.group(0).startswith('/*') and not match.group(0).startswith('/*!'):
+            return ''
+        kept.append(match.group(0))
+        return f'\x00{len(kept) - 1}\x00'
+
+    css = STRING_OR_COMMENT_RE.sub(protect, css)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    css = css.replace(';}', '}')
+    return re.sub(r'\x00(\d+)\x00', lambda match: kept[int(match.group(1))], css).strip()
+
+
+def minify_js(js):
+    """
+    Drop indentation, blank lines and whole-line // comments, which cannot
+    change what a script does unless a template literal spans lines; such
+    scripts are kept as is.
+    """
+    if '`' in js:
+        return js
+    lines = (line.strip() for line in js.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//'))
+
+
+def _rebase_urls(css, source_path, output_path):
+    """Make the relative url()s of `source_path` relative to `output_path`"""
+    source_dir, output_dir = posixpath.dirname(source_path), posixpath.dirname(output_path)
+
+    def replace(match):
+        quote, url = match.groups()
+        if url.startswith(('data:', '#', '/', 'http://', 'https://')):
+            return match.group(0)
+        target = posixpath.normpath(posixpath.join(source_dir, url))
+        return f'url({quote}{posixpath.relpath(target, output_dir)}{quote})'
+
+    return URL_RE.sub(replace, css)
+
+
+def _read_source(path):
+    found = finders.find(path)
+    if found is None:
+        missing = path.startswith('vendor/')
+        raise FileNotFoundError(
+            f'{path} is missing' + (' (run build_assets --vendor first)' if missing else '')
+        )
+    return Path(found).read_text(encoding='utf-8')
+
+
+def build_bundle(name, kind, words=None, root=None):
+    """Write bundle `name`'s `kind` to static/dist/; returns (path, source bytes, bundle bytes)"""
+    bundle = BUNDLES[name]
+    output_path = bundle_path(name, kind)
+    sources = [(path, _read_source(path)) for path in bundle[kind]]
+    source_size = sum(len(text.encode()) for _path, text in sources)
+
+    if kind == 'css':
+        parts = []
+        for path, text in sources:
+            text = _rebase_urls(re.sub(r'@charset\s+"[^"]*"\s*;', '', text), path, output_path)
+            if bundle.get('purge') and words is not None:
+                text = purge_css(text, words, keep=ICON_CLASS_RE)
+            parts.append(minify_css(text))
+        content = '@charset "UTF-8";\n' + '\n'.join(parts)
+    else:
+        # A separator keeps a file without a trailing semicolon from running into the next
+        content = '\n;'.join(minify_js(SOURCE_MAP_RE.sub('', text)) for _path, text in sources)
+
+    target = Path(root or static_dir()) / output_path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(content + '\n', encoding='utf-8')
+    return output_path, source_size, len(content.encode()) + 1
+
+
+def build_bundles(names=None, purge=True, root=None):
+    """Build every bundle (or those in `names`); yields build_bundle's results"""
+    words = used_words() if purge else None
+    for name in names or BUNDLES:
+        for kind in ('css', 'js'):
+            if kind in BUNDLES[name]:
+                yield build_bundle(name, kind, words=words, root=root)
+
+
+# Critical CSS
+
+class _FoldParser(HTMLParser):
+    """Collects the classes of everything before <main> and its first `limit` elements"""
+
+    def __init__(self, limit):
+        super().__init__()
+        self.limit = limit
+        self.words = set()
+        self.in_main = False
+        self.seen = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'main':
+            self.in_main = True
+        elif self.in_main:
+            self.seen += 1
+        if tag == 'footer' or self.seen > self.limit:
+            return
+        for name, value in attrs:
+            if name == 'class' and value:
+                self.words.update(value.split())
+
+
+def above_fold_words(html, limit=FOLD_ELEMENTS):
+    parser = _FoldParser(limit)
+    parser.feed(html)
+    parser.close()
+    return parser.words | set(CRITICAL_SAFELIST)
+
+
+def _drop_unused_keyframes(css):
+    """Remove the @keyframes no remaining rule animates with"""
+    blocks = _blocks(css)
+    rules = ''.join(body or '' for prelude, body in blocks if not prelude.startswith('@keyframes'))
+    kept = []
+    for prelude, body in blocks:
+        if prelude.startswith('@keyframes'):
+            name = prelude.split(None, 1)[1].strip() if ' ' in prelude else ''
+            if not re.search(rf'(?<![\w-]){re.escape(name)}(?![\w-])', rules):
+                continue
+        kept.append(f'{prelude};' if body is None else f'{prelude}{{{body}}}')
+    return ''.join(kept)
+
+
+def _critical_page_url(view_name):
+    from django.urls import reverse
+
+    if view_name == 'blog:post_detail':
+        from blog.models import BlogPost
+
+        post = BlogPost.objects.published().order_by('-published_at').first()
+        return post.get_absolute_url() if post else None
+    return reverse(view_name)
+
+
+def build_critical_css(root=None):
+    """
+    Render every CRITICAL_PAGES page and write the rules of its built
+    bundles that match the page's first screen. Yields (view name, path,
+    size); path is None for pages that could not be rendered.
+    """
+    from django.test import Client
+    from django.test.utils import override_settings
+
+    root = Path(root or static_dir())
+    client = Client()
+    for view_name, bundles in CRITICAL_PAGES.items():
+        stylesheets = []
+        for name in bundles:
+            built = root / bundle_path(name, 'css')
+            if not built.exists():
+                raise FileNotFoundError(f'{bundle_path(name, "css")} is missing (build the {name} bundle first)')
+            stylesheets.append((bundle_path(name, 'css'), built.read_text(encoding='utf-8')))
+
+        url = _critical_page_url(view_name)
+        try:
+            with override_settings(ALLOWED_HOSTS=['testserver']):
+                response = client.get(url, secure=True) if url else None
+        except Exception:
+            response = None
+        if response is None or response.status_code != 200:
+            yield view_name, None, 0
+            continue
+
+        words = above_fold_words(response.content.decode('utf-8'))
+        path = critical_path(view_name)
+        parts = []
+        for bundle, css in stylesheets:
+            css = re.sub(r'@charset\s+"[^"]*"\s*;', '', css)
+            # License comments stay in the full stylesheets
+            css = re.sub(r'/\*!.*?\*/', '', css, flags=re.S)
+            parts.append(minify_css(purge_css(_rebase_urls(css, bundle, path), words)))
+        content = _drop_unused_keyframes('\n'.join(parts))
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content + '\n', encoding='utf-8')
+        yield view_name, path, len(content.encode()) + 1
@@ -0,0 +1,85 @@
+"""
+Metered Backends
+Cache and template backends that report to the request metrics collector
+(portfolio.metrics): cache hits and misses, and time spent rendering
+templates. Configured in CACHES and TEMPLATES; outside a request they
+behave exactly like the Django backends they extend.
+"""
+import time
+
+from django.core.cache.backends import locmem, redis
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+from .metrics import current_collector
+
+_MISSING = object()
+
+
+class MeteredCacheMixin:
+    """
+    Count hits and misses of get() and get_many(). Backends implement one
+    via the other, so only the outermost call is counted.
+    """
+
+    def get(self, key, default=None, version=None):
+        collector = current_collector.get()
+        if collector is None or collector.in_cache_call:
+            return super().get(key, default, version=version)
+        collector.in_cache_call = True
+        try:
+            value = super().get(key, _MISSING, version=version)
+        finally:
+            collector.in_cache_call = False
+        if value is _MISSING:
+            collector.cache_misses += 1
+            return default
+        collector.cache_hits += 1
+        return value
+
+    def get_many(self, keys, version=None):
+        collector = current_collector.get()
+        if collector is None or collector.in_cache_call:
+            return super().get_many(keys, version=version)
+        keys = list(keys)
+        collector.in_cache_call = True
+        try:
+            found = super().get_many(keys, version=version)
+        finally:
+            collector.in_cache_call = False
+        collector.cache_hits += len(found)
+        collector.cache_misses += len(keys) - len(found)
+        return found
+
+
+class LocMemCache(MeteredCacheMixin, locmem.LocMemCache):
+    pass
+
+
+class RedisCache(MeteredCacheMixin, redis.RedisCache):
+    pass
+
+
+class MeteredTemplate(Template):
+    """Times top-level renders (includes are part of their parent)"""
+
+    def render(self, context=None, request=None):
+        collector = current_collector.get()
+        if collector is None:
+            return super().render(context, request)
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            collector.template_ms += (time.perf_counter() - started) * 1000
+
+
+class MeteredDjangoTemplates(DjangoTemplates):
+    def from_string(self, template_code):
+        return MeteredTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return MeteredTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
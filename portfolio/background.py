@@ -0,0 +1,71 @@
+"""
+Background Tasks
+A minimal in-process task runner: callables are queued after the current
+transaction commits and executed by a single daemon thread, keeping slow
+work (PDF extraction, webhook processing) off the request path.
+"""
+import logging
+import queue
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_tasks = queue.Queue()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def _run(func, args, kwargs):
+    close_old_connections()
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception('Background task %s failed', getattr(func, '__name__', func))
+    finally:
+        connections.close_all()
+
+
+def _work():
+    while True:
+        func, args, kwargs = _tasks.get()
+        try:
+            _run(func, args, kwargs)
+        finally:
+            _tasks.task_done()
+
+
+def _ensure_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_work, name='background-tasks', daemon=True)
+            _worker.start()
+
+
+def enqueue(func, *args, **kwargs):
+    """
+    Run `func(*args, **kwargs)` in the background once the current
+    transaction commits. With BACKGROUND_TASKS_EAGER the call runs inline,
+    which management commands and local debugging rely on.
+    """
+    def submit():
+        if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+            func(*args, **kwargs)
+            return
+        _ensure_worker()
+        _tasks.put((func, args, kwargs))
+
+    transaction.on_commit(submit)
+
+
+def wait(timeout=None):
+    """Block until every queued task has finished (used by commands and benchmarks)"""
+    if timeout is None:
+        _tasks.join()
+        return True
+    done = threading.Event()
+    threading.Thread(target=lambda: (_tasks.join(), done.set()), daemon=True).start()
+    return done.wait(timeout)
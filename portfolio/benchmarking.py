@@ -0,0 +1,308 @@
+"""
+URL Benchmarking
+Seeds realistic data volumes and measures query count, wall time and
+response size for every public route of the portfolio, blog and GitHub
+apps. Used by the `benchmark_urls` management command.
+"""
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils import timezone
+
+BENCHMARKED_NAMESPACES = ('portfolio', 'blog', 'github')
+
+# Routes that change data, call external services or are staff-only are not measured
+SKIPPED_ROUTES = {
+    'github:sync_repositories',
+    'github:webhook',
+    'blog:add_comment',
+    'portfolio:metrics_dashboard',
+    'portfolio:metrics_json',
+}
+
+DEFAULT_SCALE = {
+    'posts': 2000,
+    'comments_per_post': 5,
+    'categories': 20,
+    'tags': 300,
+    'tags_per_post': 4,
+    'skills': 500,
+    'research': 300,
+    'timeline_entries': 60,
+    'repositories': 1000,
+    'languages_per_repo': 3,
+    'commits_per_repo': 5,
+}
+
+WORDS = (
+    'spatial economics regression panel data causal inference market labor trade '
+    'policy housing urban growth model estimation python django machine learning '
+    'network gravity welfare migration climate energy forecast survey analysis'
+).split()
+
+
+def _words(rng, count):
+    return ' '.join(rng.choice(WORDS) for _ in range(count))
+
+
+def seed_data(scale=None, seed=42):
+    """Bulk-create benchmark data; returns the counts that were created"""
+    from blog.models import BlogPost, BlogTag, Category, Comment, TaggedPost
+    from blog.publishing import refresh_post_counts
+    from github_integration.language_stats import refresh_language_stats
+    from github_integration.models import GitHubRepository, GitHubLanguage, GitHubCommit
+    from portfolio.models import (
+        AboutPageSettings, HomePage, IndustryIndexSettings, IndustryRanking, Research,
+        ResearchPageSettings, ResearchTag, Skill, TaggedResearch, TimelineEntry,
+    )
+
+    scale = {**DEFAULT_SCALE, **(scale or {})}
+    rng = random.Random(seed)
+    now = timezone.now()
+
+    HomePage.objects.get_or_create(pk=1)
+    AboutPageSettings.objects.get_or_create(pk=1)
+    ResearchPageSettings.objects.get_or_create(pk=1)
+    IndustryIndexSettings.objects.get_or_create(pk=1)
+
+    categories = Category.objects.bulk_create([
+        Category(name=f'Category {i}', slug=f'category-{i}') for i in range(scale['categories'])
+    ])
+    tags = BlogTag.objects.bulk_create([
+        BlogTag(name=f'tag-{i}', slug=f'tag-{i}') for i in range(scale['tags'])
+    ])
+
+    statuses = ['PUBLISHED'] * 8 + ['DRAFT', 'ARCHIVED']
+    posts = BlogPost.objects.bulk_create([
+        BlogPost(
+            title=f'Post {i} {_words(rng, 4)}',
+            slug=f'post-{i}',
+            content=f'<p>{_words(rng, 300)}</p>',
+            excerpt=_words(rng, 30),
+            category=rng.choice(categories),
+            status=rng.choice(statuses),
+            featured=i % 50 == 0,
+            published_at=now - timedelta(hours=i),
+        )
+        for i in range(scale['posts'])
+    ], batch_size=500)
+
+    TaggedPost.objects.bulk_create([
+        TaggedPost(content_object=post, tag=tag)
+        for post in posts
+        for tag in rng.sample(tags, min(scale['tags_per_post'], len(tags)))
+    ], batch_size=1000)
+    Comment.objects.bulk_create([
+        Comment(post=post, name=f'Reader {j}', email=f'reader{j}@example.com',
+                content=_words(rng, 40), is_approved=j % 3 != 0)
+        for post in posts
+        for j in range(scale['comments_per_post'])
+    ], batch_size=1000)
+    # bulk_create skips the signals that maintain the category and tag counters
+    refresh_post_counts()
+
+    subcategories = [value for value, label in Skill.SUBCATEGORY_CHOICES]
+    Skill.objects.bulk_create([
+        Skill(
+            name=f'Skill {i}',
+            category=rng.choice(['HARD', 'SOFT', 'HOBBIES']),
+            subcategory=rng.choice(subcategories),
+            proficiency=rng.randint(30, 100),
+            icon='fas fa-star',
+            order=i,
+        )
+        for i in range(scale['skills'])
+    ], batch_size=500)
+
+    research_tags = ResearchTag.objects.bulk_create([
+        ResearchTag(name=f'topic-{i}', slug=f'topic-{i}') for i in range(40)
+    ])
+    research_items = Research.objects.bulk_create([
+        Research(
+            title=f'Research {i} {_words(rng, 6)}',
+            research_type=rng.choice(['PUBLICATION', 'PROJECT', 'PATENT', 'CONFERENCE']),
+            authors='A. Author, B. Author',
+            abstract=_words(rng, 150),
+            publication_venue='Journal of Benchmarks',
+            publication_date=date(2010 + i % 15, 1 + i % 12, 1),
+            featured=i % 40 == 0,
+            order=i,
+        )
+        for i in range(scale['research'])
+    ], batch_size=500)
+    TaggedResearch.objects.bulk_create([
+        TaggedResearch(content_object=item, tag=tag)
+        for item in research_items
+        for tag in rng.sample(research_tags, 3)
+    ], batch_size=1000)
+
+    TimelineEntry.objects.bulk_create([
+        TimelineEntry(
+            period=rng.choice(['PAST', 'PRESENT', 'FUTURE']),
+            year=2000 + i % 40,
+            title=f'Entry {i}',
+            content=f'<p>{_words(rng, 80)}</p>',
+            order=i,
+        )
+        for i in range(scale['timeline_entries'])
+    ])
+    IndustryRanking.objects.bulk_create([
+        IndustryRanking(industry_name=f'Industry {i}', rank=i + 1, relevance_score=100 - i * 5,
+                        reasoning=_words(rng, 40), key_skills='Python, Econometrics, GIS')
+        for i in range(10)
+    ])
+
+    languages = ['Python', 'JavaScript', 'R', 'Go', 'Rust', 'C++', 'HTML', 'Shell']
+    repositories = GitHubRepository.objects.bulk_create([
+        GitHubRepository(
+            github_id=100000 + i,
+            name=f'repo-{i}',
+            full_name=f'benchmark/repo-{i}',
+            description=_words(rng, 12),
+            url=f'https://github.com/benchmark/repo-{i}',
+            stars_count=rng.randint(0, 5000),
+            forks_count=rng.randint(0, 500),
+            primary_language=rng.choice(languages),
+            is_fork=i % 10 == 0,
+            is_archived=i % 25 == 0,
+            featured=i % 100 == 0,
+            created_at=now - timedelta(days=i),
+            updated_at=now - timedelta(hours=i),
+            pushed_at=now - timedelta(hours=i),
+            readme_html=f'<h1>repo-{i}</h1><p>{_words(rng, 80)}</p>',
+        )
+        for i in range(scale['repositories'])
+    ], batch_size=500)
+    GitHubLanguage.objects.bulk_create([
+        GitHubLanguage(repository=repo, name=name, bytes_count=rng.randint(1000, 100000), percentage=0)
+        for repo in repositories
+        for name in rng.sample(languages, scale['languages_per_repo'])
+    ], batch_size=1000)
+    refresh_language_stats()
+    GitHubCommit.objects.bulk_create([
+        GitHubCommit(
+            repository=repo,
+            sha=f'{repo.github_id:020d}{j:020d}',
+            message=_words(rng, 8),
+            author_name='Benchmark',
+            author_email='bench@example.com',
+            committed_at=now - timedelta(hours=j),
+            url=f'{repo.url}/commit/{j}',
+        )
+        for repo in repositories
+        for j in range(scale['commits_per_repo'])
+    ], batch_size=1000)
+
+    return scale
+
+
+def sample_kwargs():
+    """URL kwargs for parameterised routes, taken from seeded data"""
+    from blog.models import BlogPost, BlogTag, Category
+    from github_integration.models import GitHubRepository
+    from portfolio.models import Research
+
+    post = BlogPost.objects.published().order_by('pk').first()
+    category = Category.objects.order_by('pk').first()
+    tag = BlogTag.objects.order_by('pk').first()
+    research = Research.objects.order_by('pk').first()
+    repository = GitHubRepository.objects.order_by('pk').first()
+    return {
+        'blog:post_detail': {'slug': post.slug} if post else None,
+        'blog:category': {'slug': category.slug} if category else None,
+        'blog:tag': {'slug': tag.slug} if tag else None,
+        'portfolio:research_detail': {'pk': research.pk} if research else None,
+        'portfolio:research_pdf': {'pk': research.pk} if research else None,
+        'github:repository_detail': dict(zip(('owner', 'name'), repository.full_name.split('/', 1))) if repository else None,
+    }
+
+
+def iter_route_names(resolver=None, namespace=None):
+    """Yield 'namespace:name' and whether the route takes arguments"""
+    resolver = resolver or get_resolver()
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            child_namespace = pattern.namespace or namespace
+            if child_namespace in BENCHMARKED_NAMESPACES or namespace in BENCHMARKED_NAMESPACES:
+                yield from iter_route_names(pattern, child_namespace)
+        elif isinstance(pattern, URLPattern) and pattern.name and namespace in BENCHMARKED_NAMESPACES:
+            yield f'{namespace}:{pattern.name}', bool(pattern.pattern.converters or pattern.pattern.regex.groups)
+
+
+def route_targets(extra_paths=None):
+    """
+    Return ([(route, path)], [routes without sample data]) for every
+    benchmarked route, plus `extra_paths` ({label: path}).
+    """
+    samples = sample_kwargs()
+    targets, missing = [], []
+    for route, takes_args in iter_route_names():
+        if route in SKIPPED_ROUTES:
+            continue
+        kwargs = samples.get(route) if takes_args else {}
+        if kwargs is None:
+            missing.append(route)
+            continue
+        targets.append((route, reverse(route, kwargs=kwargs)))
+    for label, path in (extra_paths or {}).items():
+        targets.append((label, path))
+    return targets, missing
+
+
+def measure_routes(repeat=5, extra_paths=None):
+    """
+    Request every benchmarked route `repeat` times after one warm-up request
+    and return {route: {'path', 'status', 'queries', 'time_ms', 'bytes'}}.
+    Time is the median of the repeats; queries and size come from the last run.
+    """
+    client = Client(raise_request_exception=False)
+    targets, missing = route_targets(extra_paths)
+    results = {route: {'path': None, 'status': 'skipped'} for route in missing}
+
+    for route, path in targets:
+        client.get(path, secure=True)
+        timings = []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = client.get(path, secure=True)
+                content = b''.join(response.streaming_content) if response.streaming else response.content
+                timings.append((time.perf_counter() - started) * 1000)
+            response.close()
+        results[route] = {
+            'path': path,
+            'status': response.status_code,
+            'queries': len(queries),
+            'time_ms': round(statistics.median(timings), 2),
+            'bytes': len(content),
+        }
+    return results
+
+
+def compare(results, baseline, threshold=0.25, min_delta_ms=10.0):
+    """
+    Return a list of regression messages: any increase in query count, or
+    time/size growth beyond `threshold`. Time must also grow by more than
+    `min_delta_ms` so jitter on fast pages is not reported.
+    """
+    regressions = []
+    for route, current in results.items():
+        previous = baseline.get(route)
+        if not previous or current.get('status') == 'skipped' or previous.get('status') == 'skipped':
+            continue
+        if current['status'] != previous['status']:
+            regressions.append(f"{route}: status {previous['status']} -> {current['status']}")
+        if current['queries'] > previous['queries']:
+            regressions.append(f"{route}: queries {previous['queries']} -> {current['queries']}")
+        allowed_time = max(previous['time_ms'] * (1 + threshold), previous['time_ms'] + min_delta_ms)
+        if current['time_ms'] > allowed_time:
+            regressions.append(f"{route}: time {previous['time_ms']}ms -> {current['time_ms']}ms")
+        if current['bytes'] > previous['bytes'] * (1 + threshold):
+            regressions.append(f"{route}: size {previous['bytes']}B -> {current['bytes']}B")
+    return regressions
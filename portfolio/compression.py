@@ -0,0 +1,153 @@
+"""
+Response Compression
+Brotli or gzip for the HTML, JSON and text the views return, negotiated
+from Accept-Encoding (static files are left to WhiteNoise, which serves
+the variants precompressed at collectstatic).
+
+Responses any visitor could be given (GET, 200, no cookies set or varied
+on) stay identical until the data changes, so their compressed variant is
+cached under a digest of the body: each page is compressed once per
+process, at a higher level than per-request compression affords, and later
+requests only pay for the digest. Being content-addressed, the variants
+can never go stale, so they stay in the per-process 'local' cache.
+Responses tied to a visitor's cookies may carry secrets next to reflected
+input, so they get gzip with Django's BREACH length randomization instead,
+never Brotli and never cached. Streaming responses and bodies under
+RESPONSE_COMPRESSION_MIN_SIZE go out as they are.
+"""
+import gzip
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import has_vary_header, patch_vary_headers
+from django.utils.text import compress_string
+
+from .metrics import metrics
+
+try:
+    import brotli
+except ImportError:
+    # gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/json', 'application/javascript', 'application/xml',
+    'application/rss+xml', 'application/atom+xml', 'image/svg+xml',
+)
+# Below about a packet, compression saves no round trip and costs CPU
+DEFAULT_MIN_SIZE = 1024
+# Larger bodies are compressed per request instead of filling the cache
+MAX_CACHED_SIZE = 1024 * 1024
+VARIANT_CACHE_TIMEOUT = 60 * 60 * 24
+BROTLI_QUALITY = 9
+GZIP_LEVEL = 9
+# Random bytes Django's GZipMiddleware adds against BREACH
+MAX_RANDOM_BYTES = 100
+
+
+def min_size():
+    return getattr(settings, 'RESPONSE_COMPRESSION_MIN_SIZE', DEFAULT_MIN_SIZE)
+
+
+def accepted_encodings(header):
+    """{coding: q} from an Accept-Encoding header"""
+    accepted = {}
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def negotiate(header, allow_brotli=True):
+    """'br', 'gzip' or None for the client's Accept-Encoding header"""
+    accepted = accepted_encodings(header)
+    wildcard = accepted.get('*', 0)
+    if allow_brotli and brotli is not None and accepted.get('br', wildcard) > 0:
+        return 'br'
+    if accepted.get('gzip', wildcard) > 0:
+        return 'gzip'
+    return None
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def is_shared(request, response):
+    """Whether every visitor asking for this URL would get the same body"""
+    if request.method not in ('GET', 'HEAD') or response.status_code != 200 or response.cookies:
+        return False
+    cache_control = response.get('Cache-Control', '').lower()
+    if 'private' in cache_control or 'no-store' in cache_control:
+        return False
+    return not has_vary_header(response, 'Cookie')
+
+
+def _compressible(response):
+    if response.streaming or response.has_header('Content-Encoding'):
+        return False
+    content_type = response.get('Content-Type', '').split(';', 1)[0].strip().lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class ResponseCompressionMiddleware:
+    """Compress dynamic responses, reusing the compressed variant of shared ones"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not _compressible(response) or len(response.content) < min_size():
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        shared = is_shared(request, response)
+        encoding = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''), allow_brotli=shared)
+        if encoding is None:
+            return response
+
+        body = response.content
+        started = time.perf_counter()
+        cached = False
+        if not shared:
+            compressed = compress_string(body, max_random_bytes=MAX_RANDOM_BYTES)
+        elif len(body) > MAX_CACHED_SIZE:
+            compressed = compress(body, encoding)
+        else:
+            key = f'compressed:{encoding}:{hashlib.md5(body, usedforsecurity=False).hexdigest()}:{len(body)}'
+            compressed = caches['local'].get(key)
+            cached = compressed is not None
+            if not cached:
+                compressed = compress(body, encoding)
+                caches['local'].set(key, compressed, VARIANT_CACHE_TIMEOUT)
+        metrics.record('compression', encoding, {
+            'compress_ms': (time.perf_counter() - started) * 1000,
+            'ratio': len(compressed) / len(body),
+            'cached': int(cached),
+        })
+        if len(compressed) >= len(body):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        # As in GZipMiddleware: a strong ETag would promise the uncompressed bytes
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
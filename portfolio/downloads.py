@@ -0,0 +1,237 @@
+"""
+File Delivery
+Serves stored files (CV, research PDFs) with HTTP Range and conditional
+request support, streaming fixed-size chunks from storage. Can optionally
+redirect to a short-lived signed storage URL so bytes bypass the app.
+"""
+import hashlib
+import inspect
+import logging
+import mimetypes
+import re
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.http import HttpResponse, HttpResponseRedirect, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .instrumentation import ExternalCall, instrumented, report
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def get_chunk_size():
+    return getattr(settings, 'FILE_DOWNLOAD_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+
+
+def parse_range(header, size):
+    """
+    Parse a single-range `Range` header into an inclusive (start, end) tuple.
+
+    Returns None when the header is absent, malformed or asks for several
+    ranges (the full file is served instead), and raises ValueError when
+    the range cannot be satisfied.
+    """
+    if not header:
+        return None
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the final `last` bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError('Empty suffix range')
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError('Range not satisfiable')
+    return start, min(end, size - 1)
+
+
+def stream_file(storage, name, start, length, chunk_size=None, on_complete=None):
+    """
+    Yield `length` bytes of a stored file starting at `start`. `on_complete`
+    is called once the last chunk has been handed over; not when the client
+    disconnects first or the file turns out shorter.
+
+    Storage time (opening plus every read, not the time the client takes
+    to receive each chunk) is reported as one `storage.read` call.
+    """
+    chunk_size = chunk_size or get_chunk_size()
+    read = ExternalCall('storage', 'read', name=name)
+    read.latency_ms = 0.0
+    read.bytes_received = 0
+    remaining = length
+    try:
+        started = time.perf_counter()
+        f = storage.open(name, 'rb')
+        read.latency_ms += (time.perf_counter() - started) * 1000
+        with f:
+            if start:
+                f.seek(start)
+            while remaining > 0:
+                started = time.perf_counter()
+                chunk = f.read(min(chunk_size, remaining))
+                read.latency_ms += (time.perf_counter() - started) * 1000
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                read.bytes_received += len(chunk)
+                yield chunk
+    except Exception as exc:
+        read.error = f'{type(exc).__name__}: {exc}'
+        read.status = 'error'
+        raise
+    finally:
+        if read.status is None:
+            read.status = 'ok' if remaining == 0 else 'incomplete'
+        report(read)
+        # Closing the generator early raises GeneratorExit at the pending yield
+        if remaining == 0 and on_complete is not None:
+            on_complete()
+
+
+def record_download(key, file_name):
+    """Increment the download counter for `key`"""
+    from .models import FileDownload
+
+    try:
+        now = timezone.now()
+        updated = FileDownload.objects.filter(key=key).update(
+            download_count=F('download_count') + 1,
+            file_name=file_name,
+            last_downloaded_at=now,
+        )
+        if not updated:
+            download, created = FileDownload.objects.get_or_create(
+                key=key,
+                defaults={'file_name': file_name, 'download_count': 1, 'last_downloaded_at': now},
+            )
+            if not created:
+                FileDownload.objects.filter(pk=download.pk).update(download_count=F('download_count') + 1)
+    except Exception:
+        logger.exception('Failed to record download for %s', key)
+
+
+def is_local(storage, name):
+    """Whether `storage` keeps `name` on the local filesystem (every Storage has a `path` method)"""
+    try:
+        storage.path(name)
+    except NotImplementedError:
+        return False
+    return True
+
+
+@instrumented('storage', 'signed_url')
+def signed_url(fieldfile, filename, as_attachment=True):
+    """
+    Return a signed storage URL for `fieldfile` that expires after
+    FILE_DOWNLOAD_URL_EXPIRY seconds. The expiry is passed per URL, so the
+    media URLs rendered into pages (and cached with them) are unaffected.
+    """
+    storage = fieldfile.storage
+    expiry = getattr(settings, 'FILE_DOWNLOAD_URL_EXPIRY', 300)
+    bucket = getattr(storage, 'bucket', None)
+    if hasattr(bucket, 'blob'):
+        # Google Cloud Storage: signed on the blob, whatever GS_QUERYSTRING_AUTH and GS_EXPIRATION say
+        return bucket.blob(fieldfile.name).generate_signed_url(
+            expiration=timedelta(seconds=expiry),
+            version='v4',
+            response_disposition=f'attachment; filename="{filename}"' if as_attachment else None,
+        )
+    params = inspect.signature(storage.url).parameters
+    kwargs = {}
+    if 'expire' in params:
+        kwargs['expire'] = expiry
+    if 'parameters' in params and as_attachment:
+        kwargs['parameters'] = {'response_disposition': f'attachment; filename="{filename}"'}
+    return storage.url(fieldfile.name, **kwargs)
+
+
+def serve_file(request, fieldfile, filename=None, key=None, as_attachment=True, content_type=None):
+    """
+    Build the response for downloading `fieldfile`.
+
+    Honors If-None-Match/If-Modified-Since (304), Range/If-Range (206/416),
+    answers HEAD without a body and streams GET bodies in chunks. When
+    FILE_DOWNLOAD_REDIRECT is enabled and the storage is not local, the
+    client is redirected to a signed storage URL instead. Downloads of the
+    whole file are counted under `key` in the background, once its last
+    chunk has been streamed (or the redirect issued).
+    """
+    from .background import enqueue
+
+    storage = fieldfile.storage
+    name = fieldfile.name
+    filename = filename or name.rsplit('/', 1)[-1]
+
+    def count():
+        if key:
+            enqueue(record_download, key, name)
+
+    if getattr(settings, 'FILE_DOWNLOAD_REDIRECT', False) and not is_local(storage, name):
+        response = HttpResponseRedirect(signed_url(fieldfile, filename, as_attachment))
+        response['Cache-Control'] = 'no-store'
+        count()
+        return response
+
+    size = storage.size(name)
+    try:
+        last_modified = storage.get_modified_time(name)
+    except (NotImplementedError, OSError):
+        last_modified = None
+    fingerprint = f"{name}:{size}:{last_modified.timestamp() if last_modified else ''}"
+    etag = quote_etag(hashlib.md5(fingerprint.encode()).hexdigest())
+    last_modified_ts = int(last_modified.timestamp()) if last_modified else None
+
+    conditional = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+    if conditional is not None:
+        return conditional
+
+    byte_range = None
+    if_range = request.headers.get('If-Range')
+    if not if_range or if_range == etag:
+        try:
+            byte_range = parse_range(request.headers.get('Range'), size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    start, end = byte_range if byte_range else (0, size - 1)
+    length = max(end - start + 1, 0)
+
+    if request.method == 'HEAD':
+        response = HttpResponse()
+    else:
+        # A range that stops short of the end (`bytes=0-1023`) is part of a download
+        whole_file = start == 0 and length == size
+        response = StreamingHttpResponse(
+            stream_file(storage, name, start, length, on_complete=count if whole_file else None)
+        )
+
+    if byte_range:
+        response.status_code = 206
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+    response['Content-Type'] = content_type or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    response['Content-Length'] = str(length)
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    if last_modified_ts:
+        response['Last-Modified'] = http_date(last_modified_ts)
+    disposition = 'attachment' if as_attachment else 'inline'
+    response['Content-Disposition'] = f'{disposition}; filename="{filename}"'
+    return response
@@ -3,9 +3,14 @@ Industry Index AI Analyzer
 Uses OpenAI to analyze user's profile and generate industry relevance rankings
 """
 import json
+import logging
 from datetime import datetime
 from openai import OpenAI
 
+from .instrumentation import external_call
+
+logger = logging.getLogger(__name__)
+
 
 def gather_profile_data():
     """Gather all relevant data from the website for analysis"""
@@ -23,12 +28,13 @@ def gather_profile_data():
         'skills': [],
         'experience': [],
         'blog_posts': [],
-        'timeline': []
+        'timeline': [],
+        'github_languages': [],
     }
     
     # Homepage data - includes current position and background
     try:
-        homepage = HomePage.objects.first()
+        homepage = HomePage.load()
         if homepage:
             data['homepage'] = {
                 'title': homepage.hero_title,
@@ -37,18 +43,18 @@ def gather_profile_data():
                 'cta_secondary': homepage.cta_secondary_text,
                 'about_section': homepage.about_section[:500] if homepage.about_section else '',
             }
-    except:
-        pass
+    except Exception:
+        logger.exception('Could not gather homepage data for the industry index')
     
     # About page data
     try:
-        about = AboutPageSettings.objects.first()
+        about = AboutPageSettings.load()
         if about:
             data['about'] = {
                 'bio': about.intro_bio[:500] if about.intro_bio else '',
             }
-    except:
-        pass
+    except Exception:
+        logger.exception('Could not gather about data for the industry index')
     
     # Education - comprehensive background
     try:
@@ -62,19 +68,27 @@ def gather_profile_data():
                 'start_date': str(edu.start_date) if edu.start_date else '',
                 'end_date': str(edu.end_date) if edu.end_date else 'Present',
             })
-    except:
-        pass
+    except Exception:
+        logger.exception('Could not gather education data for the industry index')
     
-    # Research
+    # Research - includes the opening of the paper body when its PDF has been indexed
     try:
-        for research in Research.objects.all()[:10]:
+        from .models import ResearchTextChunk
+        research_items = list(Research.objects.all()[:10])
+        opening_chunks = dict(
+            ResearchTextChunk.objects.filter(
+                research__in=research_items, source='PDF', position=0
+            ).values_list('research_id', 'text')
+        )
+        for research in research_items:
             data['research'].append({
                 'title': research.title,
                 'type': research.research_type,
                 'abstract': research.abstract[:200] if research.abstract else '',
+                'full_text_excerpt': opening_chunks.get(research.pk, '')[:600],
             })
-    except:
-        pass
+    except Exception:
+        logger.exception('Could not gather research data for the industry index')
     
     # Skills
     try:
@@ -84,8 +98,8 @@ def gather_profile_data():
                 'category': skill.category,
                 'proficiency': skill.proficiency,
             })
-    except:
-        pass
+    except Exception:
+        logger.exception('Could not gather skills data for the industry index')
     
     # Experience - includes current position
     try:
@@ -100,18 +114,18 @@ def gather_profile_data():
                 'end_date': str(exp.end_date) if hasattr(exp, 'end_date') and exp.end_date else 'Present',
                 'is_current': is_current,
             })
-    except:
-        pass
+    except Exception:
+        logger.exception('Could not gather experience data for the industry index')
     
     # Blog posts
     try:
-        for post in BlogPost.objects.filter(status='PUBLISHED')[:10]:
+        for post in BlogPost.objects.published()[:10]:
             data['blog_posts'].append({
                 'title': post.title,
                 'excerpt': post.excerpt[:150] if post.excerpt else '',
             })
-    except:
-        pass
+    except Exception:
+        logger.exception('Could not gather blog post data for the industry index')
     
     # Timeline entries
     try:
@@ -121,8 +135,20 @@ def gather_profile_data():
                 'title': entry.title,
                 'year': entry.year,
             })
-    except:
-        pass
+    except Exception:
+        logger.exception('Could not gather timeline data for the industry index')
+    
+    # Languages across the GitHub repositories, precomputed at sync time
+    try:
+        from github_integration.language_stats import top_languages
+        for stat in top_languages(10):
+            data['github_languages'].append({
+                'language': stat.name,
+                'percentage': float(stat.percentage),
+                'repositories': stat.repo_count,
+            })
+    except Exception:
+        logger.exception('Could not gather GitHub language data for the industry index')
     
     return data
 
@@ -148,6 +174,7 @@ IMPORTANT: Pay special attention to:
 - Skills and proficiency levels across different categories
 - Blog posts and thought leadership content
 - Timeline entries showing career progression
+- Programming languages used across their GitHub repositories (github_languages)
 
 Profile Data:
 {json.dumps(profile_data, indent=2)}
@@ -184,18 +211,19 @@ Respond in JSON format:
     
     try:
         # Call OpenAI API
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are an expert career analyst specializing in industry fit analysis."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=2000
-        )
-        
-        # Parse the response
-        result_text = response.choices[0].message.content
+        with external_call('openai', 'chat.completions', model="gpt-4o") as call:
+            call.bytes_sent = len(prompt.encode('utf-8'))
+            response = client.chat.completions.create(
+                model="gpt-4o",
+                messages=[
+                    {"role": "system", "content": "You are an expert career analyst specializing in industry fit analysis."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.7,
+                max_tokens=2000
+            )
+            result_text = response.choices[0].message.content
+            call.bytes_received = len((result_text or '').encode('utf-8'))
         
         # Extract JSON from response (handle markdown code blocks)
         if "```json" in result_text:
@@ -206,8 +234,8 @@ Respond in JSON format:
         result = json.loads(result_text)
         return result
         
-    except Exception as e:
-        print(f"Error generating rankings: {e}")
+    except Exception:
+        logger.exception("Error generating industry rankings")
         return None
 
 
@@ -267,7 +295,7 @@ def update_industry_rankings(api_key):
         rank_counter += 1
     
     # Update last generated timestamp
-    settings, created = IndustryIndexSettings.objects.get_or_create(pk=1)
+    settings = IndustryIndexSettings.load()
     settings.last_generated = timezone.now()
     if not settings.current_industry and current_industry:
         settings.current_industry = current_industry
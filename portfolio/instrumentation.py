@@ -0,0 +1,135 @@
+"""
+External Call Instrumentation
+Shared timing hooks for outbound calls (GitHub API, OpenAI, file storage).
+Each call records latency, payload sizes, status and retry count to the
+`portfolio.instrumentation` logger and to the in-process metrics store,
+where it shows up on the staff metrics dashboard next to request timings.
+
+    with external_call('github', 'list_repos') as call:
+        response = session.get(url)
+        call.record_response(response)
+
+    @instrumented('storage', 'signed_url')
+    def signed_url(...): ...
+
+Calls whose time is spread out, like the reads of a streamed download, fill
+in an ExternalCall themselves and pass it to `report`.
+"""
+import functools
+import logging
+import time
+
+from .metrics import current_collector, metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ExternalCall:
+    """Mutable record filled in by the caller while the call is in flight"""
+
+    def __init__(self, service, operation, **context):
+        self.service = service
+        self.operation = operation
+        self.context = context
+        self.status = None
+        self.bytes_sent = None
+        self.bytes_received = None
+        self.retries = 0
+        self.error = None
+        self.latency_ms = None
+
+    @property
+    def name(self):
+        return f'{self.service}.{self.operation}'
+
+    def record_response(self, response):
+        """
+        Take status, size and urllib3 retry history from a `requests` response.
+        Only use on non-streamed responses, since the body may be read.
+        """
+        self.status = response.status_code
+        length = response.headers.get('Content-Length')
+        if length and length.isdigit():
+            self.bytes_received = int(length)
+        else:
+            self.bytes_received = len(response.content or b'')
+        retries = getattr(getattr(response, 'raw', None), 'retries', None)
+        if retries is not None and getattr(retries, 'history', None):
+            self.retries = len(retries.history)
+        return response
+
+    def failed(self):
+        if self.error is not None:
+            return True
+        return isinstance(self.status, int) and self.status >= 400
+
+
+class external_call:
+    """
+    Context manager timing one outbound call. Exceptions are recorded and
+    re-raised; the caller decides whether to swallow them.
+    """
+
+    def __init__(self, service, operation, **context):
+        self.call = ExternalCall(service, operation, **context)
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self.call
+
+    def __exit__(self, exc_type, exc, tb):
+        call = self.call
+        call.latency_ms = (time.perf_counter() - self._started) * 1000
+        if exc is not None:
+            call.error = f'{exc_type.__name__}: {exc}'
+            if call.status is None:
+                call.status = getattr(getattr(exc, 'response', None), 'status_code', None) or 'error'
+        elif call.status is None:
+            call.status = 'ok'
+        report(call)
+        return False
+
+
+def instrumented(service, operation=None):
+    """Decorator form of `external_call`; the operation defaults to the function name"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with external_call(service, operation or func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def report(call):
+    """Record a finished call; used directly for calls timed piecewise, like streamed reads"""
+    failed = call.failed()
+    metrics.record('external', call.name, {
+        'latency_ms': call.latency_ms,
+        'bytes_sent': call.bytes_sent,
+        'bytes_received': call.bytes_received,
+        'retries': call.retries,
+    }, error=failed)
+
+    collector = current_collector.get()
+    if collector is not None:
+        collector.external_calls += 1
+        collector.external_ms += call.latency_ms
+
+    logger.log(
+        logging.WARNING if failed else logging.INFO,
+        '%s status=%s latency_ms=%.1f sent=%s received=%s retries=%s%s%s',
+        call.name, call.status, call.latency_ms, call.bytes_sent, call.bytes_received, call.retries,
+        ''.join(f' {key}={value}' for key, value in call.context.items()),
+        f' error="{call.error}"' if call.error else '',
+        extra={
+            'service': call.service,
+            'operation': call.operation,
+            'status': call.status,
+            'latency_ms': round(call.latency_ms, 2),
+            'bytes_sent': call.bytes_sent,
+            'bytes_received': call.bytes_received,
+            'retries': call.retries,
+            **{f'call_{key}': value for key, value in call.context.items()},
+        },
+    )
@@ -1,5 +1,5 @@
 from django.core.management.base import BaseCommand
-from portfolio.models import Skill
+from portfolio.skill_import import import_skills
 
 
 class Command(BaseCommand):
@@ -17,29 +17,17 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR('Category must be HARD, SOFT, or HOBBIES'))
             return
         
-        created_count = 0
-        max_order = Skill.objects.filter(category=category).count()
+        # Same engine as import_skills and the admin bulk add, which use '|' separators
+        lines = ['|'.join(skill_str.split(':', 2)) for skill_str in skills_data]
+        result = import_skills(lines, category, update_existing=False)
         
-        for idx, skill_str in enumerate(skills_data):
-            parts = skill_str.split(':')
-            name = parts[0]
-            proficiency = int(parts[1]) if len(parts) > 1 else 50
-            icon = parts[2] if len(parts) > 2 else ''
-            
-            skill, created = Skill.objects.get_or_create(
-                name=name,
-                category=category,
-                defaults={
-                    'proficiency': proficiency,
-                    'icon': icon,
-                    'order': max_order + idx
-                }
-            )
-            
-            if created:
-                created_count += 1
-                self.stdout.write(self.style.SUCCESS(f'✓ Added: {name} ({proficiency}%)'))
-            else:
-                self.stdout.write(self.style.WARNING(f'⚠ Already exists: {name}'))
+        for name in result.created:
+            self.stdout.write(self.style.SUCCESS(f'✓ Added: {name}'))
+        for name in result.skipped:
+            self.stdout.write(self.style.WARNING(f'⚠ Already exists: {name}'))
+        for message in result.warnings:
+            self.stdout.write(self.style.WARNING(f'⚠ {message}'))
+        for message in result.errors:
+            self.stdout.write(self.style.ERROR(f'✗ {message}'))
         
-        self.stdout.write(self.style.SUCCESS(f'\n✓ Successfully added {created_count} skills to {category} category'))
+        self.stdout.write(self.style.SUCCESS(f'\n✓ Successfully added {len(result.created)} skills to {category} category'))
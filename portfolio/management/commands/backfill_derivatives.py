@@ -0,0 +1,192 @@
+"""
+Management command to generate missing image derivatives for media that was
+uploaded before derivatives existed. Work is spread over a process pool and
+checkpointed so an interrupted run resumes where it stopped.
+"""
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from portfolio.media_derivatives import (
+    generate_derivatives, is_image_name, iter_file_fields, iter_stored_names, record_all_variants,
+)
+
+
+def _init_worker():
+    """Make Django usable in workers started with the 'spawn' method"""
+    import django
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'personal_website.settings')
+    django.setup()
+
+
+def _process(name, force):
+    try:
+        return generate_derivatives(name, force=force)
+    except Exception as e:
+        return {'name': name, 'error': str(e), 'generated': [], 'bytes_in': 0, 'bytes_out': 0}
+
+
+class Checkpoint:
+    """Set of completed file names persisted as JSON, flushed atomically"""
+
+    def __init__(self, path, flush_every=25):
+        self.path = path
+        self.flush_every = flush_every
+        self.done = set()
+        self._pending = 0
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.done = set(json.load(f).get('done', []))
+
+    def __contains__(self, name):
+        return name in self.done
+
+    def add(self, name):
+        self.done.add(name)
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'done': sorted(self.done)}, f)
+        os.replace(tmp_path, self.path)
+        self._pending = 0
+
+    def clear(self):
+        self.done = set()
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class Command(BaseCommand):
+    help = 'Generate missing image derivatives for every ImageField/FileField in parallel'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 2,
+            help='Number of worker processes',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            type=str,
+            default=str(settings.BASE_DIR / '.backfill_derivatives.json'),
+            help='Checkpoint file used to resume interrupted runs',
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignore and discard an existing checkpoint',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate derivatives even if they already exist',
+        )
+        parser.add_argument(
+            '--model',
+            action='append',
+            default=[],
+            help='Limit to app_label.Model (can be repeated)',
+        )
+
+    def handle(self, *args, **options):
+        checkpoint = Checkpoint(options['checkpoint'])
+        if options['restart']:
+            checkpoint.clear()
+
+        names = self._collect_names(options['model'])
+        pending = [name for name in names if name not in checkpoint]
+        self.stdout.write(
+            f'Found {len(names)} image files, {len(names) - len(pending)} already '
+            f'done in checkpoint, {len(pending)} to process with {options["workers"]} workers'
+        )
+        if not pending:
+            checkpoint.clear()
+            self._record_variants()
+            self.stdout.write(self.style.SUCCESS('✓ Nothing to do'))
+            return
+
+        # Forked workers must not share the parent's database connections
+        connections.close_all()
+
+        stats = {'processed': 0, 'generated': 0, 'skipped': 0, 'failed': 0, 'bytes_in': 0, 'bytes_out': 0}
+        started = time.monotonic()
+
+        try:
+            with ProcessPoolExecutor(max_workers=options['workers'], initializer=_init_worker) as pool:
+                futures = [pool.submit(_process, name, options['force']) for name in pending]
+                for future in as_completed(futures):
+                    result = future.result()
+                    stats['processed'] += 1
+                    if result.get('error'):
+                        stats['failed'] += 1
+                        self.stdout.write(self.style.ERROR(f"✗ {result['name']}: {result['error']}"))
+                        continue
+
+                    checkpoint.add(result['name'])
+                    if result['generated']:
+                        stats['generated'] += len(result['generated'])
+                    else:
+                        stats['skipped'] += 1
+                    stats['bytes_in'] += result['bytes_in']
+                    stats['bytes_out'] += result['bytes_out']
+
+                    if stats['processed'] % 50 == 0:
+                        self._report(stats, started, len(pending))
+        except KeyboardInterrupt:
+            checkpoint.flush()
+            self.stdout.write(self.style.WARNING('\n⚠ Interrupted - progress saved, rerun to resume'))
+            raise
+
+        checkpoint.flush()
+        self._report(stats, started, len(pending))
+
+        if stats['failed']:
+            self.stdout.write(self.style.WARNING(
+                f"⚠ {stats['failed']} files failed; rerun to retry them"
+            ))
+        else:
+            checkpoint.clear()
+            self.stdout.write(self.style.SUCCESS(
+                f"\n✓ Generated {stats['generated']} derivatives ({stats['skipped']} files already complete)"
+            ))
+            self._record_variants()
+
+    def _record_variants(self):
+        updated = record_all_variants()
+        if updated:
+            self.stdout.write(self.style.SUCCESS(f'✓ Recorded responsive variants on {updated} rows'))
+
+    def _collect_names(self, model_labels):
+        wanted = {label.lower() for label in model_labels}
+        names = []
+        seen = set()
+        for model, field in iter_file_fields():
+            if wanted and model._meta.label_lower not in wanted:
+                continue
+            for name in iter_stored_names(model, field):
+                if is_image_name(name) and name not in seen:
+                    seen.add(name)
+                    names.append(name)
+        return names
+
+    def _report(self, stats, started, total):
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.stdout.write(
+            f"[{stats['processed']}/{total}] "
+            f"{stats['processed'] / elapsed:.1f} files/s, "
+            f"{stats['bytes_in'] / elapsed / 1024 / 1024:.2f} MB/s read, "
+            f"{stats['bytes_out'] / 1024 / 1024:.2f} MB written, "
+            f"{elapsed:.1f}s elapsed"
+        )
@@ -0,0 +1,129 @@
+"""
+Management command to benchmark every public URL against a freshly seeded
+test database and compare the results with a stored baseline.
+
+    python manage.py benchmark_urls --save-baseline     # record a baseline
+    python manage.py benchmark_urls                     # fail on regressions
+
+Runs on whatever DATABASES points at (SQLite locally, or PostgreSQL via
+DATABASE_URL); a separate test database is created and destroyed.
+
+The baseline, benchmark_baseline.json at the project root, is committed so
+every checkout compares against it. Query counts and sizes hold anywhere;
+times are those of the machine that saved it, so save a new baseline (and
+commit it) when comparing on different hardware or after an intended change.
+"""
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from portfolio.benchmarking import DEFAULT_SCALE, compare, measure_routes, seed_data
+
+
+class Command(BaseCommand):
+    help = 'Measure query count, latency and response size for every public URL'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--baseline',
+            type=str,
+            default=str(settings.BASE_DIR / 'benchmark_baseline.json'),
+            help='Baseline JSON file (results are stored per database vendor)',
+        )
+        parser.add_argument(
+            '--save-baseline',
+            action='store_true',
+            help='Store this run as the new baseline instead of comparing',
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.25,
+            help='Allowed relative growth in time and size before failing (default 0.25)',
+        )
+        parser.add_argument(
+            '--min-delta-ms',
+            type=float,
+            default=10.0,
+            help='Ignore time increases smaller than this many milliseconds',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Measured requests per URL (median time is reported)',
+        )
+        parser.add_argument(
+            '--scale',
+            type=float,
+            default=1.0,
+            help='Multiplier for the seeded data volumes',
+        )
+        parser.add_argument(
+            '--keepdb',
+            action='store_true',
+            help='Reuse the test database between runs (skips seeding if data exists)',
+        )
+
+    def handle(self, *args, **options):
+        scale = {
+            key: value if key.endswith(('_per_post', '_per_repo')) else max(1, int(value * options['scale']))
+            for key, value in DEFAULT_SCALE.items()
+        }
+
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        try:
+            from blog.models import BlogPost
+            if not BlogPost.objects.exists():
+                self.stdout.write(f'Seeding benchmark data on {connection.vendor}...')
+                seed_data(scale)
+            # The manifest storage needs collectstatic output, which benchmarks don't depend on
+            with override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage'):
+                results = measure_routes(repeat=options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        self._print_results(results)
+
+        baseline_path = Path(options['baseline'])
+        baselines = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+
+        if options['save_baseline']:
+            baselines[connection.vendor] = results
+            baseline_path.write_text(json.dumps(baselines, indent=2, sort_keys=True))
+            self.stdout.write(self.style.SUCCESS(f'\n✓ Baseline for {connection.vendor} saved to {baseline_path}'))
+            return
+
+        baseline = baselines.get(connection.vendor)
+        if not baseline:
+            self.stdout.write(self.style.WARNING(
+                f'\n⚠ No {connection.vendor} baseline in {baseline_path}; run with --save-baseline first'
+            ))
+            return
+
+        regressions = compare(
+            results, baseline, threshold=options['threshold'], min_delta_ms=options['min_delta_ms']
+        )
+        if regressions:
+            for message in regressions:
+                self.stdout.write(self.style.ERROR(f'✗ {message}'))
+            raise CommandError(f'{len(regressions)} performance regressions against baseline')
+        self.stdout.write(self.style.SUCCESS('\n✓ No regressions against baseline'))
+
+    def _print_results(self, results):
+        self.stdout.write(f"\n{'Route':40} {'Status':>7} {'Queries':>8} {'Time ms':>9} {'Bytes':>9}")
+        for route, result in sorted(results.items()):
+            if result['status'] == 'skipped':
+                self.stdout.write(f"{route:40} {'skipped':>7}")
+                continue
+            self.stdout.write(
+                f"{route:40} {result['status']:>7} {result['queries']:>8} "
+                f"{result['time_ms']:>9} {result['bytes']:>9}"
+            )
@@ -0,0 +1,68 @@
+"""
+Management command to build the self-hosted front-end bundles (see
+portfolio.assets) into static/dist/, ready for collectstatic:
+
+    python manage.py build_assets --vendor   # download the pinned vendor files first
+    python manage.py build_assets            # bundle, purge, minify, extract critical CSS
+    python manage.py build_assets --bundle skills --no-purge
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio.assets import BUNDLES, build_bundles, build_critical_css, vendor_assets
+
+
+class Command(BaseCommand):
+    help = 'Vendor, bundle, purge and minify the front-end CSS and JavaScript'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--vendor',
+            action='store_true',
+            help='Download the pinned third-party files into static/vendor/ before building',
+        )
+        parser.add_argument(
+            '--bundle',
+            action='append',
+            choices=sorted(BUNDLES),
+            help='Only build this bundle (repeatable)',
+        )
+        parser.add_argument(
+            '--no-purge',
+            action='store_true',
+            help='Keep CSS rules for classes that appear nowhere in the site',
+        )
+        parser.add_argument(
+            '--no-critical',
+            action='store_true',
+            help='Skip extracting the first-screen CSS of the main pages (always skipped with --bundle)',
+        )
+
+    def handle(self, *args, **options):
+        if options['vendor']:
+            try:
+                paths = vendor_assets()
+            except Exception as exc:
+                raise CommandError(f'Vendoring failed: {type(exc).__name__}: {exc}')
+            self.stdout.write(self.style.SUCCESS(f'✓ Vendored {len(paths)} files into static/vendor/'))
+
+        try:
+            results = list(build_bundles(options['bundle'], purge=not options['no_purge']))
+        except FileNotFoundError as exc:
+            raise CommandError(str(exc))
+
+        for path, source_size, size in results:
+            self.stdout.write(self.style.SUCCESS(f'✓ {path}: {source_size / 1024:.1f} KB -> {size / 1024:.1f} KB'))
+
+        if not (options['bundle'] or options['no_critical']):
+            # Pages are rendered from the current database, like any request
+            try:
+                critical = list(build_critical_css())
+            except FileNotFoundError as exc:
+                raise CommandError(str(exc))
+            for view_name, path, size in critical:
+                if path is None:
+                    self.stdout.write(self.style.WARNING(f'⚠ {view_name}: page could not be rendered, no critical CSS'))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f'✓ {path}: {size / 1024:.1f} KB inlined for {view_name}'))
+
+        self.stdout.write('Run collectstatic to fingerprint and compress the bundles.')
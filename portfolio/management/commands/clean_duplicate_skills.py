@@ -1,31 +1,40 @@
-from django.core.management.base import BaseCommand
-from portfolio.models import Skill
+from django.core.management.base import BaseCommand, CommandError
+from portfolio.skill_import import KEEP_POLICIES, remove_duplicates
 
 
 class Command(BaseCommand):
-    help = 'Remove duplicate skills keeping the ones with specific subcategories'
+    help = 'Remove duplicate skills (same name ignoring case and spacing, same category)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep',
+            choices=sorted(KEEP_POLICIES),
+            default='specific',
+            help='Which duplicate to keep: specific (a real subcategory, then newest; default), '
+                 'latest, oldest or proficiency',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='List the duplicates without deleting anything',
+        )
 
     def handle(self, *args, **options):
-        # Find all skill names that have duplicates
-        from django.db.models import Count
-        
-        duplicates = Skill.objects.values('name').annotate(
-            count=Count('id')
-        ).filter(count__gt=1)
+        try:
+            resolutions = remove_duplicates(policy=options['keep'], dry_run=options['dry_run'])
+        except ValueError as e:
+            raise CommandError(str(e))
         
         cleaned = 0
-        for dup in duplicates:
-            name = dup['name']
-            skills = Skill.objects.filter(name=name).order_by('-id')
-            
-            # Keep the most recent one (highest ID), delete others with subcategory='OTHER'
-            latest = skills.first()
-            
-            if latest.subcategory != 'OTHER':
-                # Delete older ones with OTHER subcategory
-                deleted = Skill.objects.filter(name=name, subcategory='OTHER').delete()
-                if deleted[0] > 0:
-                    cleaned += deleted[0]
-                    self.stdout.write(self.style.SUCCESS(f'✓ Cleaned {name} - kept {latest.subcategory}'))
+        for kept, losers in resolutions:
+            cleaned += len(losers)
+            removed = ', '.join(f"{row['name']!r} ({row['subcategory']})" for row in losers)
+            self.stdout.write(self.style.SUCCESS(
+                f"✓ {kept['name']} [{kept['category']}] - kept {kept['subcategory']}, "
+                f"{'would remove' if options['dry_run'] else 'removed'} {removed}"
+            ))
         
-        self.stdout.write(self.style.SUCCESS(f'\n✓ Cleaned {cleaned} duplicate skills'))
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'\n⚠ Dry run: {cleaned} duplicate skills would be removed'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'\n✓ Cleaned {cleaned} duplicate skills'))
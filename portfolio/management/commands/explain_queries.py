@@ -0,0 +1,105 @@
+"""
+Management command to EXPLAIN the queries behind every public URL against a
+freshly seeded test database and flag full table scans.
+
+    python manage.py explain_queries                    # report scans
+    python manage.py explain_queries --route blog -v 2  # blog pages, with plans
+    python manage.py explain_queries --strict           # fail when scans are found
+
+Supports SQLite and PostgreSQL (via DATABASE_URL); a separate test database
+is created and destroyed.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from portfolio.benchmarking import DEFAULT_SCALE, seed_data
+from portfolio.query_plans import SUPPORTED_VENDORS, explain_routes
+
+
+class Command(BaseCommand):
+    help = 'Run EXPLAIN on the queries of every public URL and flag sequential scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--route',
+            action='append',
+            default=[],
+            help='Only check routes whose name contains this text (repeatable)',
+        )
+        parser.add_argument(
+            '--min-rows',
+            type=int,
+            default=100,
+            help='Ignore scans of tables with fewer rows than this (default 100)',
+        )
+        parser.add_argument(
+            '--scale',
+            type=float,
+            default=1.0,
+            help='Multiplier for the seeded data volumes',
+        )
+        parser.add_argument(
+            '--keepdb',
+            action='store_true',
+            help='Reuse the test database between runs (skips seeding if data exists)',
+        )
+        parser.add_argument(
+            '--strict',
+            action='store_true',
+            help='Exit with an error when any sequential scan is found',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor not in SUPPORTED_VENDORS:
+            raise CommandError(f'explain_queries supports {", ".join(SUPPORTED_VENDORS)}, not {connection.vendor}')
+
+        scale = {
+            key: value if key.endswith(('_per_post', '_per_repo')) else max(1, int(value * options['scale']))
+            for key, value in DEFAULT_SCALE.items()
+        }
+
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        try:
+            from blog.models import BlogPost
+            if not BlogPost.objects.exists():
+                self.stdout.write(f'Seeding data on {connection.vendor}...')
+                seed_data(scale)
+            # Planner statistics, so plans match a populated production database
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+            with override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage'):
+                results = explain_routes(min_rows=options['min_rows'], routes=options['route'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        flagged = 0
+        for route, result in sorted(results.items()):
+            if result['status'] == 'skipped':
+                self.stdout.write(f'{route}: skipped (no sample data)')
+                continue
+            findings = result['findings']
+            if not findings:
+                self.stdout.write(self.style.SUCCESS(
+                    f"✓ {route}: {result['queries']} queries, no sequential scans"
+                ))
+                continue
+            flagged += len(findings)
+            self.stdout.write(self.style.WARNING(
+                f"⚠ {route}: {len(findings)} sequential scans in {result['queries']} queries"
+            ))
+            for finding in findings:
+                self.stdout.write(f"    {finding['table']} ({finding['rows']} rows): {finding['sql'][:160]}")
+                if options['verbosity'] >= 2:
+                    for line in finding['plan']:
+                        self.stdout.write(f'        {line}')
+
+        if flagged and options['strict']:
+            raise CommandError(f'{flagged} sequential scans found')
+        if flagged:
+            self.stdout.write(self.style.WARNING(f'\n⚠ {flagged} sequential scans found'))
+        else:
+            self.stdout.write(self.style.SUCCESS('\n✓ No sequential scans found'))
@@ -0,0 +1,75 @@
+"""
+Management command to import skills from a `name|proficiency|icon|subcategory`
+file (bulk_skills.txt by default) or stdin.
+
+    python manage.py import_skills bulk_skills.txt --category HARD --dry-run
+    cat skills.txt | python manage.py import_skills - --category SOFT
+"""
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio.skill_import import import_skills
+
+
+class Command(BaseCommand):
+    help = 'Import skills from a name|proficiency|icon|subcategory file or stdin'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            nargs='?',
+            default=str(settings.BASE_DIR / 'bulk_skills.txt'),
+            help="File to read, or '-' for stdin (default: bulk_skills.txt)",
+        )
+        parser.add_argument(
+            '--category',
+            default='HARD',
+            help='Category: HARD, SOFT, or HOBBIES (default HARD)',
+        )
+        parser.add_argument(
+            '--skip-existing',
+            action='store_true',
+            help='Leave skills that already exist unchanged instead of updating them',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would change without writing anything',
+        )
+
+    def handle(self, *args, **options):
+        category = options['category'].upper()
+        if category not in ('HARD', 'SOFT', 'HOBBIES'):
+            raise CommandError('Category must be HARD, SOFT, or HOBBIES')
+
+        if options['path'] == '-':
+            lines = sys.stdin.read().splitlines()
+        else:
+            try:
+                with open(options['path'], encoding='utf-8') as f:
+                    lines = f.read().splitlines()
+            except OSError as e:
+                raise CommandError(f'Could not read {options["path"]}: {e}')
+
+        result = import_skills(
+            lines,
+            category,
+            update_existing=not options['skip_existing'],
+            dry_run=options['dry_run'],
+        )
+
+        for name in result.created:
+            self.stdout.write(self.style.SUCCESS(f'✓ {"Would add" if result.dry_run else "Added"}: {name}'))
+        for name in result.updated:
+            self.stdout.write(self.style.SUCCESS(f'✓ {"Would update" if result.dry_run else "Updated"}: {name}'))
+        for name in result.skipped:
+            self.stdout.write(self.style.WARNING(f'⚠ Already exists: {name}'))
+        for message in result.warnings:
+            self.stdout.write(self.style.WARNING(f'⚠ {message}'))
+        for message in result.errors:
+            self.stdout.write(self.style.ERROR(f'✗ {message}'))
+
+        style = self.style.WARNING if result.dry_run else self.style.SUCCESS
+        self.stdout.write(style(f'\n{"⚠ Dry run: " if result.dry_run else "✓ "}{result.summary()} ({category})'))
@@ -0,0 +1,39 @@
+"""
+Management command to (re)build the research search index, extracting
+text from uploaded PDFs. Useful after deploys or when background
+extraction was interrupted.
+"""
+from django.core.management.base import BaseCommand
+from portfolio.models import Research, ResearchIndexJob
+from portfolio.research_index import index_listing, index_pdf
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the research search index from listing fields and PDF text'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pending',
+            action='store_true',
+            help='Only process PDFs whose index job is pending, failed or missing',
+        )
+
+    def handle(self, *args, **options):
+        research_items = Research.objects.all()
+        if options['pending']:
+            research_items = research_items.exclude(index_job__status='DONE')
+        
+        for research in research_items:
+            index_listing(research)
+            index_pdf(research.pk)
+            job = ResearchIndexJob.objects.get(research=research)
+            if job.status == 'FAILED':
+                self.stdout.write(self.style.ERROR(f'✗ {research.title}: {job.error}'))
+            elif job.pdf_name:
+                self.stdout.write(self.style.SUCCESS(
+                    f'✓ {research.title}: {job.page_count} pages, {job.chunk_count} chunks'
+                ))
+            else:
+                self.stdout.write(f'- {research.title}: no PDF')
+        
+        self.stdout.write(self.style.SUCCESS('\n✓ Research index rebuilt'))
@@ -0,0 +1,188 @@
+"""
+Image Derivatives
+Generates resized WebP variants of uploaded images so templates can serve
+responsive images instead of the full-size originals.
+"""
+import os
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import models
+
+from .instrumentation import external_call
+
+
+DEFAULT_WIDTHS = (480, 960, 1600)
+DERIVATIVE_FORMAT = 'WEBP'
+DERIVATIVE_EXTENSION = 'webp'
+DERIVATIVE_QUALITY = 82
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.tif', '.tiff'}
+
+
+def get_widths():
+    """Return the configured derivative widths, smallest first"""
+    return tuple(sorted(getattr(settings, 'IMAGE_DERIVATIVE_WIDTHS', DEFAULT_WIDTHS)))
+
+
+def derivatives_root():
+    return getattr(settings, 'IMAGE_DERIVATIVE_ROOT', 'derivatives')
+
+
+def is_image_name(name):
+    return os.path.splitext(name or '')[1].lower() in IMAGE_EXTENSIONS
+
+
+def derivative_name(name, width):
+    """Storage name of the `width` pixel variant of the file `name`"""
+    base, _ = os.path.splitext(name)
+    return f"{derivatives_root()}/{base}/{width}w.{DERIVATIVE_EXTENSION}"
+
+
+def derivative_names(name):
+    return {width: derivative_name(name, width) for width in get_widths()}
+
+
+def iter_file_fields():
+    """Yield (model, field) for every concrete FileField/ImageField in installed apps"""
+    for model in apps.get_models():
+        if model._meta.abstract or model._meta.proxy:
+            continue
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField):
+                yield model, field
+
+
+def iter_stored_names(model, field):
+    """Stream the distinct non-empty file names stored in one field"""
+    queryset = (
+        model._default_manager
+        .exclude(**{f'{field.name}__isnull': True})
+        .exclude(**{field.name: ''})
+        .order_by()
+        .values_list(field.name, flat=True)
+        .distinct()
+    )
+    yield from queryset.iterator(chunk_size=500)
+
+
+def missing_derivatives(name, storage=None):
+    """Return {width: derivative_name} for variants not yet present in storage"""
+    storage = storage or default_storage
+    return {
+        width: target for width, target in derivative_names(name).items()
+        if not storage.exists(target)
+    }
+
+
+def generate_derivatives(name, storage=None, force=False):
+    """
+    Create the missing derivatives of one stored image.
+
+    The original is opened as a file object and handed to Pillow, which
+    reads it incrementally; JPEG sources are additionally decoded at reduced
+    scale via `draft()`, so large originals are never fully buffered.
+    Returns a dict with the generated names and bytes read/written.
+    """
+    from PIL import Image, ImageOps
+
+    storage = storage or default_storage
+    result = {'name': name, 'generated': [], 'bytes_in': 0, 'bytes_out': 0}
+
+    if not is_image_name(name):
+        return result
+
+    targets = derivative_names(name) if force else missing_derivatives(name, storage)
+    if not targets:
+        return result
+
+    try:
+        result['bytes_in'] = storage.size(name)
+    except (NotImplementedError, OSError):
+        pass
+
+    # Storage files open lazily; the span covers reading the bytes
+    with external_call('storage', 'read', name=name) as call:
+        with storage.open(name, 'rb') as f:
+            source = BytesIO(f.read())
+        call.bytes_received = source.getbuffer().nbytes
+    with source:
+        with Image.open(source) as image:
+            largest = max(targets)
+            if image.format == 'JPEG':
+                image.draft('RGB', (largest, largest))
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+
+            # Largest first so each smaller variant is resized from the previous one
+            for width in sorted(targets, reverse=True):
+                if image.width > width:
+                    height = max(1, round(image.height * width / image.width))
+                    image = image.resize((width, height), Image.LANCZOS)
+                buffer = BytesIO()
+                image.save(buffer, DERIVATIVE_FORMAT, quality=DERIVATIVE_QUALITY, method=4)
+                target = targets[width]
+                if storage.exists(target):
+                    storage.delete(target)
+                with external_call('storage', 'save', name=target) as call:
+                    call.bytes_sent = buffer.tell()
+                    storage.save(target, ContentFile(buffer.getvalue()))
+                result['generated'].append(target)
+                result['bytes_out'] += buffer.tell()
+
+    return result
+
+
+def existing_variants(name, storage=None):
+    """Return [[width, derivative_name]] for the variants of `name` present in storage"""
+    storage = storage or default_storage
+    return [[width, target] for width, target in derivative_names(name).items() if storage.exists(target)]
+
+
+def srcset(variants, storage=None):
+    """Build an <img srcset> value from [[width, derivative_name]] pairs"""
+    storage = storage or default_storage
+    return ', '.join(f'{storage.url(target)} {width}w' for width, target in variants)
+
+
+def refresh_variants(model_label, pk, field_name, variants_field):
+    """
+    Generate the derivatives of one stored image and record which exist on
+    the row as {'source': name, 'widths': [[width, derivative_name]]}, so
+    templates can emit a srcset without touching storage (runs in the
+    background).
+    """
+    model = apps.get_model(model_label)
+    name = model._default_manager.filter(pk=pk).values_list(field_name, flat=True).first()
+    if not name or not is_image_name(name):
+        return
+    generate_derivatives(name)
+    # Only record the result if the image wasn't replaced in the meantime
+    model._default_manager.filter(pk=pk, **{field_name: name}).update(
+        **{variants_field: {'source': name, 'widths': existing_variants(name)}}
+    )
+
+
+def record_all_variants():
+    """
+    Fill the `<field>_variants` column of every model that has one (e.g.
+    TimelineEntry.image_variants) for rows whose image changed since it was
+    last recorded. Returns the number of rows updated.
+    """
+    updated = 0
+    for model, field in iter_file_fields():
+        variants_field = f'{field.name}_variants'
+        if variants_field not in {f.name for f in model._meta.concrete_fields}:
+            continue
+        rows = model._default_manager.exclude(**{field.name: ''}).exclude(**{f'{field.name}__isnull': True})
+        for pk, name, variants in rows.values_list('pk', field.name, variants_field).iterator():
+            if not is_image_name(name) or (variants or {}).get('source') == name:
+                continue
+            model._default_manager.filter(pk=pk).update(
+                **{variants_field: {'source': name, 'widths': existing_variants(name)}}
+            )
+            updated += 1
+    return updated
@@ -0,0 +1,127 @@
+"""
+Performance Metrics
+In-process metrics store with rolling percentiles. Each metric keeps the
+most recent samples in a fixed-size ring buffer, so memory stays bounded
+no matter how long the process runs. Values are per process (per
+gunicorn worker), which is enough to spot slow views without an APM.
+"""
+import contextvars
+import math
+import threading
+import time
+from collections import defaultdict, deque
+
+from django.conf import settings
+
+DEFAULT_SAMPLE_SIZE = 1000
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    # The ceil(pct% of n)-th value; round() would round half to even
+    rank = max(math.ceil(pct * len(sorted_values) / 100) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class MetricSeries:
+    """Counters plus a ring buffer of recent samples for each numeric field"""
+
+    def __init__(self, sample_size):
+        self.sample_size = sample_size
+        self.count = 0
+        self.errors = 0
+        self.last_seen = None
+        self.samples = defaultdict(lambda: deque(maxlen=self.sample_size))
+        self.totals = defaultdict(float)
+        self.observations = defaultdict(int)
+
+    def add(self, values, error=False):
+        self.count += 1
+        self.errors += int(bool(error))
+        self.last_seen = time.time()
+        for field, value in values.items():
+            if value is None:
+                continue
+            self.samples[field].append(value)
+            self.totals[field] += value
+            self.observations[field] += 1
+
+    def summary(self):
+        fields = {}
+        for field, samples in self.samples.items():
+            ordered = sorted(samples)
+            fields[field] = {
+                'avg': round(self.totals[field] / self.observations[field], 2),
+                **{f'p{pct}': round(percentile(ordered, pct), 2) for pct in PERCENTILES},
+            }
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'last_seen': self.last_seen,
+            'fields': fields,
+        }
+
+
+class MetricsStore:
+    """Thread-safe map of (group, name) to MetricSeries"""
+
+    def __init__(self, sample_size=None):
+        self._sample_size = sample_size
+        self._series = {}
+        self._lock = threading.Lock()
+
+    @property
+    def sample_size(self):
+        return self._sample_size or getattr(settings, 'METRICS_SAMPLE_SIZE', DEFAULT_SAMPLE_SIZE)
+
+    def record(self, group, name, values, error=False):
+        with self._lock:
+            series = self._series.get((group, name))
+            if series is None:
+                series = self._series[(group, name)] = MetricSeries(self.sample_size)
+            series.add(values, error=error)
+
+    def snapshot(self, group=None):
+        """Return {group: {name: summary}} computed from the current samples"""
+        with self._lock:
+            items = list(self._series.items())
+            result = defaultdict(dict)
+            for (series_group, name), series in items:
+                if group is None or series_group == group:
+                    result[series_group][name] = series.summary()
+        return dict(result)
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+metrics = MetricsStore()
+
+
+class RequestCollector:
+    """Per-request accumulators filled in by the database, template, cache and external call hooks"""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.in_cache_call = False
+        self.external_calls = 0
+        self.external_ms = 0.0
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_ms += (time.perf_counter() - started) * 1000
+
+
+current_collector = contextvars.ContextVar('current_collector', default=None)
@@ -0,0 +1,47 @@
+"""
+Request instrumentation middleware: records query count, DB time, template
+render time, cache hits, time spent in external calls and total latency per
+URL name into the metrics store shown on the staff metrics dashboard.
+Template and cache figures come from the metered backends configured in
+TEMPLATES and CACHES (portfolio.backends).
+"""
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+
+from .metrics import RequestCollector, current_collector, metrics
+
+
+class RequestMetricsMiddleware:
+    """Record per-request performance metrics keyed by URL name"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        collector = RequestCollector()
+        token = current_collector.set(collector)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(collector.db_wrapper))
+                response = self.get_response(request)
+        finally:
+            current_collector.reset(token)
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        match = getattr(request, 'resolver_match', None)
+        name = match.view_name if match else 'unresolved'
+        metrics.record('requests', name, {
+            'latency_ms': latency_ms,
+            'queries': collector.queries,
+            'db_ms': collector.db_ms,
+            'template_ms': collector.template_ms,
+            'cache_hits': collector.cache_hits,
+            'cache_misses': collector.cache_misses,
+            'external_calls': collector.external_calls,
+            'external_ms': collector.external_ms,
+        }, error=response.status_code >= 500)
+        return response
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0018_industryindexsettings_industryranking"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FileDownload",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "key",
+                    models.CharField(
+                        help_text="Identifier of the downloadable (e.g., 'cv', 'research:12')",
+                        max_length=100,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "file_name",
+                    models.CharField(
+                        blank=True,
+                        help_text="Storage name of the last file served",
+                        max_length=300,
+                    ),
+                ),
+                ("download_count", models.PositiveIntegerField(default=0)),
+                ("last_downloaded_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "File Download",
+                "verbose_name_plural": "File Downloads",
+                "ordering": ["-download_count"],
+            },
+        ),
+    ]
@@ -0,0 +1,182 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:17
+
+from collections import Counter
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def index_existing_listings(apps, schema_editor):
+    """Index the listing fields of research added before the search index existed"""
+    from portfolio.research_index import tokenize
+
+    Research = apps.get_model("portfolio", "Research")
+    ResearchTextChunk = apps.get_model("portfolio", "ResearchTextChunk")
+    ResearchSearchTerm = apps.get_model("portfolio", "ResearchSearchTerm")
+    for research in Research.objects.all():
+        parts = [
+            research.title,
+            research.authors,
+            research.publication_venue,
+            research.tags,
+            research.abstract,
+        ]
+        text = "\n".join(part for part in parts if part)
+        chunk = ResearchTextChunk.objects.create(
+            research=research, source="LISTING", position=0, text=text
+        )
+        ResearchSearchTerm.objects.bulk_create(
+            [
+                ResearchSearchTerm(
+                    term=term, chunk=chunk, research=research, frequency=frequency
+                )
+                for term, frequency in Counter(tokenize(text)).items()
+            ]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0019_filedownload"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ResearchTextChunk",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        choices=[("LISTING", "Listing"), ("PDF", "PDF Text")],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "position",
+                    models.IntegerField(
+                        default=0, help_text="Order of the chunk within its source"
+                    ),
+                ),
+                (
+                    "page",
+                    models.IntegerField(
+                        blank=True, help_text="PDF page the chunk starts on", null=True
+                    ),
+                ),
+                ("text", models.TextField()),
+                (
+                    "research",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="text_chunks",
+                        to="portfolio.research",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["research", "source", "position"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ResearchIndexJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "Pending"),
+                            ("RUNNING", "Running"),
+                            ("DONE", "Done"),
+                            ("FAILED", "Failed"),
+                        ],
+                        default="PENDING",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "pdf_name",
+                    models.CharField(
+                        blank=True,
+                        help_text="Storage name of the PDF that was indexed",
+                        max_length=300,
+                    ),
+                ),
+                ("page_count", models.IntegerField(default=0)),
+                ("chunk_count", models.IntegerField(default=0)),
+                ("error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "research",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="index_job",
+                        to="portfolio.research",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Research Index Job",
+                "verbose_name_plural": "Research Index Jobs",
+            },
+        ),
+        migrations.CreateModel(
+            name="ResearchSearchTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=64)),
+                ("frequency", models.IntegerField(default=1)),
+                (
+                    "chunk",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="terms",
+                        to="portfolio.researchtextchunk",
+                    ),
+                ),
+                (
+                    "research",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_terms",
+                        to="portfolio.research",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["term", "research"], name="portfolio_term_research_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(index_existing_listings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,144 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:18
+
+from django.db import migrations, models
+from django.utils.text import slugify
+import django.db.models.deletion
+import taggit.managers
+
+
+def backfill_research_tags(apps, schema_editor):
+    """Turn the old comma-separated tag strings into ResearchTag rows"""
+    Research = apps.get_model("portfolio", "Research")
+    ResearchTag = apps.get_model("portfolio", "ResearchTag")
+    TaggedResearch = apps.get_model("portfolio", "TaggedResearch")
+
+    tags_by_name = {}
+    used_slugs = set()
+    links = []
+    for research in Research.objects.exclude(legacy_tags="").only("pk", "legacy_tags"):
+        seen = set()
+        for name in research.legacy_tags.split(","):
+            name = name.strip()[:100]
+            if not name or name.lower() in seen:
+                continue
+            seen.add(name.lower())
+            tag = tags_by_name.get(name.lower())
+            if tag is None:
+                base_slug = slugify(name, allow_unicode=True)[:90] or "tag"
+                slug, suffix = base_slug, 1
+                while slug in used_slugs:
+                    suffix += 1
+                    slug = f"{base_slug}_{suffix}"
+                used_slugs.add(slug)
+                tag = ResearchTag.objects.create(name=name, slug=slug)
+                tags_by_name[name.lower()] = tag
+            links.append(TaggedResearch(content_object_id=research.pk, tag=tag))
+    TaggedResearch.objects.bulk_create(links)
+
+
+def restore_legacy_tags(apps, schema_editor):
+    Research = apps.get_model("portfolio", "Research")
+    TaggedResearch = apps.get_model("portfolio", "TaggedResearch")
+
+    names = {}
+    for research_id, name in TaggedResearch.objects.values_list(
+        "content_object_id", "tag__name"
+    ).order_by("id"):
+        names.setdefault(research_id, []).append(name)
+    for research_id, tag_names in names.items():
+        Research.objects.filter(pk=research_id).update(
+            legacy_tags=", ".join(tag_names)[:300]
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("portfolio", "0020_researchtextchunk_researchindexjob_and_more"),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name="research",
+            old_name="tags",
+            new_name="legacy_tags",
+        ),
+        migrations.CreateModel(
+            name="ResearchTag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(max_length=100, unique=True, verbose_name="name"),
+                ),
+                (
+                    "slug",
+                    models.SlugField(
+                        allow_unicode=True,
+                        max_length=100,
+                        unique=True,
+                        verbose_name="slug",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Research Tag",
+                "verbose_name_plural": "Research Tags",
+            },
+        ),
+        migrations.CreateModel(
+            name="TaggedResearch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "content_object",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="portfolio.research",
+                    ),
+                ),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tagged_research",
+                        to="portfolio.researchtag",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("content_object", "tag")},
+            },
+        ),
+        migrations.AddField(
+            model_name="research",
+            name="tags",
+            field=taggit.managers.TaggableManager(
+                blank=True,
+                help_text="Comma-separated tags",
+                through="portfolio.TaggedResearch",
+                to="portfolio.ResearchTag",
+                verbose_name="Tags",
+            ),
+        ),
+        migrations.RunPython(backfill_research_tags, restore_legacy_tags),
+        migrations.RemoveField(
+            model_name="research",
+            name="legacy_tags",
+        ),
+    ]
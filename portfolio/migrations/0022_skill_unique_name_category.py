@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:32
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+def remove_duplicate_skills(apps, schema_editor):
+    """Collapse whitespace in names and keep one skill per name/category before the constraint"""
+    Skill = apps.get_model("portfolio", "Skill")
+    groups = {}
+    for skill in Skill.objects.order_by("pk"):
+        name = " ".join(skill.name.split())
+        if name != skill.name:
+            Skill.objects.filter(pk=skill.pk).update(name=name)
+        groups.setdefault((name.casefold(), skill.category), []).append(skill)
+
+    loser_ids = []
+    for skills in groups.values():
+        # Same policy as clean_duplicate_skills' default: real subcategory first, then newest
+        ordered = sorted(
+            skills, key=lambda s: (s.subcategory != "OTHER", s.pk), reverse=True
+        )
+        loser_ids.extend(skill.pk for skill in ordered[1:])
+    if loser_ids:
+        Skill.objects.filter(pk__in=loser_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0021_researchtag_taggedresearch"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_skills, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="skill",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower(
+                    django.db.models.functions.text.Trim("name")
+                ),
+                models.F("category"),
+                name="portfolio_skill_unique_name_category",
+                violation_error_message="A skill with this name already exists in this category.",
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:34
+
+from django.db import migrations, models
+
+from portfolio.sanitize import sanitize_html
+
+
+def sanitize_existing_content(apps, schema_editor):
+    TimelineEntry = apps.get_model("portfolio", "TimelineEntry")
+    for entry in TimelineEntry.objects.only("pk", "content"):
+        TimelineEntry.objects.filter(pk=entry.pk).update(
+            content_html=sanitize_html(entry.content)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0022_skill_unique_name_category"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="timelineentry",
+            name="content_html",
+            field=models.TextField(
+                blank=True,
+                editable=False,
+                help_text="Sanitized copy of content, rendered on the About page",
+            ),
+        ),
+        migrations.AddField(
+            model_name="timelineentry",
+            name="image_variants",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Resized image variants: {'source': name, 'widths': [[width, name]]}",
+            ),
+        ),
+        migrations.RunPython(sanitize_existing_content, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0023_timelineentry_content_html"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="industryranking",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["rank"],
+                name="portfolio_ranking_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="research",
+            index=models.Index(
+                fields=["-publication_date", "order"],
+                name="portfolio_research_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="research",
+            index=models.Index(
+                condition=models.Q(("featured", True)),
+                fields=["-publication_date", "order"],
+                name="portfolio_research_feat_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="skill",
+            index=models.Index(
+                fields=["category", "order"], name="portfolio_skill_category_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="skill",
+            index=models.Index(
+                fields=["subcategory"], name="portfolio_skill_subcat_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="timelineentry",
+            index=models.Index(
+                fields=["period", "year", "order"], name="portfolio_timeline_period_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="timelineentry",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["year", "order"],
+                name="portfolio_timeline_active_idx",
+            ),
+        ),
+    ]
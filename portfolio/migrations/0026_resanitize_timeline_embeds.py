@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:40
+
+from django.db import migrations
+
+from portfolio.sanitize import sanitize_html
+
+
+def resanitize_content(apps, schema_editor):
+    # Video iframes removed by the earlier sanitizer are restored from content
+    TimelineEntry = apps.get_model("portfolio", "TimelineEntry")
+    for entry in TimelineEntry.objects.only("pk", "content"):
+        TimelineEntry.objects.filter(pk=entry.pk).update(
+            content_html=sanitize_html(entry.content)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0025_skill_updated_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(resanitize_content, migrations.RunPython.noop),
+    ]
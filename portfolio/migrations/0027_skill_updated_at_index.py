@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0026_resanitize_timeline_embeds"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="skill",
+            index=models.Index(
+                fields=["updated_at"], name="portfolio_skill_updated_idx"
+            ),
+        ),
+    ]
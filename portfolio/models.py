@@ -1,8 +1,13 @@
 from django.db import models
+from django.db.models.functions import Lower, Trim
 from django.core.validators import URLValidator
 from tinymce.models import HTMLField
+from taggit.managers import TaggableManager
+from taggit.models import TagBase, TaggedItemBase
 
-class HomePage(models.Model):
+from .singletons import SingletonModel
+
+class HomePage(SingletonModel):
     """Editable homepage content"""
     # Hero Section
     hero_title = models.CharField(max_length=200, default="Your Name", help_text="Your full name")
@@ -45,12 +50,6 @@ class HomePage(models.Model):
     
     def __str__(self):
         return "Homepage Content"
-    
-    def save(self, *args, **kwargs):
-        # Ensure only one instance exists
-        if not self.pk and HomePage.objects.exists():
-            raise ValueError('Only one HomePage instance is allowed')
-        return super().save(*args, **kwargs)
 
 class Profile(models.Model):
     """Main profile information"""
@@ -114,6 +113,22 @@ class Education(models.Model):
     def __str__(self):
         return f"{self.degree} in {self.field_of_study} - {self.institution}"
 
+class ResearchTag(TagBase):
+    """Tags for research items, kept separate from blog tags"""
+    
+    class Meta:
+        verbose_name = "Research Tag"
+        verbose_name_plural = "Research Tags"
+
+
+class TaggedResearch(TaggedItemBase):
+    content_object = models.ForeignKey('Research', on_delete=models.CASCADE)
+    tag = models.ForeignKey(ResearchTag, on_delete=models.CASCADE, related_name='tagged_research')
+    
+    class Meta:
+        unique_together = [('content_object', 'tag')]
+
+
 class Research(models.Model):
     """Research projects and publications"""
     RESEARCH_TYPE_CHOICES = [
@@ -136,7 +151,7 @@ class Research(models.Model):
     url = models.URLField(blank=True, help_text="Link to paper/project")
     pdf_file = models.FileField(upload_to='research/pdfs/', blank=True, null=True)
     thumbnail = models.ImageField(upload_to='research/thumbnails/', blank=True, null=True)
-    tags = models.CharField(max_length=300, blank=True, help_text="Comma-separated tags")
+    tags = TaggableManager(through=TaggedResearch, blank=True, help_text="Comma-separated tags")
     featured = models.BooleanField(default=False)
     order = models.IntegerField(default=0)
     
@@ -144,6 +159,15 @@ class Research(models.Model):
         ordering = ['-publication_date', 'order']
         verbose_name = "Research"
         verbose_name_plural = "Research"
+        indexes = [
+            models.Index(fields=['-publication_date', 'order'], name='portfolio_research_date_idx'),
+            # Homepage and research page "featured" strips
+            models.Index(
+                fields=['-publication_date', 'order'],
+                condition=models.Q(featured=True),
+                name='portfolio_research_feat_idx',
+            ),
+        ]
     
     def __str__(self):
         return self.title
@@ -177,12 +201,33 @@ class Skill(models.Model):
     proficiency = models.IntegerField(default=50, help_text="Proficiency level (0-100)")
     icon = models.CharField(max_length=100, blank=True, help_text="Font Awesome icon class")
     order = models.IntegerField(default=0)
+    # With the row count, versions the skills data payload (skills_catalog)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['category', 'order']
+        indexes = [
+            models.Index(fields=['category', 'order'], name='portfolio_skill_category_idx'),
+            models.Index(fields=['subcategory'], name='portfolio_skill_subcat_idx'),
+            # Latest change, for the skills data version
+            models.Index(fields=['updated_at'], name='portfolio_skill_updated_idx'),
+        ]
+        constraints = [
+            # Same canonical key as the import and dedup tools: name ignoring case and spacing, per category
+            models.UniqueConstraint(
+                Lower(Trim('name')), 'category',
+                name='portfolio_skill_unique_name_category',
+                violation_error_message='A skill with this name already exists in this category.',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.get_category_display()})"
+    
+    def save(self, *args, **kwargs):
+        # Collapse inner whitespace so "Power  BI" and "Power BI" share a key
+        self.name = ' '.join(self.name.split())
+        super().save(*args, **kwargs)
 
 class Experience(models.Model):
     """Work experience"""
@@ -207,7 +252,7 @@ class Experience(models.Model):
         return self.end_date is None
 
 
-class ResearchPageSettings(models.Model):
+class ResearchPageSettings(SingletonModel):
     """Settings for the Research page"""
     page_title = models.CharField(max_length=200, default="Research & Publications", help_text="Main title for the research page")
     page_description = HTMLField(default="Explore my research contributions, publications, and academic work.", help_text="Description/bio that appears below the title - supports rich text formatting")
@@ -222,15 +267,9 @@ class ResearchPageSettings(models.Model):
     
     def __str__(self):
         return "Research Page Settings"
-    
-    def save(self, *args, **kwargs):
-        # Ensure only one instance exists
-        if not self.pk and ResearchPageSettings.objects.exists():
-            raise ValueError('Only one ResearchPageSettings instance is allowed')
-        return super().save(*args, **kwargs)
 
 
-class AboutPageSettings(models.Model):
+class AboutPageSettings(SingletonModel):
     """Settings for the About Me page"""
     intro_bio = HTMLField(blank=True, help_text="Introduction bio that appears at the top of the About page, before the timeline - supports rich text formatting")
     
@@ -256,12 +295,6 @@ class AboutPageSettings(models.Model):
     
     def __str__(self):
         return "About Page Settings"
-    
-    def save(self, *args, **kwargs):
-        # Ensure only one instance exists
-        if not self.pk and AboutPageSettings.objects.exists():
-            raise ValueError('Only one AboutPageSettings instance is allowed')
-        return super().save(*args, **kwargs)
 
 
 class TimelineEntry(models.Model):
@@ -280,6 +313,10 @@ class TimelineEntry(models.Model):
     order = models.IntegerField(default=0, help_text="Order within the period (lower numbers first)")
     is_active = models.BooleanField(default=True, help_text="Show/hide this entry")
     
+    # Derived on save: sanitized content and the responsive variants of the image
+    content_html = models.TextField(blank=True, editable=False, help_text="Sanitized copy of content, rendered on the About page")
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized image variants: {'source': name, 'widths': [[width, name]]}")
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -287,6 +324,15 @@ class TimelineEntry(models.Model):
         ordering = ['period', 'year', 'order']
         verbose_name = "About Me - Timeline Entry"
         verbose_name_plural = "About Me"
+        indexes = [
+            models.Index(fields=['period', 'year', 'order'], name='portfolio_timeline_period_idx'),
+            # The About page reads only active entries, ordered by year
+            models.Index(
+                fields=['year', 'order'],
+                condition=models.Q(is_active=True),
+                name='portfolio_timeline_active_idx',
+            ),
+        ]
     
     def __str__(self):
         if self.title and self.year:
@@ -306,9 +352,32 @@ class TimelineEntry(models.Model):
             'FUTURE': 'fas fa-rocket'
         }
         return icons.get(self.period, 'fas fa-circle')
+    
+    def save(self, *args, **kwargs):
+        from .sanitize import sanitize_html
+        
+        self.content_html = sanitize_html(self.content)
+        super().save(*args, **kwargs)
+        
+        # The file name is final only after saving; variants are built off the request path
+        image_name = self.image.name if self.image else ''
+        if image_name != self.image_variants.get('source', ''):
+            from .background import enqueue
+            from .media_derivatives import refresh_variants
+            
+            self.image_variants = {}
+            TimelineEntry.objects.filter(pk=self.pk).update(image_variants={})
+            if image_name:
+                enqueue(refresh_variants, 'portfolio.TimelineEntry', self.pk, 'image', 'image_variants')
+    
+    @property
+    def image_srcset(self):
+        from .media_derivatives import srcset
+        
+        return srcset(self.image_variants.get('widths', []))
 
 
-class IndustryIndexSettings(models.Model):
+class IndustryIndexSettings(SingletonModel):
     """Settings for the Industry Index page"""
     page_description = HTMLField(
         default="This ranking is generated by AI analyzing my skills, research interests, blog posts, education, and professional activities. The index updates regularly to reflect my evolving expertise and interests.",
@@ -335,11 +404,6 @@ class IndustryIndexSettings(models.Model):
     
     def __str__(self):
         return "Industry Index Settings"
-    
-    def save(self, *args, **kwargs):
-        if not self.pk and IndustryIndexSettings.objects.exists():
-            raise ValueError('Only one IndustryIndexSettings instance is allowed')
-        return super().save(*args, **kwargs)
 
 
 class IndustryRanking(models.Model):
@@ -360,6 +424,88 @@ class IndustryRanking(models.Model):
         ordering = ['rank']
         verbose_name = "Industry Ranking"
         verbose_name_plural = "Industry Rankings"
+        indexes = [
+            models.Index(fields=['rank'], condition=models.Q(is_active=True), name='portfolio_ranking_active_idx'),
+        ]
     
     def __str__(self):
         return f"#{self.rank} - {self.industry_name} ({self.relevance_score}%)"
+
+
+class FileDownload(models.Model):
+    """Download counters for files served through the download views"""
+    key = models.CharField(max_length=100, unique=True, help_text="Identifier of the downloadable (e.g., 'cv', 'research:12')")
+    file_name = models.CharField(max_length=300, blank=True, help_text="Storage name of the last file served")
+    download_count = models.PositiveIntegerField(default=0)
+    last_downloaded_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-download_count']
+        verbose_name = "File Download"
+        verbose_name_plural = "File Downloads"
+    
+    def __str__(self):
+        return f"{self.key} ({self.download_count} downloads)"
+
+
+class ResearchIndexJob(models.Model):
+    """Tracks background text extraction of a research item's PDF"""
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+    
+    research = models.OneToOneField(Research, on_delete=models.CASCADE, related_name='index_job')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    pdf_name = models.CharField(max_length=300, blank=True, help_text="Storage name of the PDF that was indexed")
+    page_count = models.IntegerField(default=0)
+    chunk_count = models.IntegerField(default=0)
+    error = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Research Index Job"
+        verbose_name_plural = "Research Index Jobs"
+    
+    def __str__(self):
+        return f"{self.research} - {self.get_status_display()}"
+
+
+class ResearchTextChunk(models.Model):
+    """Searchable text of a research item: its listing fields or a slice of its PDF"""
+    SOURCE_CHOICES = [
+        ('LISTING', 'Listing'),
+        ('PDF', 'PDF Text'),
+    ]
+    
+    research = models.ForeignKey(Research, on_delete=models.CASCADE, related_name='text_chunks')
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES)
+    position = models.IntegerField(default=0, help_text="Order of the chunk within its source")
+    page = models.IntegerField(null=True, blank=True, help_text="PDF page the chunk starts on")
+    text = models.TextField()
+    
+    class Meta:
+        ordering = ['research', 'source', 'position']
+    
+    def __str__(self):
+        return f"{self.research} - {self.source} #{self.position}"
+
+
+class ResearchSearchTerm(models.Model):
+    """Inverted index entry: how often a normalized term occurs in a chunk"""
+    term = models.CharField(max_length=64)
+    chunk = models.ForeignKey(ResearchTextChunk, on_delete=models.CASCADE, related_name='terms')
+    research = models.ForeignKey(Research, on_delete=models.CASCADE, related_name='search_terms')
+    frequency = models.IntegerField(default=1)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['term', 'research'], name='portfolio_term_research_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.term} x{self.frequency}"
@@ -0,0 +1,214 @@
+"""
+Keyset Pagination
+Pages through a queryset by the values of its ordering columns instead of
+LIMIT/OFFSET: the next page is "rows that sort after the last row shown",
+which an index on the ordering answers at the same cost for page 1 and
+page 1000, and which does not shift when rows are added in between.
+
+Cursors are signed, opaque tokens carrying the direction and the boundary
+row's values. The primary key is always appended as a tie-breaker, and
+ordering fields must be non-null local fields of the model.
+
+    class ArchiveView(KeysetPaginationMixin, ListView):
+        paginate_by = 9
+        keyset_ordering = ('-published_at', '-id')
+
+Views offering several sort orders list them in `keyset_orderings`
+({?sort= value: ordering}). The total row count (`paginator.count`) is a
+separate COUNT query, shown only by views that set `paginate_with_count`.
+"""
+from collections.abc import Sequence
+from datetime import date, datetime
+
+from django.core import signing
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import SimpleLazyObject, cached_property
+
+FORWARD = 'n'
+BACKWARD = 'p'
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class KeysetPaginator:
+    """Splits `queryset` into pages of `per_page` rows ordered by `ordering`"""
+
+    def __init__(self, queryset, ordering, per_page):
+        self.queryset = queryset
+        self.per_page = per_page
+        meta = queryset.model._meta
+        ordering = list(ordering)
+        if not any(name.lstrip('-') in ('pk', 'id', meta.pk.name) for name in ordering):
+            ordering.append(f'-{meta.pk.name}' if ordering and ordering[-1].startswith('-') else meta.pk.name)
+        # [(field, descending)]
+        self.ordering = [
+            (meta.pk if name.lstrip('-') == 'pk' else meta.get_field(name.lstrip('-')), name.startswith('-'))
+            for name in ordering
+        ]
+        self.salt = f'keyset:{meta.label_lower}:{",".join(ordering)}'
+
+    @cached_property
+    def count(self):
+        return self.queryset.count()
+
+    def encode(self, direction, row):
+        values = []
+        for field, descending in self.ordering:
+            value = getattr(row, field.attname)
+            values.append(value.isoformat() if isinstance(value, (date, datetime)) else value)
+        return signing.dumps([direction, values], salt=self.salt, compress=True)
+
+    def decode(self, cursor):
+        try:
+            direction, values = signing.loads(cursor, salt=self.salt)
+            if direction not in (FORWARD, BACKWARD) or len(values) != len(self.ordering):
+                raise ValueError(direction)
+            return direction, [field.to_python(value) for (field, descending), value in zip(self.ordering, values)]
+        except (signing.BadSignature, ValueError, TypeError) as exc:
+            raise InvalidCursor(cursor) from exc
+
+    def page(self, cursor=None):
+        """Return the (lazily fetched) page for `cursor`; None means the first page"""
+        if cursor:
+            direction, values = self.decode(cursor)
+        else:
+            direction, values = FORWARD, None
+        return KeysetPage(self, direction, values)
+
+    def _boundary_filter(self, values, backward):
+        """Q matching rows strictly after `values` in the (possibly reversed) ordering"""
+        # (a < x) OR (a = x AND b < y) OR (a = x AND b = y AND pk < z) ...
+        condition = None
+        equal = Q()
+        for (field, descending), value in zip(self.ordering, values):
+            after = 'lt' if descending != backward else 'gt'
+            clause = equal & Q(**{f'{field.attname}__{after}': value})
+            condition = clause if condition is None else condition | clause
+            equal &= Q(**{field.attname: value})
+        return condition
+
+    def fetch(self, direction, values):
+        """Return (rows, more rows beyond them in that direction)"""
+        backward = direction == BACKWARD
+        queryset = self.queryset.order_by(*(
+            f'-{field.attname}' if descending != backward else field.attname
+            for field, descending in self.ordering
+        ))
+        if values is not None:
+            queryset = queryset.filter(self._boundary_filter(values, backward))
+        rows = list(queryset[:self.per_page + 1])
+        more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backward:
+            rows.reverse()
+        return rows, more
+
+
+class KeysetPage(Sequence):
+    """
+    One page of rows. Nothing is queried until the rows or the navigation
+    attributes are first used, so a template that serves them from a cached
+    fragment costs no query.
+    """
+
+    def __init__(self, paginator, direction, values):
+        self.paginator = paginator
+        self.direction = direction
+        self.values = values
+        self._rows = None
+
+    def _fetch(self):
+        if self._rows is None:
+            rows, more = self.paginator.fetch(self.direction, self.values)
+            if self.direction == BACKWARD:
+                self._has_next, self._has_previous = True, more
+            else:
+                self._has_next, self._has_previous = more, self.values is not None
+            self._rows = rows
+        return self._rows
+
+    @property
+    def object_list(self):
+        return self._fetch()
+
+    def __getitem__(self, index):
+        return self._fetch()[index]
+
+    def __len__(self):
+        return len(self._fetch())
+
+    def __repr__(self):
+        return f'<KeysetPage {self.direction} of {self.paginator.queryset.model._meta.label}>'
+
+    def has_next(self):
+        self._fetch()
+        return self._has_next
+
+    def has_previous(self):
+        self._fetch()
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        rows = self._fetch()
+        return self.paginator.encode(FORWARD, rows[-1]) if rows and self._has_next else None
+
+    @property
+    def previous_cursor(self):
+        rows = self._fetch()
+        return self.paginator.encode(BACKWARD, rows[0]) if rows and self._has_previous else None
+
+
+class KeysetPaginationMixin:
+    """
+    ListView mixin replacing the offset paginator with keyset pagination
+    over `keyset_ordering`, or over the `keyset_orderings` entry picked by
+    the `sort` query parameter. The cursor comes from the `cursor` query
+    parameter; templates link to `?{{ pagination_query }}cursor=...` with
+    `page_obj.next_cursor` and `page_obj.previous_cursor`, which keeps the
+    other filters. A cursor that is invalid or was issued for another sort
+    order is a 404, like an out-of-range page number.
+    """
+    keyset_ordering = ('-pk',)
+    keyset_orderings = None
+    default_sort = None
+    sort_kwarg = 'sort'
+    cursor_kwarg = 'cursor'
+    paginate_with_count = False
+
+    def get_sort(self):
+        sort = self.request.GET.get(self.sort_kwarg)
+        return sort if self.keyset_orderings and sort in self.keyset_orderings else self.default_sort
+
+    def get_keyset_ordering(self):
+        if self.keyset_orderings:
+            return self.keyset_orderings[self.get_sort()]
+        return self.keyset_ordering
+
+    def get_cursor(self):
+        return self.request.GET.get(self.cursor_kwarg) or None
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(queryset, self.get_keyset_ordering(), page_size)
+        try:
+            page = paginator.page(self.get_cursor())
+        except InvalidCursor:
+            raise Http404('Invalid page cursor')
+        return paginator, page, page, SimpleLazyObject(page.has_other_pages)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.copy()
+        query.pop(self.cursor_kwarg, None)
+        context['pagination_query'] = f'{query.urlencode()}&' if query else ''
+        if self.keyset_orderings:
+            context['current_sort'] = self.get_sort()
+        # Templates show `paginator.count` only when asked; the COUNT runs on first access
+        context['show_total_count'] = self.paginate_with_count
+        return context
@@ -0,0 +1,120 @@
+"""
+Query Plans
+Captures every SELECT a page issues, runs EXPLAIN on it and flags plans
+that read a whole table: `SCAN <table>` without an index on SQLite,
+`Seq Scan on <table>` on PostgreSQL. Used by the `explain_queries`
+management command against seeded benchmark data, so a query that will
+slow down as its table grows is caught while the table is still small.
+"""
+import re
+
+from django.core.cache import caches
+from django.db import connection
+from django.test import Client
+
+from .benchmarking import route_targets
+
+SUPPORTED_VENDORS = ('sqlite', 'postgresql')
+
+# SQLite: "SCAN blog_blogpost" (3.36+) or "SCAN TABLE blog_blogpost AS U0" (older);
+# scans that say "USING INDEX" walk an index in order and are not flagged
+SQLITE_SCAN_RE = re.compile(r'^SCAN (?:TABLE )?(?P<table>\w+)(?: AS \w+)?$')
+POSTGRES_SCAN_RE = re.compile(r'Seq Scan on (?P<table>\w+)')
+
+
+class _SelectRecorder:
+    """execute_wrapper keeping the SQL and parameters of each SELECT"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip()[:6].upper() in ('SELECT', 'WITH '):
+            self.queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+def explain(sql, params=None):
+    """Return the plan of `sql` as a list of text lines"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [row[-1] for row in cursor.fetchall()]
+        cursor.execute(f'EXPLAIN {sql}', params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def scanned_tables(plan):
+    """Tables read in full according to `plan`"""
+    pattern = SQLITE_SCAN_RE if connection.vendor == 'sqlite' else POSTGRES_SCAN_RE
+    tables = []
+    for line in plan:
+        match = pattern.search(line.strip())
+        if match:
+            tables.append(match.group('table'))
+    return tables
+
+
+class _RowCounts(dict):
+    """Lazily counted table sizes; None for names that are not tables (aliases, subqueries)"""
+
+    def __missing__(self, table):
+        rows = None
+        if table in connection.introspection.table_names():
+            with connection.cursor() as cursor:
+                cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+                rows = cursor.fetchone()[0]
+        self[table] = rows
+        return rows
+
+
+def explain_routes(min_rows=100, routes=None):
+    """
+    Request each benchmarked route once with empty caches and EXPLAIN the
+    distinct SELECTs it ran. Returns {route: {'path', 'status', 'queries',
+    'findings'}} where each finding is {'table', 'rows', 'sql', 'plan'} for
+    a full scan of a table holding at least `min_rows` rows. `routes`
+    limits the run to route names containing any of the given strings.
+    """
+    if connection.vendor not in SUPPORTED_VENDORS:
+        raise NotImplementedError(f'EXPLAIN parsing is not implemented for {connection.vendor}')
+
+    def selected(route):
+        return not routes or any(part in route for part in routes)
+
+    client = Client(raise_request_exception=False)
+    targets, missing = route_targets()
+    results = {route: {'path': None, 'status': 'skipped'} for route in missing if selected(route)}
+    row_counts = _RowCounts()
+
+    for route, path in targets:
+        if not selected(route):
+            continue
+        # Cold caches, so the queries behind cached fragments are explained too
+        for cache in caches.all():
+            cache.clear()
+        recorder = _SelectRecorder()
+        with connection.execute_wrapper(recorder):
+            response = client.get(path, secure=True)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        response.close()
+
+        findings = []
+        seen = set()
+        for sql, params in recorder.queries:
+            if sql in seen:
+                continue
+            seen.add(sql)
+            plan = explain(sql, params)
+            for table in scanned_tables(plan):
+                rows = row_counts[table]
+                if rows is not None and rows >= min_rows:
+                    findings.append({'table': table, 'rows': rows, 'sql': sql, 'plan': plan})
+        results[route] = {
+            'path': path,
+            'status': response.status_code,
+            'queries': len(recorder.queries),
+            'findings': findings,
+        }
+    return results
@@ -0,0 +1,231 @@
+"""
+Research Search Index
+Extracts text from uploaded research PDFs (offline, with pypdf), splits it
+into chunks and maintains a term index shared with the listing fields, so
+the research page can search titles, abstracts and paper bodies at once.
+"""
+import logging
+import re
+import shutil
+import tempfile
+from collections import Counter
+from itertools import islice
+
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+
+logger = logging.getLogger(__name__)
+
+CHUNK_WORDS = 200
+MAX_TERM_LENGTH = 64
+SNIPPET_CHARS = 240
+# Chunks (and then their terms) written per INSERT
+INDEX_BATCH_SIZE = 500
+# PDFs larger than this are copied to a temporary file rather than held in memory
+PDF_MEMORY_LIMIT = 4 * 1024 * 1024
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:['\-][a-z0-9]+)*")
+STOPWORDS = frozenset("""
+a an and are as at be been but by for from has have in into is it its of on or
+that the their there these this to was were which with we our not can also than
+""".split())
+
+
+def tokenize(text):
+    """Lowercased terms of `text` with stopwords and single characters removed"""
+    return [
+        token[:MAX_TERM_LENGTH] for token in TOKEN_RE.findall((text or '').lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def chunk_pages(pages, chunk_words=CHUNK_WORDS):
+    """
+    Split an iterable of page texts into (page_number, text) chunks of about
+    `chunk_words` words, never carrying more than one chunk in memory.
+    """
+    buffer = []
+    start_page = None
+    for page_number, text in pages:
+        for word in (text or '').split():
+            if not buffer:
+                start_page = page_number
+            buffer.append(word)
+            if len(buffer) >= chunk_words:
+                yield start_page, ' '.join(buffer)
+                buffer = []
+    if buffer:
+        yield start_page, ' '.join(buffer)
+
+
+def extract_pdf_pages(fieldfile):
+    """
+    Yield (page_number, text) for each page of a stored PDF. pypdf needs a
+    seekable file, so the PDF is copied to a local spooled file first:
+    kept in memory up to PDF_MEMORY_LIMIT, on disk beyond.
+    """
+    from pypdf import PdfReader
+    from .instrumentation import external_call
+
+    with tempfile.SpooledTemporaryFile(max_size=PDF_MEMORY_LIMIT) as local:
+        # Storage files open lazily; the span covers reading the bytes
+        with external_call('storage', 'read', name=fieldfile.name) as call:
+            with fieldfile.storage.open(fieldfile.name, 'rb') as f:
+                shutil.copyfileobj(f, local)
+            call.bytes_received = local.tell()
+        local.seek(0)
+        reader = PdfReader(local)
+        for number, page in enumerate(reader.pages, start=1):
+            try:
+                yield number, page.extract_text() or ''
+            except Exception as e:
+                logger.warning('Could not extract page %s of %s: %s', number, fieldfile.name, e)
+                yield number, ''
+
+
+def _store_chunks(research, source, chunks):
+    """
+    Replace the `source` chunks of `research` and their index terms, with
+    one INSERT per INDEX_BATCH_SIZE chunks and per INDEX_BATCH_SIZE terms
+    """
+    from .models import ResearchTextChunk, ResearchSearchTerm
+
+    research.text_chunks.filter(source=source).delete()
+    count = 0
+    numbered = enumerate(chunks)
+    while batch := list(islice(numbered, INDEX_BATCH_SIZE)):
+        rows = ResearchTextChunk.objects.bulk_create([
+            ResearchTextChunk(research=research, source=source, position=position, page=page, text=text)
+            for position, (page, text) in batch
+        ])
+        if not connection.features.can_return_rows_from_bulk_insert:
+            # MySQL does not report the new primary keys
+            ids = dict(research.text_chunks.filter(source=source, position__gte=count).values_list('position', 'pk'))
+            for row in rows:
+                row.pk = ids[row.position]
+        ResearchSearchTerm.objects.bulk_create([
+            ResearchSearchTerm(term=term, chunk=row, research=research, frequency=frequency)
+            for row in rows
+            for term, frequency in Counter(tokenize(row.text)).items()
+        ], batch_size=INDEX_BATCH_SIZE)
+        count += len(rows)
+    return count
+
+
+def listing_text(research):
+    tag_names = ', '.join(tag.name for tag in research.tags.all()) if research.pk else ''
+    parts = [research.title, research.authors, research.publication_venue, tag_names, research.abstract]
+    return '\n'.join(part for part in parts if part)
+
+
+def index_listing(research):
+    """Index the fields shown on the research listing"""
+    with transaction.atomic():
+        _store_chunks(research, 'LISTING', [(None, listing_text(research))])
+
+
+def index_pdf(research_id):
+    """Extract, chunk and index the PDF of one research item (runs in the background)"""
+    from .models import Research, ResearchIndexJob
+
+    research = Research.objects.filter(pk=research_id).first()
+    if research is None:
+        return
+    job, created = ResearchIndexJob.objects.get_or_create(research=research)
+    job.status = 'RUNNING'
+    job.error = ''
+    job.save(update_fields=['status', 'error', 'updated_at'])
+
+    pdf_name = research.pdf_file.name if research.pdf_file else ''
+    try:
+        if pdf_name:
+            page_count = 0
+
+            def pages():
+                nonlocal page_count
+                for number, text in extract_pdf_pages(research.pdf_file):
+                    page_count = number
+                    yield number, text
+
+            # Parsed before the transaction opens, so writers are not held up by pypdf
+            chunks = list(chunk_pages(pages()))
+            with transaction.atomic():
+                job.chunk_count = _store_chunks(research, 'PDF', chunks)
+            job.page_count = page_count
+        else:
+            research.text_chunks.filter(source='PDF').delete()
+            job.page_count = 0
+            job.chunk_count = 0
+        job.status = 'DONE'
+    except Exception as e:
+        logger.exception('PDF indexing failed for research %s', research_id)
+        job.status = 'FAILED'
+        job.error = str(e)
+    job.pdf_name = pdf_name
+    job.save()
+
+
+def schedule_pdf_index(research, force=False):
+    """Queue PDF extraction when the attached file differs from the indexed one"""
+    from .background import enqueue
+    from .models import ResearchIndexJob
+
+    pdf_name = research.pdf_file.name if research.pdf_file else ''
+    job = ResearchIndexJob.objects.filter(research=research).first()
+    if not force and job and job.pdf_name == pdf_name and job.status == 'DONE':
+        return False
+    if job is None and not pdf_name:
+        return False
+    ResearchIndexJob.objects.update_or_create(research=research, defaults={'status': 'PENDING'})
+    enqueue(index_pdf, research.pk)
+    return True
+
+
+def _snippet(text, terms):
+    lowered = text.lower()
+    positions = [lowered.find(term) for term in terms]
+    positions = [p for p in positions if p >= 0]
+    start = max(min(positions) - SNIPPET_CHARS // 3, 0) if positions else 0
+    snippet = text[start:start + SNIPPET_CHARS].strip()
+    return ('…' if start else '') + snippet + ('…' if start + SNIPPET_CHARS < len(text) else '')
+
+
+def search_research(query, limit=50):
+    """
+    Return [(research_id, score, snippet)] for research items containing
+    every term of `query`, best matches first. Matching and ranking run as
+    grouped queries on the term index; snippets come from each item's
+    best-scoring chunk.
+    """
+    from .models import ResearchSearchTerm, ResearchTextChunk
+
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return []
+
+    matches = list(
+        ResearchSearchTerm.objects.filter(term__in=terms)
+        .values('research_id')
+        .annotate(matched=Count('term', distinct=True), score=Sum('frequency'))
+        .filter(matched=len(terms))
+        .order_by('-score')[:limit]
+    )
+    if not matches:
+        return []
+
+    research_ids = [match['research_id'] for match in matches]
+    best_chunks = {}
+    for row in (
+        ResearchSearchTerm.objects.filter(term__in=terms, research_id__in=research_ids)
+        .values('research_id', 'chunk_id')
+        .annotate(score=Sum('frequency'))
+        .order_by('research_id', '-score')
+    ):
+        best_chunks.setdefault(row['research_id'], row['chunk_id'])
+
+    texts = dict(
+        ResearchTextChunk.objects.filter(pk__in=best_chunks.values()).values_list('pk', 'text')
+    )
+    return [
+        (match['research_id'], match['score'], _snippet(texts.get(best_chunks.get(match['research_id']), ''), terms))
+        for match in matches
+    ]
@@ -0,0 +1,154 @@
+"""
+HTML Sanitizer
+Allowlist sanitizer for rich text saved from TinyMCE. Runs once when
+content is saved, so pages can output the stored result with `|safe`.
+Unknown tags are dropped (their text is kept), script-like elements are
+removed entirely, and only safe attributes and URL schemes survive.
+Videos embedded with TinyMCE's media button are kept as iframes when they
+point at a YouTube or Vimeo player (EMBED_SOURCES); other iframes are
+dropped. Images and embeds additionally get lazy loading.
+"""
+import re
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urlparse
+
+ALLOWED_TAGS = {
+    'a', 'abbr', 'b', 'blockquote', 'br', 'caption', 'code', 'div', 'em', 'figcaption', 'figure',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'img', 'li', 'ol', 'p', 'pre', 's', 'small',
+    'span', 'strong', 'sub', 'sup', 'table', 'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'u', 'ul',
+}
+VOID_TAGS = {'br', 'hr', 'img'}
+# Dropped together with everything inside them
+DROPPED_CONTENT_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'noscript', 'template', 'svg', 'math'}
+# Iframes kept anyway: https player URLs of these hosts, under these paths
+EMBED_SOURCES = {
+    'www.youtube.com': '/embed/',
+    'youtube.com': '/embed/',
+    'www.youtube-nocookie.com': '/embed/',
+    'player.vimeo.com': '/video/',
+}
+EMBED_ATTRIBUTES = {'src', 'width', 'height', 'title', 'allow', 'allowfullscreen', 'frameborder'}
+
+ALLOWED_ATTRIBUTES = {
+    '*': {'title', 'class', 'style'},
+    'a': {'href', 'target', 'rel'},
+    'img': {'src', 'alt', 'width', 'height'},
+    'td': {'colspan', 'rowspan'},
+    'th': {'colspan', 'rowspan', 'scope'},
+    'ol': {'start'},
+}
+URL_ATTRIBUTES = {'href', 'src'}
+ALLOWED_SCHEMES = {'', 'http', 'https', 'mailto', 'tel'}
+UNSAFE_STYLE_RE = re.compile(r'url\s*\(|expression\s*\(|javascript:|@import|behavior\s*:', re.IGNORECASE)
+
+
+def _safe_url(value):
+    value = (value or '').strip()
+    # Browsers ignore control characters and whitespace inside schemes ("java\tscript:")
+    compact = re.sub(r'[\x00-\x20]+', '', value)
+    try:
+        scheme = urlparse(compact).scheme.lower()
+    except ValueError:
+        return None
+    return value if scheme in ALLOWED_SCHEMES else None
+
+
+def _embed_url(value):
+    try:
+        url = urlparse((value or '').strip())
+    except ValueError:
+        return None
+    prefix = EMBED_SOURCES.get((url.hostname or '').lower())
+    if url.scheme.lower() != 'https' or prefix is None or not url.path.startswith(prefix):
+        return None
+    return url.geturl()
+
+
+class _Sanitizer(HTMLParser):
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.output = []
+        self.open_tags = []
+        self.dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'iframe' and not self.dropping:
+            self._embed(attrs)
+        if tag in DROPPED_CONTENT_TAGS:
+            self.dropping += 1
+            return
+        if self.dropping or tag not in ALLOWED_TAGS:
+            return
+        allowed = ALLOWED_ATTRIBUTES['*'] | ALLOWED_ATTRIBUTES.get(tag, set())
+        cleaned = []
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+            if name in URL_ATTRIBUTES:
+                value = _safe_url(value)
+                if value is None:
+                    continue
+            if name == 'style' and UNSAFE_STYLE_RE.search(value):
+                continue
+            cleaned.append((name, value))
+        if tag == 'a' and dict(cleaned).get('target') == '_blank':
+            cleaned = [(n, v) for n, v in cleaned if n != 'rel'] + [('rel', 'noopener noreferrer')]
+        if tag == 'img':
+            cleaned += [('loading', 'lazy'), ('decoding', 'async')]
+        rendered = ''.join(f' {name}="{escape(value, quote=True)}"' for name, value in cleaned)
+        self.output.append(f'<{tag}{rendered}>')
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def _embed(self, attrs):
+        """Output an allowed video iframe; its fallback content is dropped like any iframe's"""
+        attrs = dict(attrs)
+        src = _embed_url(attrs.get('src'))
+        if src is None:
+            return
+        rendered = [f' src="{escape(src, quote=True)}"']
+        for name in sorted(EMBED_ATTRIBUTES - {'src'}):
+            if name not in attrs:
+                continue
+            if name == 'allowfullscreen':
+                rendered.append(' allowfullscreen')
+            elif attrs[name] is not None:
+                rendered.append(f' {name}="{escape(attrs[name], quote=True)}"')
+        self.output.append(f'<iframe{"".join(rendered)} loading="lazy"></iframe>')
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self.open_tags and self.open_tags[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROPPED_CONTENT_TAGS:
+            self.dropping = max(self.dropping - 1, 0)
+            return
+        if self.dropping or tag not in self.open_tags:
+            return
+        # Close any tags left open inside this one so the output stays balanced
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.output.append(f'</{open_tag}>')
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.output.append(escape(data, quote=False))
+
+    def result(self):
+        self.close()
+        return ''.join(self.output) + ''.join(f'</{tag}>' for tag in reversed(self.open_tags))
+
+
+def sanitize_html(html):
+    """Return `html` reduced to the allowed tags, attributes and URL schemes"""
+    if not html:
+        return ''
+    parser = _Sanitizer()
+    parser.feed(html)
+    return parser.result()
@@ -0,0 +1,29 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Research, Skill
+from .research_index import index_listing, schedule_pdf_index
+from .skills_catalog import forget_version
+
+
+@receiver(post_save, sender=Research)
+def update_research_index(sender, instance, raw=False, **kwargs):
+    """Keep the research search index in step with listing fields and PDFs"""
+    if raw:
+        return
+    index_listing(instance)
+    schedule_pdf_index(instance)
+
+
+@receiver(m2m_changed, sender=Research.tags.through)
+def update_research_tag_index(sender, instance, action, reverse=False, **kwargs):
+    """Tags are saved after the research item itself, so reindex when they change"""
+    if action in ('post_add', 'post_remove', 'post_clear') and not reverse:
+        index_listing(instance)
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def update_skills_version(sender, instance, raw=False, **kwargs):
+    """A new skills data version for the next request"""
+    forget_version()
@@ -0,0 +1,113 @@
+"""
+Singleton Models
+Base class for settings models that have exactly one row (pk=1). The row is
+created by `migrate` (post_migrate), and `load()` serves it from process
+memory, then the default cache, and only then the database. Saving or
+deleting the row invalidates both cache layers; where the default cache is
+not shared, other processes pick up the change once their entry expires.
+"""
+import copy
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import models, transaction
+
+SINGLETON_PK = 1
+DEFAULT_LOCAL_TTL = 10
+# Unless CACHE_INVALIDATION_TIMEOUT says otherwise; saves clear the cache right away
+DEFAULT_CACHE_TIMEOUT = 60 * 60
+
+_local = {}
+_local_lock = threading.Lock()
+
+
+def _cache():
+    return caches[getattr(settings, 'SINGLETON_CACHE_ALIAS', 'default')]
+
+
+def ensure_singleton(model, using='default'):
+    """
+    Make sure the pk=1 row of `model` exists. A row saved earlier under a
+    different pk is moved to pk=1 so its content is kept. Works with
+    historical models, so it can run from post_migrate.
+    """
+    manager = model._default_manager.db_manager(using)
+    if manager.filter(pk=SINGLETON_PK).exists():
+        return False
+    existing = manager.order_by('pk').first()
+    if existing is not None:
+        manager.filter(pk=existing.pk).update(pk=SINGLETON_PK)
+    else:
+        manager.get_or_create(pk=SINGLETON_PK)
+    return True
+
+
+class SingletonModel(models.Model):
+    """Abstract base for one-row settings models"""
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def cache_key(cls):
+        return f'singleton:{cls._meta.label_lower}'
+
+    @classmethod
+    def load(cls):
+        """Return the settings row, served from cache whenever possible"""
+        key = cls.cache_key()
+        now = time.monotonic()
+        entry = _local.get(key)
+        if entry is not None and entry[1] > now:
+            return copy.copy(entry[0])
+
+        instance = _cache().get(key)
+        if instance is None:
+            instance = cls.objects.filter(pk=SINGLETON_PK).first()
+            if instance is None:
+                # Only reached when migrate has not created the row (e.g. a flushed test database)
+                ensure_singleton(cls)
+                instance = cls.objects.get(pk=SINGLETON_PK)
+            _cache().set(key, instance, getattr(settings, 'CACHE_INVALIDATION_TIMEOUT', DEFAULT_CACHE_TIMEOUT))
+
+        ttl = getattr(settings, 'SINGLETON_LOCAL_TTL', DEFAULT_LOCAL_TTL)
+        with _local_lock:
+            _local[key] = (instance, now + ttl)
+        return copy.copy(instance)
+
+    @classmethod
+    def clear_cache(cls):
+        key = cls.cache_key()
+        with _local_lock:
+            _local.pop(key, None)
+        _cache().delete(key)
+
+    def save(self, *args, **kwargs):
+        self.pk = SINGLETON_PK
+        super().save(*args, **kwargs)
+        self.clear_cache()
+        # Clear again once committed so a concurrent load() can't re-cache the old row
+        transaction.on_commit(self.clear_cache)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self.clear_cache()
+        transaction.on_commit(self.clear_cache)
+        return result
+
+
+def create_singletons(sender, using='default', apps=None, **kwargs):
+    """post_migrate handler creating the row of every singleton model in `sender`"""
+    for model in sender.get_models():
+        if not issubclass(model, SingletonModel):
+            continue
+        historical = model
+        if apps is not None:
+            try:
+                historical = apps.get_model(model._meta.app_label, model._meta.model_name)
+            except LookupError:
+                continue
+        if ensure_singleton(historical, using=using):
+            model.clear_cache()
@@ -0,0 +1,205 @@
+"""
+Skill Import
+Parses `name|proficiency|icon|subcategory` lines (from the admin bulk-add
+textarea, a file or stdin) and applies them to one skill category. Skills
+are matched on normalized name within the category: the existing rows are
+read in one query and the changes are written with bulk_create/bulk_update
+in a single transaction. A dry run reports the same plan without writing.
+
+The same canonical key (normalized name + category) drives duplicate
+cleanup, see `find_duplicate_groups` and `remove_duplicates`.
+"""
+from collections import defaultdict, namedtuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from .skills_catalog import forget_version
+
+DEFAULT_PROFICIENCY = 50
+
+# Older skill lists (e.g. bulk_skills.txt) use names that predate SUBCATEGORY_CHOICES
+SUBCATEGORY_ALIASES = {
+    'MACHINE_LEARNING': 'AI_ML',
+}
+
+ParsedSkill = namedtuple('ParsedSkill', 'line name proficiency icon subcategory')
+
+
+def normalize_skill_name(name):
+    """Canonical form used to match skills: collapsed whitespace, case-folded"""
+    return ' '.join((name or '').split()).casefold()
+
+
+def parse_lines(lines, separator='|'):
+    """
+    Return ([ParsedSkill], errors, warnings) for an iterable of text lines.
+    Lines with errors are dropped; unknown subcategories fall back to OTHER
+    with a warning.
+    """
+    from .models import Skill
+
+    valid_subcategories = {value for value, label in Skill.SUBCATEGORY_CHOICES}
+    skills, errors, warnings = [], [], []
+    for number, raw in enumerate(lines, start=1):
+        line = raw.strip()
+        if not line or line.startswith('#'):
+            continue
+        parts = [part.strip() for part in line.split(separator)]
+        name = ' '.join(parts[0].split())
+        if not name:
+            errors.append(f'Line {number}: missing skill name')
+            continue
+        if len(name) > Skill._meta.get_field('name').max_length:
+            errors.append(f'Line {number}: name "{name[:30]}…" is too long')
+            continue
+        try:
+            proficiency = int(parts[1]) if len(parts) > 1 and parts[1] else DEFAULT_PROFICIENCY
+        except ValueError:
+            errors.append(f'Line {number}: proficiency "{parts[1]}" is not a number')
+            continue
+        if not 0 <= proficiency <= 100:
+            errors.append(f'Line {number}: proficiency {proficiency} is outside 0-100')
+            continue
+        icon = parts[2] if len(parts) > 2 else ''
+        subcategory = parts[3].upper().replace(' ', '_') if len(parts) > 3 and parts[3] else 'OTHER'
+        subcategory = SUBCATEGORY_ALIASES.get(subcategory, subcategory)
+        if subcategory not in valid_subcategories:
+            warnings.append(f'Line {number}: unknown subcategory "{parts[3]}", using OTHER')
+            subcategory = 'OTHER'
+        skills.append(ParsedSkill(number, name, proficiency, icon, subcategory))
+    return skills, errors, warnings
+
+
+class ImportResult:
+    """What an import did (or, for a dry run, would do)"""
+
+    def __init__(self, category, dry_run):
+        self.category = category
+        self.dry_run = dry_run
+        self.created = []
+        self.updated = []
+        self.unchanged = []
+        self.skipped = []
+        self.errors = []
+        self.warnings = []
+
+    def summary(self):
+        prefix = 'Would add' if self.dry_run else 'Added'
+        return (
+            f'{prefix} {len(self.created)}, updated {len(self.updated)}, '
+            f'unchanged {len(self.unchanged)}, skipped {len(self.skipped)}, '
+            f'errors {len(self.errors)}, warnings {len(self.warnings)}'
+        )
+
+
+def import_skills(lines, category, update_existing=True, dry_run=False):
+    """
+    Import skill lines into `category`. Existing skills (same normalized
+    name in the category) are updated when `update_existing` is set and
+    skipped otherwise; new skills are appended after the category's
+    current highest order. Returns an ImportResult.
+    """
+    from .models import Skill
+
+    result = ImportResult(category, dry_run)
+    parsed, result.errors, result.warnings = parse_lines(lines)
+
+    # The last line wins when the input repeats a skill
+    incoming = {}
+    for skill in parsed:
+        key = normalize_skill_name(skill.name)
+        if key in incoming:
+            result.warnings.append(f'Line {skill.line}: "{skill.name}" repeats line {incoming[key].line}; using the later line')
+        incoming[key] = skill
+
+    with transaction.atomic():
+        existing = {}
+        max_order = -1
+        for skill in Skill.objects.filter(category=category).order_by('pk'):
+            existing.setdefault(normalize_skill_name(skill.name), skill)
+            max_order = max(max_order, skill.order)
+
+        to_create, to_update = [], []
+        now = timezone.now()
+        for key, row in incoming.items():
+            current = existing.get(key)
+            if current is None:
+                max_order += 1
+                to_create.append(Skill(
+                    name=row.name, category=category, proficiency=row.proficiency,
+                    icon=row.icon, subcategory=row.subcategory, order=max_order,
+                ))
+                result.created.append(row.name)
+            elif not update_existing:
+                result.skipped.append(current.name)
+            elif (current.name, current.proficiency, current.icon, current.subcategory) == (
+                row.name, row.proficiency, row.icon, row.subcategory
+            ):
+                result.unchanged.append(current.name)
+            else:
+                current.name = row.name
+                current.proficiency = row.proficiency
+                current.icon = row.icon
+                current.subcategory = row.subcategory
+                current.updated_at = now
+                to_update.append(current)
+                result.updated.append(row.name)
+
+        if not dry_run:
+            Skill.objects.bulk_create(to_create)
+            # bulk_update skips auto_now, which the skills data version relies on
+            Skill.objects.bulk_update(to_update, ['name', 'proficiency', 'icon', 'subcategory', 'updated_at'])
+            # Bulk writes send no signals
+            forget_version()
+
+    return result
+
+
+# Which row of a duplicate group survives; the rest are deleted
+KEEP_POLICIES = {
+    # A row with a real subcategory beats OTHER, then the most recent row
+    'specific': lambda skill: (skill['subcategory'] != 'OTHER', skill['pk']),
+    'latest': lambda skill: skill['pk'],
+    'oldest': lambda skill: -skill['pk'],
+    'proficiency': lambda skill: (skill['proficiency'], skill['pk']),
+}
+
+
+def find_duplicate_groups(model=None):
+    """
+    Return {(normalized name, category): [rows]} for every key shared by
+    more than one skill, reading all candidate rows in one query. `model`
+    may be a historical model when called from a migration.
+    """
+    if model is None:
+        from .models import Skill as model
+
+    groups = defaultdict(list)
+    for row in model.objects.values('pk', 'name', 'category', 'subcategory', 'proficiency').order_by():
+        groups[(normalize_skill_name(row['name']), row['category'])].append(row)
+    return {key: rows for key, rows in groups.items() if len(rows) > 1}
+
+
+def remove_duplicates(policy='specific', dry_run=False, model=None):
+    """
+    Keep one skill per canonical key according to `policy` and delete the
+    others in one statement. Returns [(kept row, [deleted rows])].
+    """
+    if policy not in KEEP_POLICIES:
+        raise ValueError(f'Unknown keep policy {policy!r}; choose from {", ".join(KEEP_POLICIES)}')
+    if model is None:
+        from .models import Skill as model
+
+    rank = KEEP_POLICIES[policy]
+    resolutions = []
+    with transaction.atomic():
+        for rows in find_duplicate_groups(model).values():
+            ordered = sorted(rows, key=rank, reverse=True)
+            resolutions.append((ordered[0], ordered[1:]))
+        loser_ids = [row['pk'] for kept, losers in resolutions for row in losers]
+        if loser_ids and not dry_run:
+            model.objects.filter(pk__in=loser_ids).delete()
+            # Historical models (migrations) send no signals
+            forget_version()
+    return resolutions
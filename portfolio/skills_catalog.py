@@ -0,0 +1,118 @@
+"""
+Skills Catalog
+Builds the skills page data from a single query: a compact columnar
+payload (one array per field, categories and subcategories stored as
+indexes into lookup lists) plus the filter facet counts derived from it.
+
+The payload version is counted from the database (row count and latest
+updated_at, one aggregate query) and kept in the default cache until a
+skill changes: the Skill signals, the import and the duplicate cleanup
+drop it. A summary is only built right after a fresh count, so a `?v=` URL
+that browsers keep for a year always names the data it returns, even when
+another process still has an older version cached. The built summary,
+including the serialized JSON served by the skills data endpoint, is kept
+in the default cache under that version.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+
+# Bump when the payload layout changes; clients and caches key on it
+PAYLOAD_SCHEMA = 1
+SUMMARY_CACHE_KEY = f'skills:summary:v{PAYLOAD_SCHEMA}'
+VERSION_CACHE_KEY = f'skills:version:v{PAYLOAD_SCHEMA}'
+# Backstop for a lost invalidation, unless CACHE_INVALIDATION_TIMEOUT says otherwise
+VERSION_CACHE_TIMEOUT = 60 * 60
+# Any skill change makes a new version; old ones just expire
+SUMMARY_CACHE_TIMEOUT = 60 * 60
+
+
+def count_version():
+    """
+    Version of the skills table, counted from the database and cached:
+    changes whenever a skill is added, edited or deleted
+    """
+    from .models import Skill
+
+    stats = Skill.objects.aggregate(count=Count('pk'), changed=Max('updated_at'))
+    changed = stats['changed'].isoformat() if stats['changed'] else ''
+    stamp = f"{PAYLOAD_SCHEMA}:{stats['count']}:{changed}"
+    version = hashlib.md5(stamp.encode('utf-8')).hexdigest()[:12]
+    cache.set(VERSION_CACHE_KEY, version, getattr(settings, 'CACHE_INVALIDATION_TIMEOUT', VERSION_CACHE_TIMEOUT))
+    return version
+
+
+def forget_version():
+    """Drop the cached version now and once the current transaction commits"""
+    cache.delete(VERSION_CACHE_KEY)
+    transaction.on_commit(lambda: cache.delete(VERSION_CACHE_KEY))
+
+
+def build_summary(version):
+    """Run the one skills query and return {'version', 'payload', 'json', 'facets'}"""
+    from .models import Skill
+
+    categories = [value for value, label in Skill.SKILL_CATEGORY_CHOICES]
+    subcategories = list(Skill.SUBCATEGORY_CHOICES)
+    category_index = {value: i for i, value in enumerate(categories)}
+    subcategory_index = {value: i for i, (value, label) in enumerate(subcategories)}
+
+    payload = {
+        'categories': categories,
+        'subcategories': subcategories,
+        'name': [],
+        'category': [],
+        'subcategory': [],
+        'proficiency': [],
+        'icon': [],
+    }
+    category_counts = dict.fromkeys(categories, 0)
+    subcategory_counts = {}
+
+    for name, category, subcategory, proficiency, icon in Skill.objects.values_list(
+        'name', 'category', 'subcategory', 'proficiency', 'icon'
+    ):
+        if subcategory not in subcategory_index:
+            # Values no longer in SUBCATEGORY_CHOICES keep a readable label
+            subcategory_index[subcategory] = len(subcategories)
+            subcategories.append((subcategory, (subcategory or 'Other').replace('_', ' ').title()))
+        payload['name'].append(name)
+        payload['category'].append(category_index.get(category, -1))
+        payload['subcategory'].append(subcategory_index[subcategory])
+        payload['proficiency'].append(proficiency)
+        payload['icon'].append(icon)
+        category_counts[category] = category_counts.get(category, 0) + 1
+        subcategory_counts[subcategory] = subcategory_counts.get(subcategory, 0) + 1
+
+    facets = {
+        'total': len(payload['name']),
+        'categories': category_counts,
+        'subcategories': [
+            {'value': value, 'display': label, 'count': subcategory_counts[value]}
+            for value, label in sorted(subcategories)
+            if value and value != 'OTHER' and value in subcategory_counts
+        ],
+    }
+    payload['schema'] = PAYLOAD_SCHEMA
+    payload['version'] = version
+    return {
+        'version': payload['version'],
+        'payload': payload,
+        'json': json.dumps(payload, separators=(',', ':')),
+        'facets': facets,
+    }
+
+
+def get_summary():
+    version = cache.get(VERSION_CACHE_KEY)
+    summary = cache.get(f'{SUMMARY_CACHE_KEY}:{version}') if version else None
+    if summary is None:
+        # Counted again, so a version cached before a change elsewhere never labels newer rows
+        version = count_version()
+        summary = build_summary(version)
+        cache.set(f'{SUMMARY_CACHE_KEY}:{version}', summary, SUMMARY_CACHE_TIMEOUT)
+    return summary
@@ -1,4 +1,6 @@
 from django import template
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
 
 register = template.Library()
 
@@ -8,3 +10,45 @@ def split_comma(value):
     if value:
         return [item.strip() for item in value.split(',')]
     return []
+
+
+def _view_name(context):
+    match = getattr(context.get('request'), 'resolver_match', None)
+    return match.view_name if match else None
+
+
+@register.simple_tag(takes_context=True)
+def critical_css(context):
+    """Inline the first-screen CSS of the current page, when it has been built"""
+    from portfolio.assets import critical_css
+
+    css = critical_css(_view_name(context))
+    return format_html('<style>{}</style>', mark_safe(css)) if css else ''
+
+
+@register.simple_tag(takes_context=True)
+def asset_css(context, name):
+    """
+    Stylesheet links for an asset bundle (see portfolio.assets); loaded
+    without blocking rendering when the page has its critical CSS inlined
+    """
+    from portfolio.assets import CRITICAL_PAGES, asset_urls, critical_css
+
+    urls = [(url,) for url in asset_urls(name, 'css')]
+    view_name = _view_name(context)
+    if name in CRITICAL_PAGES.get(view_name, ()) and critical_css(view_name):
+        return format_html_join(
+            '\n',
+            '<link rel="preload" href="{0}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+            '<noscript><link rel="stylesheet" href="{0}"></noscript>',
+            urls,
+        )
+    return format_html_join('\n', '<link rel="stylesheet" href="{}">', urls)
+
+
+@register.simple_tag
+def asset_js(name):
+    """Script tags for an asset bundle (see portfolio.assets)"""
+    from portfolio.assets import asset_urls
+
+    return format_html_join('\n', '<script src="{}"></script>', ((url,) for url in asset_urls(name, 'js')))
@@ -1,3 +1,619 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from io import BytesIO, StringIO
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.storage import FileSystemStorage, Storage, default_storage
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import http_date
+
+from .assets import ICON_CLASS_RE, purge_css
+from .benchmarking import seed_data
+from .downloads import parse_range, serve_file
+from .management.commands import backfill_derivatives
+from .media_derivatives import derivative_names, get_widths
+from .metrics import MetricsStore, percentile
+from .models import Experience, FileDownload, Research, ResearchIndexJob, ResearchSearchTerm, Skill
+from .research_index import INDEX_BATCH_SIZE, _store_chunks, index_pdf, search_research
+from .sanitize import sanitize_html
+from .skill_import import find_duplicate_groups, import_skills, remove_duplicates
+
+# Enough rows per table that a per-row query would show in the counts
+TEST_SCALE = {
+    'posts': 30,
+    'comments_per_post': 2,
+    'categories': 3,
+    'tags': 10,
+    'skills': 40,
+    'research': 10,
+    'timeline_entries': 6,
+    'repositories': 12,
+    'commits_per_repo': 2,
+}
+
+# Pages are rendered without a collectstatic manifest, and without the
+# per-process singleton copies that would carry over between tests
+PAGE_TEST_SETTINGS = {
+    'STATICFILES_STORAGE': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    'SECURE_SSL_REDIRECT': False,
+    'SINGLETON_LOCAL_TTL': 0,
+}
+
+
+@override_settings(**PAGE_TEST_SETTINGS)
+class PageQueryTestCase(TestCase):
+    """Renders pages against seeded data and checks their query counts"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_data(TEST_SCALE)
+
+    def setUp(self):
+        cache.clear()
+
+    def assertPageQueries(self, url, cold, warm):
+        """Fetch `url` twice: with empty caches, then with the caches it filled"""
+        with self.assertNumQueries(cold):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(warm):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+
+class PageQueryTests(PageQueryTestCase):
+    """Query counts of the portfolio pages; a query per row would fail these"""
+
+    def test_home(self):
+        self.assertPageQueries(reverse('portfolio:home'), 10, 9)
+
+    def test_about(self):
+        self.assertPageQueries(reverse('portfolio:about'), 2, 1)
+
+    def test_skills(self):
+        response = self.assertPageQueries(reverse('portfolio:skills'), 2, 0)
+        self.assertEqual(response.context['skill_count'], TEST_SCALE['skills'])
+
+    def test_skills_data(self):
+        response = self.assertPageQueries(reverse('portfolio:skills_data'), 2, 0)
+        self.assertEqual(len(response.json()['name']), TEST_SCALE['skills'])
+
+    def test_skills_data_version_follows_database(self):
+        url = reverse('portfolio:skills_data')
+        version = self.client.get(reverse('portfolio:skills')).context['skills_version']
+        response = self.client.get(url, {'v': version})
+        self.assertIn('immutable', response['Cache-Control'])
+
+        skill = Skill.objects.first()
+        skill.proficiency = 100 - skill.proficiency
+        skill.save()
+        response = self.client.get(url, {'v': version})
+        self.assertNotIn('immutable', response['Cache-Control'])
+        self.assertNotEqual(response.json()['version'], version)
+
+    def test_skills_data_version_follows_deletes_and_imports(self):
+        url = reverse('portfolio:skills_data')
+        version = self.client.get(url).json()['version']
+        Skill.objects.first().delete()
+        deleted = self.client.get(url).json()
+        self.assertNotEqual(deleted['version'], version)
+        self.assertEqual(len(deleted['name']), TEST_SCALE['skills'] - 1)
+
+        import_skills(['Brand New Skill|70'], 'HARD')
+        imported = self.client.get(url).json()
+        self.assertNotEqual(imported['version'], deleted['version'])
+        self.assertIn('Brand New Skill', imported['name'])
+
+    def test_research(self):
+        self.assertPageQueries(reverse('portfolio:research'), 6, 5)
+
+
+class SanitizeEmbedTests(SimpleTestCase):
+    """Videos added with TinyMCE's media button survive; other iframes do not"""
+
+    def test_youtube_and_vimeo_players_are_kept(self):
+        html = sanitize_html(
+            '<iframe src="https://www.youtube.com/embed/abc" width="560" allowfullscreen="allowfullscreen" '
+            'onload="steal()">fallback</iframe>'
+            '<iframe src="https://player.vimeo.com/video/42"></iframe>'
+        )
+        self.assertEqual(html, (
+            '<iframe src="https://www.youtube.com/embed/abc" allowfullscreen width="560" loading="lazy"></iframe>'
+            '<iframe src="https://player.vimeo.com/video/42" loading="lazy"></iframe>'
+        ))
+
+    def test_other_iframes_are_dropped(self):
+        for src in (
+            'https://example.com/embed/abc',
+            'http://www.youtube.com/embed/abc',
+            'https://www.youtube.com/watch?v=abc',
+            'https://www.youtube.com@example.com/embed/abc',
+            'javascript:alert(1)',
+        ):
+            with self.subTest(src=src):
+                self.assertEqual(sanitize_html(f'<p><iframe src="{src}">x</iframe></p>'), '<p></p>')
+
+
+class PurgeCssTests(SimpleTestCase):
+    """Unused rules are purged, but icons picked in the admin after a build still render"""
+
+    CSS = (
+        '.btn{color:red}.carousel-item{display:none}'
+        '.fa-solid,.fas{font-weight:900}.fa-github:before{content:"\\f09b"}'
+        '@media (min-width:576px){.col-sm-6{width:50%}.fa-2x{font-size:2em}}'
+    )
+
+    def test_icon_rules_are_kept(self):
+        css = purge_css(self.CSS, {'btn'}, keep=ICON_CLASS_RE)
+        self.assertEqual(css, (
+            '.btn{color:red}\n.fa-solid,.fas{font-weight:900}\n.fa-github:before{content:"\\f09b"}\n'
+            '@media (min-width:576px){.fa-2x{font-size:2em}}'
+        ))
+
+    def test_everything_unused_goes_without_keep(self):
+        self.assertEqual(purge_css(self.CSS, {'btn'}), '.btn{color:red}')
+
+
+def image_bytes(size=(1200, 800), color='teal'):
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class SkillImportTests(TestCase):
+    """Upserts matched on the normalized name within the category"""
+
+    def setUp(self):
+        self.python = Skill.objects.create(name='Python', category='HARD', proficiency=60, order=4)
+        Skill.objects.create(name='Power BI', category='HARD', proficiency=40, order=7)
+        self.soft_python = Skill.objects.create(name='Python', category='SOFT', proficiency=10)
+
+    def test_new_skills_are_appended_after_the_category(self):
+        result = import_skills(['# comment', 'Stata|80|fas fa-chart-line|econometrics', 'QGIS'], 'HARD')
+        self.assertEqual(result.created, ['Stata', 'QGIS'])
+        stata = Skill.objects.get(name='Stata')
+        self.assertEqual((stata.proficiency, stata.icon, stata.subcategory, stata.order), (80, 'fas fa-chart-line', 'ECONOMETRICS', 8))
+        qgis = Skill.objects.get(name='QGIS')
+        self.assertEqual((qgis.proficiency, qgis.subcategory, qgis.order), (50, 'OTHER', 9))
+
+    def test_case_and_whitespace_variants_update_the_existing_row(self):
+        result = import_skills(['  python |90', 'Power   BI |40'], 'HARD')
+        self.assertEqual(result.updated, ['python'])
+        self.assertEqual(result.unchanged, ['Power BI'])
+        self.python.refresh_from_db()
+        self.assertEqual((self.python.name, self.python.proficiency, self.python.order), ('python', 90, 4))
+        self.assertEqual(Skill.objects.filter(category='HARD').count(), 2)
+        # Other categories are matched separately
+        self.soft_python.refresh_from_db()
+        self.assertEqual(self.soft_python.proficiency, 10)
+
+    def test_skip_existing_and_dry_run_write_nothing(self):
+        result = import_skills(['Python|90', 'Stata'], 'HARD', update_existing=False, dry_run=True)
+        self.assertEqual((result.skipped, result.created), (['Python'], ['Stata']))
+        self.assertFalse(Skill.objects.filter(name='Stata').exists())
+        self.python.refresh_from_db()
+        self.assertEqual(self.python.proficiency, 60)
+
+    def test_bad_lines_are_reported_and_repeats_use_the_last_line(self):
+        result = import_skills(['Stata|abc', '|50', 'Stata|101', 'R|70|||', 'r|75||unknown'], 'HARD')
+        self.assertEqual(len(result.errors), 3)
+        self.assertEqual(len(result.warnings), 2)
+        self.assertEqual(Skill.objects.get(name='r').proficiency, 75)
+
+    def test_queries_do_not_grow_with_the_lines(self):
+        def count(lines):
+            with CaptureQueriesContext(connection) as queries:
+                import_skills(lines, 'HARD')
+            return len(queries)
+
+        few = count(['A1|10', 'Python|61'])
+        many = count([f'B{i}|10' for i in range(30)] + ['Python|62', 'Power BI|41'])
+        self.assertEqual(few, many)
+
+    def test_command_reads_a_file(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write('Stata|80\nPython|70\n')
+        self.addCleanup(os.remove, f.name)
+        out = StringIO()
+        call_command('import_skills', f.name, '--category', 'hard', '--dry-run', stdout=out)
+        self.assertIn('Would add: Stata', out.getvalue())
+        self.assertIn('Would update: Python', out.getvalue())
+        self.assertFalse(Skill.objects.filter(name='Stata').exists())
+
+
+class RemoveDuplicateSkillsTests(TestCase):
+    """Duplicates that predate the unique constraint (migration 0022) are merged into one row"""
+
+    def setUp(self):
+        # Dropped inside the test transaction, so it is back for the next test
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP INDEX {connection.ops.quote_name("portfolio_skill_unique_name_category")}')
+        # bulk_create, unlike save(), keeps the inner whitespace
+        self.python, self.python_lower, self.python_spaced, self.soft_python, self.bi, self.bi_spaced = (
+            Skill.objects.bulk_create([
+                Skill(name='Python', category='HARD', subcategory='PROGRAMMING', proficiency=90, icon='fab fa-python'),
+                Skill(name='python', category='HARD', subcategory='OTHER', proficiency=95),
+                Skill(name='python ', category='HARD', subcategory='OTHER', proficiency=20),
+                Skill(name='PYTHON', category='SOFT', subcategory='OTHER', proficiency=30),
+                Skill(name='Power BI', category='HARD', subcategory='DATA_ANALYSIS', proficiency=40),
+                Skill(name='power  bi', category='HARD', subcategory='DATA_ANALYSIS', proficiency=50),
+            ])
+        )
+
+    def names(self):
+        return sorted(Skill.objects.values_list('name', 'category'))
+
+    def test_groups_span_case_and_whitespace_within_a_category(self):
+        groups = find_duplicate_groups()
+        self.assertEqual(set(groups), {('python', 'HARD'), ('power bi', 'HARD')})
+        self.assertEqual(len(groups[('python', 'HARD')]), 3)
+
+    def test_specific_policy_keeps_the_categorized_row_unchanged(self):
+        with self.assertNumQueries(5):
+            resolutions = remove_duplicates()
+        self.assertEqual(len(resolutions), 2)
+        self.assertEqual(self.names(), [('PYTHON', 'SOFT'), ('Python', 'HARD'), ('power  bi', 'HARD')])
+        # The survivor is the existing row, so its pk (admin links) and data stay as they were
+        kept = Skill.objects.get(pk=self.python.pk)
+        self.assertEqual((kept.name, kept.proficiency, kept.icon), ('Python', 90, 'fab fa-python'))
+        self.assertTrue(Skill.objects.filter(pk=self.soft_python.pk).exists())
+
+    def test_other_policies(self):
+        remove_duplicates(policy='oldest')
+        self.assertEqual(self.names(), [('PYTHON', 'SOFT'), ('Power BI', 'HARD'), ('Python', 'HARD')])
+
+    def test_proficiency_policy(self):
+        remove_duplicates(policy='proficiency')
+        self.assertTrue(Skill.objects.filter(pk=self.python_lower.pk).exists())
+        self.assertTrue(Skill.objects.filter(pk=self.bi_spaced.pk).exists())
+        self.assertEqual(Skill.objects.count(), 3)
+
+    def test_dry_run_and_unknown_policy_delete_nothing(self):
+        remove_duplicates(dry_run=True)
+        self.assertEqual(Skill.objects.count(), 6)
+        with self.assertRaises(ValueError):
+            remove_duplicates(policy='random')
+
+    def test_command(self):
+        out = StringIO()
+        call_command('clean_duplicate_skills', '--keep', 'latest', stdout=out)
+        self.assertIn('Cleaned 3 duplicate skills', out.getvalue())
+        self.assertEqual(Skill.objects.count(), 3)
+
+
+class MediaTestCase(TestCase):
+    """Runs against an empty MEDIA_ROOT of its own"""
+
+    def setUp(self):
+        media_root = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+
+    def store(self, name, content):
+        return default_storage.save(name, BytesIO(content))
+
+
+# Threads instead of processes: workers see this test's MEDIA_ROOT and nothing is forked
+@mock.patch.object(backfill_derivatives, 'ProcessPoolExecutor', ThreadPoolExecutor)
+class BackfillDerivativesTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.checkpoint = os.path.join(default_storage.location, 'checkpoint.json')
+        self.names = []
+        for n, color in enumerate(('teal', 'orange', 'navy')):
+            name = self.store(f'experience/logo-{n}.png', image_bytes(color=color))
+            Experience.objects.create(
+                title='Economist', company=f'Company {n}', start_date=date(2020, 1, 1),
+                description='', company_logo=name,
+            )
+            self.names.append(name)
+
+    def backfill(self, *args):
+        out = StringIO()
+        call_command(
+            'backfill_derivatives', '--model', 'portfolio.Experience', '--workers', '2',
+            '--checkpoint', self.checkpoint, *args, stdout=out,
+        )
+        return out.getvalue()
+
+    def variants(self, name):
+        return [default_storage.exists(target) for target in derivative_names(name).values()]
+
+    def test_generates_every_variant(self):
+        output = self.backfill()
+        self.assertIn(f'Generated {3 * len(get_widths())} derivatives (0 files already complete)', output)
+        for name in self.names:
+            self.assertEqual(self.variants(name), [True] * len(get_widths()))
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_resumes_from_checkpoint(self):
+        with open(self.checkpoint, 'w') as fh:
+            json.dump({'done': self.names[:2]}, fh)
+        output = self.backfill()
+        self.assertIn('2 already done in checkpoint, 1 to process', output)
+        self.assertEqual(self.variants(self.names[0]), [False] * len(get_widths()))
+        self.assertEqual(self.variants(self.names[2]), [True] * len(get_widths()))
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_restart_ignores_checkpoint(self):
+        with open(self.checkpoint, 'w') as fh:
+            json.dump({'done': self.names}, fh)
+        self.backfill('--restart')
+        self.assertEqual(self.variants(self.names[0]), [True] * len(get_widths()))
+
+    def test_existing_variants_are_skipped(self):
+        self.backfill()
+        first = derivative_names(self.names[0])
+        modified = {target: default_storage.get_modified_time(target) for target in first.values()}
+        default_storage.delete(derivative_names(self.names[1])[max(get_widths())])
+
+        output = self.backfill()
+        self.assertIn('Generated 1 derivatives (2 files already complete)', output)
+        self.assertEqual(
+            {target: default_storage.get_modified_time(target) for target in first.values()}, modified,
+        )
+        self.assertEqual(self.variants(self.names[1]), [True] * len(get_widths()))
+
+    def test_failed_files_are_retried_on_the_next_run(self):
+        broken = self.store('experience/broken.png', b'not a png')
+        Experience.objects.create(
+            title='Analyst', company='Broken', start_date=date(2019, 1, 1), description='', company_logo=broken,
+        )
+        output = self.backfill()
+        self.assertIn(f'\u2717 {broken}:', output)
+        self.assertIn('1 files failed; rerun to retry them', output)
+        # Successful files are checkpointed, the failed one is not
+        with open(self.checkpoint) as fh:
+            self.assertEqual(sorted(json.load(fh)['done']), sorted(self.names))
+
+        default_storage.delete(broken)
+        self.store(broken, image_bytes(size=(300, 200)))
+        output = self.backfill()
+        self.assertIn('3 already done in checkpoint, 1 to process', output)
+        self.assertTrue(all(self.variants(broken)))
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_ranges(self):
+        for header, expected in (
+            (None, None),
+            ('', None),
+            ('bytes=0-9', (0, 9)),
+            ('bytes=90-', (90, 99)),
+            ('bytes=-10', (90, 99)),
+            ('bytes=-500', (0, 99)),
+            ('bytes=50-500', (50, 99)),
+            # Several ranges, other units and garbage: the whole file is served
+            ('bytes=0-9,20-29', None),
+            ('items=0-9', None),
+            ('bytes=-', None),
+            ('bytes=a-b', None),
+        ):
+            with self.subTest(header=header):
+                self.assertEqual(parse_range(header, 100), expected)
+
+    def test_unsatisfiable_ranges(self):
+        for header in ('bytes=100-', 'bytes=150-200', 'bytes=20-10', 'bytes=-0'):
+            with self.subTest(header=header):
+                with self.assertRaises(ValueError):
+                    parse_range(header, 100)
+
+
+class RemoteStorage(Storage):
+    """A storage without local paths (Storage.path raises) whose URLs carry their expiry"""
+
+    def url(self, name, expire=None):
+        return f'https://storage.example.com/{name}?expires={expire}'
+
+
+class SignedBlobStorage(RemoteStorage):
+    """Google Cloud Storage's shape: URLs are signed on the bucket's blobs"""
+
+    def __init__(self):
+        self.signed = []
+        self.bucket = SimpleNamespace(blob=lambda name: SimpleNamespace(
+            generate_signed_url=lambda **kwargs: self.signed.append((name, kwargs)) or f'https://gcs.example.com/{name}',
+        ))
+
+
+@override_settings(**PAGE_TEST_SETTINGS, BACKGROUND_TASKS_EAGER=True, FILE_DOWNLOAD_CHUNK_SIZE=16)
+class DownloadTests(MediaTestCase):
+    CONTENT = bytes(range(100))
+
+    def setUp(self):
+        super().setUp()
+        name = self.store('research/pdfs/paper.pdf', self.CONTENT)
+        self.research = Research.objects.create(
+            title='Trade and distance', research_type='PUBLICATION', authors='M. Belete', pdf_file=name,
+        )
+        self.url = reverse('portfolio:research_pdf', args=[self.research.pk])
+
+    def download(self, **headers):
+        """GET the PDF and read the whole body, running the download counter"""
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.get(self.url, **headers)
+            body = b''.join(response.streaming_content) if response.streaming else response.content
+            response.close()
+        return response, body
+
+    def downloads(self):
+        download = FileDownload.objects.filter(key=f'research:{self.research.pk}').first()
+        return download.download_count if download else 0
+
+    def test_whole_file_is_streamed_and_counted(self):
+        response, body = self.download()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, self.CONTENT)
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Disposition'], 'inline; filename="paper.pdf"')
+        self.assertEqual(self.downloads(), 1)
+        self.download()
+        self.assertEqual(self.downloads(), 2)
+
+    def test_range_is_partial_and_not_counted(self):
+        response, body = self.download(HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, self.CONTENT[10:20])
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/100')
+        self.assertEqual(response['Content-Length'], '10')
+
+        response, body = self.download(HTTP_RANGE='bytes=-30')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, self.CONTENT[70:])
+        self.assertEqual(self.downloads(), 0)
+
+    def test_range_covering_the_file_is_counted(self):
+        response, body = self.download(HTTP_RANGE='bytes=0-')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, self.CONTENT)
+        self.assertEqual(self.downloads(), 1)
+
+    def test_unsatisfiable_range(self):
+        response, body = self.download(HTTP_RANGE='bytes=100-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */100')
+        self.assertEqual(body, b'')
+        self.assertEqual(self.downloads(), 0)
+
+    def test_if_range_with_an_old_etag_gets_the_whole_file(self):
+        response, body = self.download(HTTP_RANGE='bytes=10-19', HTTP_IF_RANGE='"outdated"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, self.CONTENT)
+
+        etag = response['ETag']
+        response, body = self.download(HTTP_RANGE='bytes=10-19', HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, 206)
+
+    def test_conditional_requests(self):
+        response, _body = self.download()
+        for headers in (
+            {'HTTP_IF_NONE_MATCH': response['ETag']},
+            {'HTTP_IF_MODIFIED_SINCE': response['Last-Modified']},
+        ):
+            with self.subTest(headers=headers):
+                not_modified, body = self.download(**headers)
+                self.assertEqual(not_modified.status_code, 304)
+                self.assertEqual(body, b'')
+
+        response, body = self.download(HTTP_IF_MODIFIED_SINCE=http_date(0), HTTP_IF_NONE_MATCH='"other"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.downloads(), 2)
+
+    def test_head_and_aborted_downloads_are_not_counted(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.head(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(response.content, b'')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.get(self.url)
+            self.assertEqual(len(next(iter(response.streaming_content))), 16)
+            # The client went away after the first chunk
+            response.close()
+        self.assertEqual(self.downloads(), 0)
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True, FILE_DOWNLOAD_REDIRECT=True, FILE_DOWNLOAD_URL_EXPIRY=120)
+class DownloadRedirectTests(TestCase):
+    def serve(self, storage, **kwargs):
+        fieldfile = SimpleNamespace(storage=storage, name='cv/cv.pdf')
+        with self.captureOnCommitCallbacks(execute=True):
+            return serve_file(RequestFactory().get('/download-cv/'), fieldfile, filename='CV.pdf', key='cv', **kwargs)
+
+    def test_remote_storage_is_redirected_and_counted(self):
+        response = self.serve(RemoteStorage())
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response['Location'], 'https://storage.example.com/cv/cv.pdf?expires=120')
+        self.assertEqual(response['Cache-Control'], 'no-store')
+        self.assertEqual(FileDownload.objects.get(key='cv').download_count, 1)
+
+    def test_blob_urls_are_signed_with_the_download_expiry(self):
+        storage = SignedBlobStorage()
+        response = self.serve(storage)
+        self.assertEqual(response['Location'], 'https://gcs.example.com/cv/cv.pdf')
+        self.assertEqual(storage.signed, [('cv/cv.pdf', {
+            'expiration': timedelta(seconds=120),
+            'version': 'v4',
+            'response_disposition': 'attachment; filename="CV.pdf"',
+        })])
+
+    def test_local_storage_is_streamed(self):
+        with tempfile.TemporaryDirectory() as location:
+            storage = FileSystemStorage(location=location)
+            storage.save('cv/cv.pdf', BytesIO(b'%PDF-1.7'))
+            response = self.serve(storage)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(b''.join(response.streaming_content), b'%PDF-1.7')
+            response.close()
+
+
+class ResearchIndexTests(TestCase):
+    def setUp(self):
+        self.research = Research.objects.create(
+            title='Market access and growth', research_type='PROJECT', authors='M. Belete', pdf_file='research/pdfs/access.pdf',
+        )
+
+    def test_chunks_and_terms_are_inserted_in_batches(self):
+        chunks = [(n // 10 + 1, f'gravity model section{n} trade') for n in range(3 * INDEX_BATCH_SIZE)]
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(_store_chunks(self.research, 'PDF', chunks), len(chunks))
+        # A few dozen statements for 1500 chunks and 6000 terms, not one per chunk
+        # (SQLite further splits each batch at 999 parameters)
+        self.assertLess(len(queries), 50)
+        self.assertEqual(ResearchSearchTerm.objects.filter(research=self.research, term='gravity').count(), len(chunks))
+        [(research_id, score, snippet)] = search_research('section1234 gravity')
+        self.assertEqual((research_id, snippet), (self.research.pk, 'gravity model section1234 trade'))
+
+    def test_pdf_is_parsed_before_the_transaction_opens(self):
+        outer_blocks = len(connection.atomic_blocks)
+        depths = []
+
+        def pages(fieldfile):
+            for number in range(1, 4):
+                depths.append(len(connection.atomic_blocks))
+                yield number, 'regional convergence ' * 150
+
+        with mock.patch('portfolio.research_index.extract_pdf_pages', pages):
+            index_pdf(self.research.pk)
+        self.assertEqual(depths, [outer_blocks] * 3)
+        job = ResearchIndexJob.objects.get(research=self.research)
+        self.assertEqual((job.status, job.page_count, job.chunk_count), ('DONE', 3, 5))
+        self.assertEqual(self.research.text_chunks.filter(source='PDF').count(), 5)
+        self.assertEqual(search_research('convergence')[0][0], self.research.pk)
+
+
+class MetricsTests(SimpleTestCase):
+    def test_nearest_rank_percentiles(self):
+        values = list(range(1, 101))
+        self.assertEqual([percentile(values, pct) for pct in (50, 95, 99, 100)], [50, 95, 99, 100])
+        self.assertEqual([percentile([7, 9], pct) for pct in (1, 50, 51)], [7, 7, 9])
+        self.assertEqual(percentile([4.5], 99), 4.5)
+        self.assertIsNone(percentile([], 50))
+
+    def test_percentiles_cover_the_latest_window_only(self):
+        store = MetricsStore(sample_size=100)
+        # Shuffled, so the ring buffer's order is not the sorted order
+        for value in [*range(1, 251, 2), *range(2, 251, 2)]:
+            store.record('views', 'home', {'time_ms': value, 'queries': None}, error=value % 50 == 0)
+
+        summary = store.snapshot()['views']['home']
+        self.assertEqual((summary['count'], summary['errors']), (250, 5))
+        # The window holds the last 100 samples recorded: the even values 52..250
+        self.assertEqual(summary['fields'], {
+            'time_ms': {'avg': 125.5, 'p50': 150, 'p95': 240, 'p99': 248},
+        })
@@ -7,11 +7,15 @@ urlpatterns = [
     path('', views.home, name='home'),
     path('about/', views.about, name='about'),
     path('skills/', views.skills_view, name='skills'),
+    path('skills/data.json', views.skills_data, name='skills_data'),
     path('research/', views.research_view, name='research'),
     path('research/<int:pk>/', views.research_detail, name='research_detail'),
+    path('research/<int:pk>/pdf/', views.download_research_pdf, name='research_pdf'),
     path('experience/', views.experience_view, name='experience'),
     path('industry-index/', views.industry_index, name='industry_index'),
     path('download-cv/', views.download_cv, name='download_cv'),
     path('sitemap.xml', views.sitemap, name='sitemap'),
     path('robots.txt', views.robots_txt, name='robots'),
+    path('metrics/', views.metrics_dashboard, name='metrics_dashboard'),
+    path('metrics.json', views.metrics_json, name='metrics_json'),
 ]
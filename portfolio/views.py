@@ -1,22 +1,24 @@
+from datetime import datetime, timezone as dt_timezone
+
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import FileResponse, Http404
+from django.http import Http404, HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.contrib.admin.views.decorators import staff_member_required
 from django.views.generic import ListView, DetailView
 from django.template.response import TemplateResponse
 from .models import Profile, Education, Research, Skill, Experience, HomePage
+from .downloads import serve_file
+from .metrics import metrics
 from blog.models import BlogPost
+from github_integration.language_stats import top_languages
 from github_integration.models import GitHubRepository
+from github_integration.rate_limit import last_quota
 
 
 def home(request):
     """Homepage view with editable content"""
-    # Get or create homepage content
-    homepage, created = HomePage.objects.get_or_create(
-        pk=1,
-        defaults={
-            'hero_title': 'Your Name',
-            'hero_description': 'Research Assistant at New York University Abu Dhabi, MSc student at Georgia Institute of Technology'
-        }
-    )
+    homepage = HomePage.load()
     
     try:
         profile = Profile.objects.first()
@@ -31,12 +33,14 @@ def home(request):
     # Get recent blog posts if enabled
     recent_posts = []
     if homepage.show_recent_blog:
-        recent_posts = BlogPost.objects.filter(status='PUBLISHED').order_by('-published_at')[:3]
+        recent_posts = BlogPost.objects.published().order_by('-published_at')[:3]
     
     # Get featured GitHub repos if enabled
     featured_repos = []
+    language_stats = []
     if homepage.show_featured_repos:
-        featured_repos = GitHubRepository.objects.filter(featured=True)[:6]
+        featured_repos = GitHubRepository.objects.filter(featured=True).defer('readme_html')[:6]
+        language_stats = top_languages(6)
     
     context = {
         'homepage': homepage,
@@ -47,6 +51,7 @@ def home(request):
         'experience': experience,
         'recent_posts': recent_posts,
         'featured_repos': featured_repos,
+        'language_stats': language_stats,
     }
     return render(request, 'portfolio/home.html', context)
 
@@ -55,86 +60,173 @@ def about(request):
     """About page with profile information and timeline"""
     from .models import TimelineEntry, AboutPageSettings
     
-    # Get about page settings
-    about_settings, created = AboutPageSettings.objects.get_or_create(
-        pk=1,
-        defaults={'intro_bio': ''}
-    )
+    about_settings = AboutPageSettings.load()
     
-    # Get timeline entries grouped by period
-    past_entries = TimelineEntry.objects.filter(period='PAST', is_active=True).order_by('year', 'order')
-    present_entries = TimelineEntry.objects.filter(period='PRESENT', is_active=True).order_by('year', 'order')
-    future_entries = TimelineEntry.objects.filter(period='FUTURE', is_active=True).order_by('year', 'order')
+    # One ordered query for the whole timeline, grouped by period in Python;
+    # the raw content is not needed since content_html is sanitized at save time
+    entries_by_period = {'PAST': [], 'PRESENT': [], 'FUTURE': []}
+    for entry in TimelineEntry.objects.filter(is_active=True).defer('content').order_by('year', 'order'):
+        entries_by_period.setdefault(entry.period, []).append(entry)
     
     context = {
         'about_settings': about_settings,
-        'past_entries': past_entries,
-        'present_entries': present_entries,
-        'future_entries': future_entries,
+        'past_entries': entries_by_period['PAST'],
+        'present_entries': entries_by_period['PRESENT'],
+        'future_entries': entries_by_period['FUTURE'],
     }
     return render(request, 'portfolio/about.html', context)
 
 
 def skills_view(request):
     """Skills page with filtering"""
-    all_skills = Skill.objects.all()
-    
-    # Count by category
-    hard_count = all_skills.filter(category='HARD').count()
-    soft_count = all_skills.filter(category='SOFT').count()
-    hobbies_count = all_skills.filter(category='HOBBIES').count()
-    
-    # Get unique subcategories that exist in database
-    from django.db.models import Count
-    subcategory_data = []
-    subcategories = all_skills.exclude(subcategory='OTHER').values('subcategory').annotate(
-        count=Count('id')
-    ).order_by('subcategory')
-    
-    for subcat in subcategories:
-        if subcat['subcategory']:
-            # Get display name
-            display_name = dict(Skill.SUBCATEGORY_CHOICES).get(
-                subcat['subcategory'], 
-                subcat['subcategory'].replace('_', ' ').title()
-            )
-            subcategory_data.append({
-                'value': subcat['subcategory'],
-                'display': display_name,
-                'count': subcat['count']
-            })
+    from .skills_catalog import get_summary
+    
+    # Facet counts come from one cached query, rebuilt when skills change; the
+    # cards themselves are rendered in the browser from the skills_data payload
+    summary = get_summary()
+    facets = summary['facets']
     
     context = {
-        'all_skills': all_skills,
-        'hard_count': hard_count,
-        'soft_count': soft_count,
-        'hobbies_count': hobbies_count,
-        'subcategories': subcategory_data,
+        'skills_version': summary['version'],
+        'skill_names': summary['payload']['name'],
+        'skill_count': facets['total'],
+        'hard_count': facets['categories'].get('HARD', 0),
+        'soft_count': facets['categories'].get('SOFT', 0),
+        'hobbies_count': facets['categories'].get('HOBBIES', 0),
+        'subcategories': facets['subcategories'],
     }
     return render(request, 'portfolio/skills.html', context)
 
 
+def skills_data(request):
+    """
+    Skills as compact columnar JSON for the skills page. Requests carrying
+    the current version (?v=) may be cached forever; others revalidate
+    with the ETag.
+    """
+    from .skills_catalog import get_summary
+    
+    summary = get_summary()
+    etag = quote_etag(summary['version'])
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(summary['json'], content_type='application/json')
+    response['ETag'] = etag
+    if request.GET.get('v') == summary['version']:
+        patch_cache_control(response, public=True, max_age=60 * 60 * 24 * 365, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+    return response
+
+
+def _filter_research(queryset, filters, exclude=None):
+    """Apply the tag/type/year filters, optionally leaving one out for its own facet"""
+    if filters.get('tag') and exclude != 'tag':
+        queryset = queryset.filter(tags__slug=filters['tag'])
+    if filters.get('type') and exclude != 'type':
+        queryset = queryset.filter(research_type=filters['type'])
+    if filters.get('year') and exclude != 'year':
+        queryset = queryset.filter(publication_date__year=filters['year'])
+    return queryset
+
+
+def _research_facets(filters):
+    """
+    Count research per type, year and tag in a single UNION ALL query.
+    Each facet ignores its own filter so visitors can switch between values.
+    """
+    from django.db.models import CharField, Count, F, Value
+    from django.db.models.functions import Cast, ExtractYear
+    
+    base = Research.objects.order_by()
+    type_rows = _filter_research(base, filters, exclude='type').values(
+        facet=Value('type', output_field=CharField()),
+        value=F('research_type'),
+        label=F('research_type'),
+    ).annotate(count=Count('id'))
+    year_rows = _filter_research(base, filters, exclude='year').filter(
+        publication_date__isnull=False
+    ).values(
+        facet=Value('year', output_field=CharField()),
+        value=Cast(ExtractYear('publication_date'), CharField()),
+        label=Cast(ExtractYear('publication_date'), CharField()),
+    ).annotate(count=Count('id'))
+    tag_rows = _filter_research(base, filters, exclude='tag').filter(
+        tags__isnull=False
+    ).values(
+        facet=Value('tag', output_field=CharField()),
+        value=F('tags__slug'),
+        label=F('tags__name'),
+    ).annotate(count=Count('id'))
+    
+    type_labels = dict(Research.RESEARCH_TYPE_CHOICES)
+    facets = {'type': [], 'year': [], 'tag': []}
+    for row in type_rows.union(year_rows, tag_rows, all=True):
+        label = type_labels.get(row['label'], row['label']) if row['facet'] == 'type' else row['label']
+        facets[row['facet']].append({
+            'value': row['value'],
+            'label': label,
+            'count': row['count'],
+            'active': str(filters.get(row['facet']) or '') == row['value'],
+        })
+    facets['type'].sort(key=lambda option: option['label'])
+    facets['year'].sort(key=lambda option: option['value'], reverse=True)
+    facets['tag'].sort(key=lambda option: (-option['count'], option['label'].lower()))
+    return facets
+
+
 def research_view(request):
     """Research and publications page"""
     from .models import ResearchPageSettings
+    from .research_index import search_research
     
-    research = Research.objects.all()
-    featured_research = research.filter(featured=True)
-    
-    # Get or create research page settings
-    research_settings, created = ResearchPageSettings.objects.get_or_create(
-        pk=1,
-        defaults={
-            'page_title': 'Research & Publications',
-            'page_description': 'Explore my research contributions, publications, and academic work.',
-            'all_research_heading': 'All Publications'
-        }
-    )
+    filters = {
+        'tag': request.GET.get('tag', '').strip(),
+        'type': request.GET.get('type', '').strip(),
+        'year': request.GET.get('year', '').strip(),
+    }
+    if not filters['year'].isdigit():
+        filters['year'] = ''
+    
+    research = _filter_research(Research.objects.all(), filters).prefetch_related('tags')
+    featured_research = Research.objects.filter(featured=True).prefetch_related('tags')
+    is_filtered = any(filters.values())
+    
+    # Full-text search over listing fields and extracted PDF text
+    search_query = request.GET.get('q', '').strip()
+    if search_query:
+        results = search_research(search_query)
+        items = research.in_bulk([research_id for research_id, score, snippet in results])
+        research = []
+        for research_id, score, snippet in results:
+            item = items.get(research_id)
+            if item:
+                item.search_snippet = snippet
+                research.append(item)
+    if search_query or is_filtered:
+        featured_research = []
+    
+    # Facet links keep the other active filters and the search query
+    facets = _research_facets(filters)
+    for facet, options in facets.items():
+        for option in options:
+            params = request.GET.copy()
+            if option['active']:
+                params.pop(facet, None)
+            else:
+                params[facet] = option['value']
+            option['querystring'] = params.urlencode()
+    
+    research_settings = ResearchPageSettings.load()
     
     context = {
         'research': research,
         'featured_research': featured_research,
         'research_settings': research_settings,
+        'search_query': search_query,
+        'filters': filters,
+        'is_filtered': is_filtered,
+        'facets': facets,
     }
     return render(request, 'portfolio/research.html', context)
 
@@ -156,18 +248,29 @@ def experience_view(request):
 def download_cv(request):
     """Download CV PDF file"""
     from .models import AboutPageSettings
-    try:
-        about_settings = AboutPageSettings.objects.first()
-        if about_settings and about_settings.cv_file:
-            return FileResponse(about_settings.cv_file.open('rb'), as_attachment=True, filename='CV.pdf')
-    except AboutPageSettings.DoesNotExist:
-        pass
-    raise Http404("CV file not found")
+    about_settings = AboutPageSettings.load()
+    if not about_settings.cv_file:
+        raise Http404("CV file not found")
+    return serve_file(request, about_settings.cv_file, filename='CV.pdf', key='cv')
+
+
+def download_research_pdf(request, pk):
+    """Download the PDF attached to a research item"""
+    research = get_object_or_404(Research, pk=pk)
+    if not research.pdf_file:
+        raise Http404("PDF file not found")
+    return serve_file(
+        request,
+        research.pdf_file,
+        key=f'research:{research.pk}',
+        as_attachment=False,
+        content_type='application/pdf',
+    )
 
 
 def sitemap(request):
     """Generate sitemap.xml for SEO"""
-    blog_posts = BlogPost.objects.filter(status='PUBLISHED').order_by('-published_at')
+    blog_posts = BlogPost.objects.published().order_by('-published_at')
     return TemplateResponse(request, 'sitemap.xml', {
         'blog_posts': blog_posts,
     }, content_type='application/xml')
@@ -179,13 +282,7 @@ def industry_index(request):
     from .industry_analyzer import update_industry_rankings
     from django.contrib import messages
     
-    # Get or create settings
-    settings, created = IndustryIndexSettings.objects.get_or_create(
-        pk=1,
-        defaults={
-            'page_description': 'This ranking is generated by AI analyzing my skills, research interests, blog posts, education, and professional activities. The index updates regularly to reflect my evolving expertise and interests.'
-        }
-    )
+    settings = IndustryIndexSettings.load()
     
     # Handle manual refresh request
     if request.method == 'POST' and 'refresh_rankings' in request.POST:
@@ -218,3 +315,31 @@ def industry_index(request):
 def robots_txt(request):
     """Generate robots.txt for SEO"""
     return TemplateResponse(request, 'robots.txt', {}, content_type='text/plain')
+
+
+@staff_member_required
+def metrics_dashboard(request):
+    """Per-URL and per-external-call percentiles for this process (staff only)"""
+    snapshot = metrics.snapshot()
+    groups = {
+        group: sorted(series.items(), key=lambda item: -(item[1]['fields'].get('latency_ms', {}).get('p95') or 0))
+        for group, series in snapshot.items()
+    }
+    quota = last_quota()
+    if quota and quota.get('reset_at'):
+        quota = {**quota, 'reset': datetime.fromtimestamp(quota['reset_at'], tz=dt_timezone.utc)}
+    context = {
+        'requests': groups.get('requests', []),
+        'external': groups.get('external', []),
+        'github': groups.get('github', []),
+        'github_quota': quota,
+        'compression': groups.get('compression', []),
+        'sample_size': metrics.sample_size,
+    }
+    return render(request, 'portfolio/metrics_dashboard.html', context)
+
+
+@staff_member_required
+def metrics_json(request):
+    """Machine-readable version of the metrics dashboard"""
+    return JsonResponse({'sample_size': metrics.sample_size, 'metrics': metrics.snapshot(), 'github_quota': last_quota()})
@@ -0,0 +1,145 @@
+// Skills page: category filters and batched rendering of the skills payload
+
+function toggleSubcategories() {
+    const subcatFilters = document.getElementById('subcategory-filters');
+    const btn = document.querySelector('.toggle-subcategories i');
+    
+    if (subcatFilters.style.display === 'none') {
+        subcatFilters.style.display = 'block';
+        btn.classList.remove('fa-chevron-down');
+        btn.classList.add('fa-chevron-up');
+    } else {
+        subcatFilters.style.display = 'none';
+        btn.classList.remove('fa-chevron-up');
+        btn.classList.add('fa-chevron-down');
+    }
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    const filterBtns = document.querySelectorAll('.filter-btn');
+    const subfilterBtns = document.querySelectorAll('.subfilter-btn');
+    const container = document.getElementById('skills-container');
+    const sentinel = document.getElementById('skills-sentinel');
+    const noResults = document.getElementById('no-results');
+    if (!container) return;
+    
+    const BATCH_SIZE = 30;
+    let payload = null;
+    let categoryIndex = {};
+    let subcategoryIndex = {};
+    let matches = [];
+    let rendered = 0;
+    
+    let activeCategory = 'all';
+    let activeSubcategory = null;
+    
+    function buildCard(i) {
+        const col = document.createElement('div');
+        col.className = 'col-md-6 col-lg-4 skill-card';
+        col.innerHTML =
+            '<div class="card h-100 skill-item"><div class="card-body p-4">' +
+            '<div class="d-flex justify-content-between align-items-start mb-3">' +
+            '<h5 class="mb-0" style="font-weight: 700; color: #1e293b; font-size: 1.2rem; flex: 1;"></h5>' +
+            '<span class="badge" style="background: linear-gradient(135deg, #1a73e8, #0d47a1); padding: 8px 14px; font-size: 0.9rem; font-weight: 700;"></span>' +
+            '</div><div class="mb-3"><span class="skill-tag"></span></div>' +
+            '<div class="skill-bar"><div class="skill-progress"></div></div></div></div>';
+        
+        const title = col.querySelector('h5');
+        if (payload.icon[i]) {
+            const icon = document.createElement('i');
+            icon.className = payload.icon[i];
+            icon.style.color = '#1a73e8';
+            icon.style.marginRight = '8px';
+            title.appendChild(icon);
+        }
+        title.appendChild(document.createTextNode(payload.name[i]));
+        col.querySelector('.badge').textContent = payload.proficiency[i] + '%';
+        col.querySelector('.skill-tag').textContent = payload.subcategories[payload.subcategory[i]][1];
+        
+        const bar = col.querySelector('.skill-progress');
+        bar.dataset.width = payload.proficiency[i];
+        bar.style.width = '0%';
+        requestAnimationFrame(() => requestAnimationFrame(() => {
+            bar.style.width = payload.proficiency[i] + '%';
+            bar.classList.add('animated');
+        }));
+        return col;
+    }
+    
+    function renderNextBatch() {
+        if (!payload || rendered >= matches.length) return;
+        const fragment = document.createDocumentFragment();
+        const end = Math.min(rendered + BATCH_SIZE, matches.length);
+        for (; rendered < end; rendered++) {
+            fragment.appendChild(buildCard(matches[rendered]));
+        }
+        container.appendChild(fragment);
+    }
+    
+    function filterSkills() {
+        const wantedCategory = activeCategory === 'all' ? null : categoryIndex[activeCategory];
+        const wantedSubcategory = activeSubcategory ? subcategoryIndex[activeSubcategory] : null;
+        
+        matches = [];
+        for (let i = 0; i < payload.name.length; i++) {
+            // Check category and subcategory filters
+            if (wantedCategory !== null && payload.category[i] !== wantedCategory) continue;
+            if (wantedSubcategory !== null && payload.subcategory[i] !== wantedSubcategory) continue;
+            matches.push(i);
+        }
+        
+        container.replaceChildren();
+        rendered = 0;
+        renderNextBatch();
+        
+        // Show/hide no results message
+        noResults.style.display = matches.length === 0 ? 'block' : 'none';
+    }
+    
+    // Render further batches as the end of the grid scrolls into view
+    new IntersectionObserver((entries) => {
+        if (entries.some(entry => entry.isIntersecting)) renderNextBatch();
+    }, { rootMargin: '600px 0px' }).observe(sentinel);
+    
+    // Versioned URL: the browser cache serves repeat visits until skills change
+    fetch(container.dataset.source)
+        .then(response => response.json())
+        .then(data => {
+            payload = data;
+            // Columnar payload: categories/subcategories are indexes into the lookup lists
+            categoryIndex = Object.fromEntries(payload.categories.map((value, i) => [value, i]));
+            subcategoryIndex = Object.fromEntries(payload.subcategories.map((pair, i) => [pair[0], i]));
+            filterSkills();
+        });
+    
+    // Category filter buttons
+    filterBtns.forEach(btn => {
+        btn.addEventListener('click', function() {
+            filterBtns.forEach(b => b.classList.remove('active'));
+            this.classList.add('active');
+            activeCategory = this.dataset.filter;
+            
+            // Reset subcategory filter
+            activeSubcategory = null;
+            subfilterBtns.forEach(b => b.classList.remove('active'));
+            
+            if (payload) filterSkills();
+        });
+    });
+    
+    // Subcategory filter buttons
+    subfilterBtns.forEach(btn => {
+        btn.addEventListener('click', function() {
+            if (this.classList.contains('active')) {
+                this.classList.remove('active');
+                activeSubcategory = null;
+            } else {
+                subfilterBtns.forEach(b => b.classList.remove('active'));
+                this.classList.add('active');
+                activeSubcategory = this.dataset.filter;
+            }
+            
+            if (payload) filterSkills();
+        });
+    });
+});